@@ -69,6 +69,41 @@ def hesapla_usage_rate_basit(fga, fta, tov, team_fga, team_fta, team_tov, minute
     
     return 100 * ((player_possessions * (team_minutes / 5)) / (minutes * team_possessions))
 
+def guvenli_bol(pay, payda, varsayilan=0.0):
+    """Vektörel bölme: payda 0 olan satırlarda varsayilan (skaler fonksiyonlardaki kontrolün karşılığı)"""
+    pay = np.asarray(pay, dtype=np.float64)
+    payda = np.asarray(payda, dtype=np.float64)
+    sonuc = np.full(np.broadcast(pay, payda).shape, varsayilan, dtype=np.float64)
+    return np.divide(pay, payda, out=sonuc, where=payda != 0)
+
+def advanced_kolonlari_hesapla(kolonlar):
+    """
+    Maç başı advanced kolonları NumPy kolon aritmetiğiyle hesaplar (satır döngüsü yok)
+    Sonuçlar hesapla_* / kontrol_* fonksiyonlarıyla birebir aynıdır
+    
+    Args:
+        kolonlar: kolon -> dizi (DataFrame veya MacLogu kolon sözlüğü)
+    
+    Returns:
+        {'TS_PCT', 'EFG_PCT', 'AST_TOV_RATIO', 'DOUBLE_DOUBLE', 'TRIPLE_DOUBLE'} -> dizi
+    """
+    d = {k: np.asarray(kolonlar[k], dtype=np.float64)
+         for k in ('PTS', 'FGM', 'FGA', 'FG3M', 'FTA', 'REB', 'AST', 'STL', 'BLK', 'TOV')}
+    
+    # Top kaybı yoksa oran asist sayısının kendisi
+    ast_tov = np.divide(d['AST'], d['TOV'], out=d['AST'].copy(), where=d['TOV'] != 0)
+    
+    # 10+ olan kategori sayısı (PTS, REB, AST, STL, BLK)
+    on_plus = (np.vstack([d['PTS'], d['REB'], d['AST'], d['STL'], d['BLK']]) >= 10).sum(axis=0)
+    
+    return {
+        'TS_PCT': guvenli_bol(d['PTS'], 2 * (d['FGA'] + 0.44 * d['FTA'])),
+        'EFG_PCT': guvenli_bol(d['FGM'] + 0.5 * d['FG3M'], d['FGA']),
+        'AST_TOV_RATIO': ast_tov,
+        'DOUBLE_DOUBLE': on_plus >= 2,
+        'TRIPLE_DOUBLE': on_plus >= 3,
+    }
+
 def mac_istatistikleri_zenginlestir(mac_df):
     """
     Maç DataFrame'ine advanced stats ekler
@@ -80,38 +115,99 @@ def mac_istatistikleri_zenginlestir(mac_df):
         Zenginleştirilmiş DataFrame
     """
     df = mac_df.copy()
+    for kolon, degerler in advanced_kolonlari_hesapla(df).items():
+        df[kolon] = degerler
+    return df
+
+def toplu_mac_istatistikleri_zenginlestir(mac_dfleri, oyuncu_kolonu='Player_ID'):
+    """
+    Birden fazla oyuncunun maç loglarını tek vektörel geçişte zenginleştirir
     
-    # True Shooting %
-    df['TS_PCT'] = df.apply(
-        lambda row: hesapla_true_shooting_pct(row['PTS'], row['FGA'], row['FTA']),
-        axis=1
-    )
-    
-    # Effective FG %
-    df['EFG_PCT'] = df.apply(
-        lambda row: hesapla_effective_fg_pct(row['FGM'], row['FG3M'], row['FGA']),
-        axis=1
-    )
-    
-    # Assist/Turnover Ratio
-    df['AST_TOV_RATIO'] = df.apply(
-        lambda row: hesapla_assist_turnover_ratio(row['AST'], row['TOV']),
-        axis=1
-    )
-    
-    # Double-Double
-    df['DOUBLE_DOUBLE'] = df.apply(
-        lambda row: kontrol_double_double(row['PTS'], row['REB'], row['AST'], row['STL'], row['BLK']),
-        axis=1
-    )
-    
-    # Triple-Double
-    df['TRIPLE_DOUBLE'] = df.apply(
-        lambda row: kontrol_triple_double(row['PTS'], row['REB'], row['AST'], row['STL'], row['BLK']),
-        axis=1
-    )
+    Args:
+        mac_dfleri: {oyuncu_id: playergamelog DataFrame} veya oyuncu kolonlu uzun DataFrame
+                    (örn. LeagueGameLog)
+        oyuncu_kolonu: Oyuncu kimliği kolonu
     
-    return df
+    Returns:
+        Zenginleştirilmiş uzun DataFrame (oyuncu_kolonu ile)
+    """
+    if isinstance(mac_dfleri, dict):
+        parcalar = [
+            df if oyuncu_kolonu in df.columns else df.assign(**{oyuncu_kolonu: oyuncu_id})
+            for oyuncu_id, df in mac_dfleri.items() if df is not None and not df.empty
+        ]
+        if not parcalar:
+            return pd.DataFrame()
+        mac_dfleri = pd.concat(parcalar, ignore_index=True)
+    return mac_istatistikleri_zenginlestir(mac_dfleri)
+
+# sezon_advanced_stats_hesapla çıktısı: anahtar -> (kaynak kolon, toplama)
+SEZON_OZETI = {
+    'avg_min': ('MIN', 'mean'),
+    'avg_pts': ('PTS', 'mean'),
+    'avg_reb': ('REB', 'mean'),
+    'avg_oreb': ('OREB', 'mean'),
+    'avg_dreb': ('DREB', 'mean'),
+    'avg_ast': ('AST', 'mean'),
+    'avg_stl': ('STL', 'mean'),
+    'avg_blk': ('BLK', 'mean'),
+    'avg_tov': ('TOV', 'mean'),
+    'avg_pf': ('PF', 'mean'),
+    'avg_plus_minus': ('PLUS_MINUS', 'mean'),
+    'avg_fg_pct': ('FG_PCT', 'mean'),
+    'avg_fg3_pct': ('FG3_PCT', 'mean'),
+    'avg_ft_pct': ('FT_PCT', 'mean'),
+    'avg_ts_pct': ('TS_PCT', 'mean'),
+    'avg_efg_pct': ('EFG_PCT', 'mean'),
+    'avg_ast_tov_ratio': ('AST_TOV_RATIO', 'mean'),
+    'total_double_doubles': ('DOUBLE_DOUBLE', 'sum'),
+    'total_triple_doubles': ('TRIPLE_DOUBLE', 'sum'),
+    'avg_fgm': ('FGM', 'mean'),
+    'avg_fga': ('FGA', 'mean'),
+    'avg_fg3m': ('FG3M', 'mean'),
+    'avg_fg3a': ('FG3A', 'mean'),
+    'avg_ftm': ('FTM', 'mean'),
+    'avg_fta': ('FTA', 'mean'),
+    'avg_fg2m': ('FG2M', 'mean'),
+    'avg_fg2a': ('FG2A', 'mean'),
+    'avg_fg2_pct': ('FG2_PCT', 'mean'),
+}
+
+def toplu_sezon_advanced_stats_hesapla(mac_dfleri, oyuncu_kolonu='Player_ID'):
+    """
+    Birden fazla oyuncunun sezon advanced stats'ini tek gruplu geçişte hesaplar
+    
+    Args:
+        mac_dfleri: toplu_mac_istatistikleri_zenginlestir ile aynı girdi
+        oyuncu_kolonu: Oyuncu kimliği kolonu
+    
+    Returns:
+        Oyuncu başına bir satır (index = oyuncu_kolonu), kolonlar sezon_advanced_stats_hesapla
+        anahtarları; veri yoksa boş DataFrame
+    """
+    df = toplu_mac_istatistikleri_zenginlestir(mac_dfleri, oyuncu_kolonu)
+    if df.empty:
+        return pd.DataFrame()
+    
+    # 2 sayılık şutlar (deneme yoksa yüzde NaN: ortalamaya katılmaz)
+    df['FG2M'] = df['FGM'] - df['FG3M']
+    df['FG2A'] = df['FGA'] - df['FG3A']
+    df['FG2_PCT'] = guvenli_bol(df['FG2M'], df['FG2A'], varsayilan=np.nan)
+    
+    grup = df.groupby(oyuncu_kolonu, sort=False)
+    ozet = grup.agg(**{anahtar: kaynak for anahtar, kaynak in SEZON_OZETI.items()})
+    ozet.insert(0, 'total_games', grup.size())
+    
+    ozet['total_double_doubles'] = ozet['total_double_doubles'].astype(int)
+    ozet['total_triple_doubles'] = ozet['total_triple_doubles'].astype(int)
+    ozet['double_double_pct'] = ozet['total_double_doubles'] / ozet['total_games'] * 100
+    fg2a_toplam = grup['FG2A'].sum()
+    ozet['avg_fg2_pct'] = ozet['avg_fg2_pct'].where(fg2a_toplam > 0, 0).fillna(0)
+    
+    # sezon_advanced_stats_hesapla anahtar sırası
+    sira = ['total_games'] + list(SEZON_OZETI)
+    sira.insert(sira.index('total_triple_doubles') + 1, 'double_double_pct')
+    return ozet[sira]
 
 def sezon_advanced_stats_hesapla(mac_df):
     """
@@ -126,55 +222,12 @@ def sezon_advanced_stats_hesapla(mac_df):
     if mac_df is None or mac_df.empty:
         return None
     
-    # Zenginleştir
-    df = mac_istatistikleri_zenginlestir(mac_df)
-    
-    total_games = len(df)
-    
-    stats = {
-        # Temel istatistikler
-        'total_games': total_games,
-        'avg_min': df['MIN'].mean(),
-        'avg_pts': df['PTS'].mean(),
-        'avg_reb': df['REB'].mean(),
-        'avg_oreb': df['OREB'].mean(),
-        'avg_dreb': df['DREB'].mean(),
-        'avg_ast': df['AST'].mean(),
-        'avg_stl': df['STL'].mean(),
-        'avg_blk': df['BLK'].mean(),
-        'avg_tov': df['TOV'].mean(),
-        'avg_pf': df['PF'].mean(),
-        'avg_plus_minus': df['PLUS_MINUS'].mean(),
-        
-        # Şut yüzdeleri
-        'avg_fg_pct': df['FG_PCT'].mean(),
-        'avg_fg3_pct': df['FG3_PCT'].mean(),
-        'avg_ft_pct': df['FT_PCT'].mean(),
-        
-        # Advanced stats
-        'avg_ts_pct': df['TS_PCT'].mean(),
-        'avg_efg_pct': df['EFG_PCT'].mean(),
-        'avg_ast_tov_ratio': df['AST_TOV_RATIO'].mean(),
-        
-        # Double/Triple doubles
-        'total_double_doubles': df['DOUBLE_DOUBLE'].sum(),
-        'total_triple_doubles': df['TRIPLE_DOUBLE'].sum(),
-        'double_double_pct': (df['DOUBLE_DOUBLE'].sum() / total_games * 100) if total_games > 0 else 0,
-        
-        # Şut dağılımı
-        'avg_fgm': df['FGM'].mean(),
-        'avg_fga': df['FGA'].mean(),
-        'avg_fg3m': df['FG3M'].mean(),
-        'avg_fg3a': df['FG3A'].mean(),
-        'avg_ftm': df['FTM'].mean(),
-        'avg_fta': df['FTA'].mean(),
-        
-        # 2 sayılık şutlar (hesaplanmış)
-        'avg_fg2m': (df['FGM'] - df['FG3M']).mean(),
-        'avg_fg2a': (df['FGA'] - df['FG3A']).mean(),
-        'avg_fg2_pct': ((df['FGM'] - df['FG3M']) / (df['FGA'] - df['FG3A'])).mean() if (df['FGA'] - df['FG3A']).sum() > 0 else 0,
-    }
-    
+    # Tek oyunculu toplu hesap
+    ozet = toplu_sezon_advanced_stats_hesapla(mac_df.assign(_oyuncu=0), oyuncu_kolonu='_oyuncu')
+    stats = ozet.iloc[0].to_dict()
+    stats['total_games'] = int(stats['total_games'])
+    stats['total_double_doubles'] = int(stats['total_double_doubles'])
+    stats['total_triple_doubles'] = int(stats['total_triple_doubles'])
     return stats
 
 def format_advanced_stats_output(stats):
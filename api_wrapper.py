@@ -3,31 +3,139 @@ NBA API Wrapper
 Retry mekanizması, rate limiting ve cache ile optimize edilmiş API wrapper
 """
 
+import os
+import struct
+import threading
 import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 from functools import wraps
 from cache_manager import cache
+import kayit_oynatma
+import zamanlama
+import metrikler
+from cache_codec import anahtar_alani
+import nba_ayarlar  # NBA_STATS_BASE_URL: nba_api'yi alternatif upstream'e yönlendirir
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: process'ler arası dosya kilidi yok, sadece thread'ler arası birleştirme
+    fcntl = None
+
+# Stale-while-revalidate: süresi dolan veri bu kadar saat daha anında döner,
+# arka planda yenilenir. 0 = kapalı (eski davranış: kullanıcı yeni çağrıyı bekler)
+STALE_SURE_SAAT = float(os.environ.get('CACHE_STALE_SAAT', 24))
+
 
 class APIRateLimiter:
-    """API rate limiting sınıfı"""
+    """
+    API rate limiting sınıfı (token bucket)
+    
+    - Saniyede 1/min_interval token dolar, en fazla `kapasite` kadar birikir (burst)
+    - Durum paylaşılan bir dosyada tutulur ve fcntl ile kilitlenir: tüm gunicorn
+      worker'ları ve thread'ler aynı bütçeyi kullanır, worker sayısı artsa da
+      stats.nba.com'a giden toplam hız değişmez
+    - Token yoksa çağrı kendi sırasını rezerve eder (token eksiye düşer) ve
+      sırası gelene kadar bekler: bekleyenler FIFO'ya yakın sırayla geçer
+    """
+    
+    DURUM_FORMAT = 'dd'  # (token sayısı, son güncelleme zamanı)
     
-    def __init__(self, min_interval=1.0):  # 1 saniye bekle - NBA API için saygılı
+    def __init__(self, min_interval=1.0, kapasite=1, durum_dosyasi=None):  # 1 saniye bekle - NBA API için saygılı
         """
         Args:
-            min_interval: API çağrıları arasındaki minimum süre (saniye)
+            min_interval: Sürekli hızda API çağrıları arasındaki minimum süre (saniye)
+            kapasite: Birikebilecek maksimum token (anlık burst)
+            durum_dosyasi: Paylaşılan durum dosyası. None = sadece process içi
         """
         self.min_interval = min_interval
+        self.kapasite = max(1, kapasite)
+        self.durum_dosyasi = durum_dosyasi
+        self._lock = threading.Lock()
+        self._tokens = float(self.kapasite)
+        self._son = time.time()
         self.last_call = 0
+        self.pasif = False  # Oynatma modunda upstream yok, beklemeye gerek yok
+    
+    def _rezerve_et(self, durum):
+        """(tokens, son) durumundan bir token düşer, (yeni durum, bekleme süresi) döndürür"""
+        tokens, son = durum
+        simdi = time.time()
+        
+        if self.min_interval > 0:
+            tokens = min(self.kapasite, tokens + (simdi - son) / self.min_interval)
+        else:
+            tokens = self.kapasite
+        tokens -= 1
+        
+        bekleme = -tokens * self.min_interval if tokens < 0 else 0.0
+        return (tokens, simdi), bekleme
+    
+    def _paylasimli_rezerve_et(self):
+        """Dosyadaki paylaşılan durumu kilitleyip bir token rezerve eder"""
+        boyut = struct.calcsize(self.DURUM_FORMAT)
+        
+        fd = os.open(self.durum_dosyasi, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                veri = os.pread(fd, boyut, 0)
+                if len(veri) == boyut:
+                    durum = struct.unpack(self.DURUM_FORMAT, veri)
+                else:
+                    durum = (float(self.kapasite), time.time())
+                
+                yeni_durum, bekleme = self._rezerve_et(durum)
+                os.pwrite(fd, struct.pack(self.DURUM_FORMAT, *yeni_durum), 0)
+                return bekleme
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
     
     def wait(self):
-        """Gerekirse bekle"""
-        elapsed = time.time() - self.last_call
-        if elapsed < self.min_interval:
-            time.sleep(self.min_interval - elapsed)
+        """Gerekirse bekle. Beklenen süreyi (saniye) döndürür"""
+        if self.pasif:
+            return 0.0
+        
+        with self._lock:
+            bekleme = None
+            if self.durum_dosyasi and fcntl is not None:
+                try:
+                    bekleme = self._paylasimli_rezerve_et()
+                except OSError as e:
+                    print(f"⚠️ Paylaşılan rate limiter hatası, process içi limit kullanılıyor: {e}")
+            
+            if bekleme is None:
+                (self._tokens, self._son), bekleme = self._rezerve_et((self._tokens, self._son))
+        
+        if bekleme > 0:
+            time.sleep(bekleme)
         self.last_call = time.time()
+        metrikler.rate_limit_bekleme.observe(bekleme)
+        return bekleme
+
+
+def _rate_limiter_olustur():
+    """Global rate limiter'ı ortam değişkenlerinden oluşturur"""
+    durum_dizini = cache.cache_dir
+    durum_dizini.mkdir(parents=True, exist_ok=True)
+    return APIRateLimiter(
+        min_interval=float(os.environ.get('NBA_RATE_LIMIT_ARALIK', 1.0)),
+        kapasite=int(os.environ.get('NBA_RATE_LIMIT_KAPASITE', 3)),
+        durum_dosyasi=os.environ.get('NBA_RATE_LIMIT_DOSYASI', str(durum_dizini / '.rate_limiter'))
+    )
 
 
-# Global rate limiter
-rate_limiter = APIRateLimiter()
+# Global rate limiter (tüm worker'lar arasında paylaşılır)
+rate_limiter = _rate_limiter_olustur()
+
+# Kayıt/oynatma modu (NBA_VERI_MODU); oynatmada rate limiter beklemez
+if kayit_oynatma.ortamdan_kur() == kayit_oynatma.MOD_OYNAT:
+    rate_limiter.pasif = True
 
 
 def with_retry(max_retries=3, delay=2.0, backoff=2.0):
@@ -52,33 +160,216 @@ def with_retry(max_retries=3, delay=2.0, backoff=2.0):
                     print(f"⚠️  API veri formatı hatası (deneme {attempt + 1}/{max_retries}): {str(e)}")
                     last_exception = e
                     if attempt < max_retries - 1:
+                        metrikler.retry_sayisi.inc(fonksiyon=func.__name__, sonuc='tekrar')
                         time.sleep(current_delay)
                         current_delay *= backoff
                     continue
                 except Exception as e:
                     last_exception = e
+                    if getattr(e, 'tekrar_denenmez', False):
+                        # Tekrar denemenin anlamı yok (örn. oynatma modunda kayıt yok)
+                        print(f"❌ {e}")
+                        break
                     if attempt < max_retries - 1:
                         print(f"⚠️ Deneme {attempt + 1}/{max_retries} başarısız: {e}")
                         print(f"   {current_delay:.1f} saniye sonra tekrar denenecek...")
+                        metrikler.retry_sayisi.inc(fonksiyon=func.__name__, sonuc='tekrar')
                         time.sleep(current_delay)
                         current_delay *= backoff
                     else:
                         print(f"❌ Tüm denemeler başarısız oldu: {e}")
             
+            metrikler.retry_sayisi.inc(fonksiyon=func.__name__, sonuc='basarisiz')
             raise last_exception
         
         return wrapper
     return decorator
 
 
-def with_cache(cache_key_func=None, cache_duration_hours=6):
+class TekUcus:
+    """
+    Single-flight: Aynı key için eşzamanlı çağrıları tek çağrıda birleştirir
+    İlk gelen (lider) çağrıyı yapar, diğer thread'ler bekleyip aynı sonucu alır
+    """
+    
+    class _Cagri:
+        def __init__(self):
+            self.event = threading.Event()
+            self.sonuc = None
+            self.hata = None
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ucustakiler = {}
+    
+    def yap(self, key, func):
+        """func()'u key başına tek seferde çalıştırır, sonucu bekleyenlerle paylaşır"""
+        with self._lock:
+            cagri = self._ucustakiler.get(key)
+            lider = cagri is None
+            if lider:
+                cagri = self._Cagri()
+                self._ucustakiler[key] = cagri
+        
+        if not lider:
+            print(f"⏳ Devam eden çağrı bekleniyor: {key[:50]}...")
+            cagri.event.wait()
+            if cagri.hata is not None:
+                raise cagri.hata
+            return cagri.sonuc
+        
+        try:
+            cagri.sonuc = func()
+            return cagri.sonuc
+        except Exception as e:
+            cagri.hata = e
+            raise
+        finally:
+            with self._lock:
+                self._ucustakiler.pop(key, None)
+            cagri.event.set()
+
+
+# Global single-flight
+tek_ucus = TekUcus()
+
+
+# Kilit dosyası havuzu: key'ler sabit sayıda dosyaya dağıtılır (key başına dosya birikmez)
+KILIT_HAVUZU = 256
+
+# Thread'in tuttuğu havuz dilimleri: aynı dilime düşen iç içe api_call kendini beklemesin
+_tutulan_kilitler = threading.local()
+
+
+@contextmanager
+def dosya_kilidi(key):
+    """
+    Process'ler (gunicorn worker'ları) arası key bazlı kilit
+    Kilit dosyaları cache klasöründe sabit bir havuzda tutulur (crc32(key) % KILIT_HAVUZU).
+    Dilim tüm çekim boyunca (retry ve bekleme süreleri dahil) tutulur: aynı dilime düşen
+    farklı key'ler bu süre boyunca birbirini bekler
+    """
+    if fcntl is None:
+        yield
+        return
+    
+    dilim = zlib.crc32(key.encode('utf-8')) % KILIT_HAVUZU
+    tutulanlar = getattr(_tutulan_kilitler, 'dilimler', None)
+    if tutulanlar is None:
+        tutulanlar = _tutulan_kilitler.dilimler = set()
+    if dilim in tutulanlar:
+        # Dış çağrı aynı dilimi zaten tutuyor
+        yield
+        return
+    
+    kilit_dizini = cache.cache_dir / '.kilitler'
+    kilit_dizini.mkdir(parents=True, exist_ok=True)
+    
+    with open(kilit_dizini / f"{dilim:03d}.lock", 'a') as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        tutulanlar.add(dilim)
+        try:
+            yield
+        finally:
+            tutulanlar.discard(dilim)
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _taze_entry(cache_key, sure):
+    """
+    Diskte süresi dolmamış veri varsa döndürür, yoksa None
+    Bellek katmanı atlanır: bellekteki süresi dolmuş kopya başka worker'ın yeni yazdığı dosyayı gizlemesin
+    """
+    entry = cache.diskten_entry(cache_key)
+    if entry is not None and datetime.now() - entry[1] <= sure:
+        return entry[0]
+    return None
+
+
+def _kilitli_cek(cache_key, func, args, kwargs, sure):
+    """
+    Worker'lar arası tek çekim: Kilidi alan çeker ve cache'e yazar,
+    kilidi bekleyen diğer worker cache'i tekrar kontrol edip API'ye gitmez
+    """
+    with dosya_kilidi(cache_key):
+        taze = _taze_entry(cache_key, sure)
+        if taze is not None:
+            print(f"✅ Başka worker tarafından çekildi: {cache_key[:50]}...")
+            return taze
+        
+        print(f"🔄 API'den çekiliyor: {cache_key[:50]}...")
+        result = func(*args, **kwargs)
+        
+        if result is not None:
+            cache.set(cache_key, result, sure=sure)
+        
+        return result
+
+
+class ArkaPlanYenileyici:
+    """Süresi dolmuş cache girdilerini arka planda yenileyen sınıf"""
+    
+    def __init__(self, max_workers=2):
+        """
+        Args:
+            max_workers: Aynı anda çalışacak maksimum yenileme sayısı
+        """
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='cache-yenile')
+        self._lock = threading.Lock()
+        self._devam_edenler = set()
+    
+    def yenile(self, cache_key, func, args, kwargs, sure):
+        """Key için yenileme başlat (aynı key zaten yenileniyorsa tekrar başlatma)"""
+        with self._lock:
+            if cache_key in self._devam_edenler:
+                return False
+            self._devam_edenler.add(cache_key)
+        
+        self._executor.submit(self._calistir, cache_key, func, args, kwargs, sure)
+        return True
+    
+    def _calistir(self, cache_key, func, args, kwargs, sure):
+        """Yenilemeyi yap ve cache'e yaz"""
+        try:
+            result = tek_ucus.yap(cache_key, lambda: _kilitli_cek(cache_key, func, args, kwargs, sure))
+            if result is not None:
+                print(f"🔁 Arka planda yenilendi: {cache_key[:50]}...")
+        except Exception as e:
+            # Eski veri cache'de kalır, bir sonraki istek tekrar dener
+            print(f"⚠️ Arka plan yenileme hatası ({cache_key[:50]}): {e}")
+        finally:
+            with self._lock:
+                self._devam_edenler.discard(cache_key)
+    
+    def devam_eden_sayisi(self):
+        """Şu an yenilenen key sayısı"""
+        with self._lock:
+            return len(self._devam_edenler)
+
+
+# Global arka plan yenileyici
+yenileyici = ArkaPlanYenileyici()
+
+
+def _cache_karari(cache_key, sonuc):
+    """Cache kararını aktif span'e ve metriklere yazar"""
+    zamanlama.cache_olayi(sonuc)
+    metrikler.cache_istek.inc(alan=anahtar_alani(cache_key), sonuc=sonuc)
+
+
+def with_cache(cache_key_func=None, cache_duration_hours=6, stale_duration_hours=None):
     """
     Cache decorator - API sonuçlarını önbelleğe al
     
     Args:
         cache_key_func: Cache key oluşturma fonksiyonu
         cache_duration_hours: Cache süresi (saat)
+        stale_duration_hours: Süre dolduktan sonra eski verinin anında dönüp
+            arka planda yenileneceği pencere (saat). None = STALE_SURE_SAAT, 0 = kapalı
     """
+    sure = timedelta(hours=cache_duration_hours)
+    stale_sure = timedelta(hours=STALE_SURE_SAAT if stale_duration_hours is None else stale_duration_hours)
+    
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
@@ -90,20 +381,29 @@ def with_cache(cache_key_func=None, cache_duration_hours=6):
                 cache_key = f"{func.__name__}_{str(args)}_{str(kwargs)}"
             
             # Cache'den kontrol et
-            cached_data = cache.get(cache_key)
-            if cached_data is not None:
-                print(f"✅ Cache'den alındı: {cache_key[:50]}...")
-                return cached_data
-            
-            # API'den çek
-            print(f"🔄 API'den çekiliyor: {cache_key[:50]}...")
-            result = func(*args, **kwargs)
+            entry = cache.get_entry(cache_key)
+            if entry is not None:
+                cached_data, cached_time = entry
+                yas = datetime.now() - cached_time
+                
+                if yas <= sure:
+                    print(f"✅ Cache'den alındı: {cache_key[:50]}...")
+                    _cache_karari(cache_key, 'hit')
+                    return cached_data
+                
+                if yas <= sure + stale_sure:
+                    # Eski veriyi hemen dön, arka planda yenile
+                    print(f"♻️ Eski cache döndü, arka planda yenileniyor: {cache_key[:50]}...")
+                    yenileyici.yenile(cache_key, func, args, kwargs, sure)
+                    _cache_karari(cache_key, 'stale')
+                    return cached_data
             
-            # Cache'e kaydet
-            if result is not None:
-                cache.set(cache_key, result)
-            
-            return result
+            # API'den çek (aynı key için eşzamanlı çağrılar tek çağrıda birleşir)
+            _cache_karari(cache_key, 'miss')
+            return tek_ucus.yap(
+                cache_key,
+                lambda: _kilitli_cek(cache_key, func, args, kwargs, sure)
+            )
         
         return wrapper
     return decorator
@@ -119,10 +419,16 @@ def with_rate_limit(func):
 
 
 # Kombine decorator: Cache + Retry + Rate Limit
-def api_call(cache_key_func=None, max_retries=3, cache_duration_hours=6):
+def api_call(cache_key_func=None, max_retries=3, cache_duration_hours=6, stale_duration_hours=None):
     """
     Tüm optimizasyonları içeren decorator
     
+    Args:
+        cache_key_func: Cache key oluşturma fonksiyonu
+        max_retries: Maksimum deneme sayısı
+        cache_duration_hours: Cache süresi (saat)
+        stale_duration_hours: Stale-while-revalidate penceresi (saat), 0 = kapalı
+    
     Kullanım:
         @api_call(cache_key_func=lambda player_id: f"player_{player_id}")
         def get_player_stats(player_id):
@@ -130,10 +436,11 @@ def api_call(cache_key_func=None, max_retries=3, cache_duration_hours=6):
             pass
     """
     def decorator(func):
-        # Önce cache, sonra retry, en son rate limit
-        func = with_cache(cache_key_func, cache_duration_hours)(func)
-        func = with_retry(max_retries)(func)
+        # Dıştan içe: cache -> retry -> rate limit -> API
+        # Cache hit'leri rate limiter'da beklemez, sadece gerçek API çağrıları sınırlanır
         func = with_rate_limit(func)
+        func = with_retry(max_retries)(func)
+        func = with_cache(cache_key_func, cache_duration_hours, stale_duration_hours)(func)
         return func
     return decorator
 
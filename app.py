@@ -2,12 +2,20 @@
 NBA Analiz Sistemi - Flask Backend
 """
 
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for, send_from_directory, make_response
+from flask import Flask, render_template, request, jsonify, session, redirect, url_for, send_from_directory, make_response, g, Response, stream_with_context
 from flask_cors import CORS
-from baraj_analiz import BarajAnaliz
-from takim_analiz_v2 import mac_tahmini_v2
+from baraj_analiz import BarajAnaliz, toplu_analiz
+from takim_analiz_v2 import mac_tahmini_v2, mac_bulteni, gunun_eslesmeleri, tarihin_sezonu, VARSAYILAN_SEZON
+from on_isitici import on_isitici
+from oyuncu_indeksi import oyuncu_indeksi
+from liderlik import liderlik_tablosu, LIDERLIK_KOLONLARI, VARSAYILAN_SIRALAMA
+from nba_data_optimized import guncel_sezon_bul
+import zamanlama
+import metrikler
 import os
 import json
+import math
+import time
 from datetime import datetime
 
 app = Flask(__name__)
@@ -18,6 +26,52 @@ CORS(app)
 USERS = {
     'admin': 'admin123',
 }
+# Zamanlama dökümü gibi iç bilgileri görebilen kullanıcılar
+ADMINLER = {'admin'}
+
+# Oyuncu arama indeksi başlangıçta bir kez kurulur (ilk istek beklemesin)
+oyuncu_indeksi()
+
+# Cache ön ısıtma (deploy sonrası ilk kullanıcılar soğuk cache beklemesin)
+ON_ISITMA = os.environ.get('NBA_ON_ISITMA', '0') == '1'
+if ON_ISITMA:
+    on_isitici.baslat()
+
+# /hazir endpoint'i: ön ısıtma açıkken kritik görevler (lig tabloları + lig maç logu) bitene
+# kadar 503 döner; NBA_HAZIR_ESIK ayrıca toplam kapsama için alt sınır koyar (0 = ek şart yok)
+HAZIR_ESIK = float(os.environ.get('NBA_HAZIR_ESIK', 0))
+
+# /metrics için bearer token (route/namespace bazlı trafik içerir; render.yaml'da üretilir,
+# boş = herkese açık, sadece yerel geliştirme için)
+METRIK_TOKEN = os.environ.get('NBA_METRIK_TOKEN', '')
+
+# /api/oyuncu-analiz merdiven modunda tek istekte kabul edilen en fazla baraj
+MERDIVEN_LIMITI = 50
+
+# /api/oyuncu-analiz/batch tek istekte kabul edilen en fazla satır
+TOPLU_LIMIT = 100
+
+# /api/mac-analiz/bulten tek istekte kabul edilen en fazla maç (bir gecede en fazla 15 maç olur)
+BULTEN_LIMIT = 30
+
+# /api/liderlik tek istekte dönen en fazla oyuncu
+LIDERLIK_LIMITI = 500
+
+@app.before_request
+def istek_baslangici():
+    g.istek_baslangic = time.perf_counter()
+
+@app.after_request
+def istek_metrigi(response):
+    baslangic = g.pop('istek_baslangic', None)
+    if baslangic is not None:
+        # Route şablonu kullanılır (/api/x/<id>), gerçek path kardinaliteyi patlatır
+        route = request.url_rule.rule if request.url_rule is not None else 'eslesmeyen'
+        metrikler.http_sure.observe(
+            time.perf_counter() - baslangic,
+            route=route, method=request.method, status=response.status_code
+        )
+    return response
 
 # Kullanıcı giriş kontrolü
 def login_required(f):
@@ -28,6 +82,15 @@ def login_required(f):
     wrapper.__name__ = f.__name__
     return wrapper
 
+def admin_mi():
+    return session.get('username') in ADMINLER
+
+def zamanlama_istendi(data=None):
+    """Admin isteği zamanlama dökümü istiyor mu (?zamanlama=1 veya gövdede "zamanlama": true)"""
+    if not admin_mi():
+        return False
+    return request.args.get('zamanlama') == '1' or bool((data or {}).get('zamanlama'))
+
 @app.route('/')
 def index():
     """Ana sayfa - giriş kontrolü"""
@@ -73,6 +136,42 @@ def takimlar_json():
     """Takım listesi JSON endpoint"""
     return send_from_directory('.', 'takimlar.json')
 
+@app.route('/hazir')
+def hazir():
+    """Readiness endpoint - cache ön ısıtma kapsamını raporlar"""
+    rapor = on_isitici.durum_raporu()
+    # Ön ısıtma kapalıysa beklenecek bir şey yok
+    rapor['hazir'] = not ON_ISITMA or (rapor['kritik_hazir'] and rapor['kapsama'] >= HAZIR_ESIK)
+    rapor['esik'] = HAZIR_ESIK
+    return jsonify(rapor), (200 if rapor['hazir'] else 503)
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus metrikleri (tüm worker'ların toplamı)"""
+    if METRIK_TOKEN and request.headers.get('Authorization') != f'Bearer {METRIK_TOKEN}':
+        return Response('Yetkisiz\n', status=401, mimetype='text/plain')
+    return Response(metrikler.kayit.prometheus_metni(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/oyuncu-ara')
+@login_required
+def oyuncu_ara():
+    """Oyuncu ismi autocomplete endpoint'i (?q=...&limit=10&aktif=1)"""
+    sorgu = request.args.get('q', '')
+    try:
+        limit = max(1, min(int(request.args.get('limit', 10)), 50))
+    except ValueError:
+        limit = 10
+    sadece_aktif = request.args.get('aktif') == '1'
+    
+    sonuc = oyuncu_indeksi().ara(sorgu, limit=limit, sadece_aktif=sadece_aktif)
+    return jsonify({
+        'success': True,
+        'data': [
+            {'id': p['id'], 'full_name': p['full_name'], 'is_active': p.get('is_active', False)}
+            for p in sonuc
+        ]
+    })
+
 @app.route('/api/oyuncu-analiz', methods=['POST'])
 @login_required
 def oyuncu_analiz():
@@ -80,7 +179,7 @@ def oyuncu_analiz():
     try:
         data = request.get_json()
         oyuncu_isim = data.get('oyuncu_isim')
-        baraj = int(data.get('baraj', 40))
+        barajlar = data.get('barajlar')
         analiz_tipi = data.get('analiz_tipi', 'SAR')
         ev_deplasman = data.get('ev_deplasman', 'Bilinmiyor')
         ev_orani = data.get('ev_orani')
@@ -102,15 +201,39 @@ def oyuncu_analiz():
             elif ev_deplasman == 'Deplasman':
                 mac_orani = dep_orani  # Oyuncu deplasman → deplasman oranını kullan
         
+        # Merdiven modu: birden fazla baraj tek analizde
+        if barajlar:
+            try:
+                barajlar = [float(b) for b in barajlar] if isinstance(barajlar, list) else None
+            except (TypeError, ValueError):
+                barajlar = None
+            # get_json NaN / Infinity kabul eder: sonlu olmayan baraj geçersiz JSON cevap üretir
+            if (not barajlar or len(barajlar) > MERDIVEN_LIMITI
+                    or not all(math.isfinite(b) and b > 0 for b in barajlar)):
+                return jsonify({
+                    'success': False,
+                    'message': f'barajlar en fazla {MERDIVEN_LIMITI} pozitif sayıdan oluşan bir liste olmalı!'
+                })
+            baraj = barajlar[0]
+        else:
+            baraj = int(data.get('baraj', 40))
+        
         # Analiz yap
         analiz = BarajAnaliz(oyuncu_isim, baraj, analiz_tipi, ev_deplasman, mac_orani)
-        sonuc = analiz.analiz_yap()
+        with zamanlama.iz('api.oyuncu_analiz') as iz:
+            if barajlar:
+                sonuc = analiz.merdiven_analiz(barajlar)
+            else:
+                sonuc = analiz.analiz_yap()
         
         if sonuc:
-            return jsonify({
+            cevap = {
                 'success': True,
                 'data': sonuc
-            })
+            }
+            if zamanlama_istendi(data):
+                cevap['zamanlama'] = iz.rapor()
+            return jsonify(cevap)
         else:
             return jsonify({
                 'success': False,
@@ -123,6 +246,84 @@ def oyuncu_analiz():
             'message': f'Hata: {str(e)}'
         })
 
+def toplu_satir(satir):
+    """
+    Toplu analiz satırını BarajAnaliz argümanlarına çevirir
+    Satır dict ({'oyuncu_isim', 'baraj', 'analiz_tipi', 'ev_deplasman', 'oran'})
+    veya aynı sırada liste olabilir
+    """
+    if isinstance(satir, (list, tuple)):
+        satir = dict(zip(('oyuncu_isim', 'baraj', 'analiz_tipi', 'ev_deplasman', 'oran'), satir))
+    if not isinstance(satir, dict) or not satir.get('oyuncu_isim'):
+        raise ValueError('oyuncu_isim eksik')
+    
+    baraj = float(satir.get('baraj', 40))
+    if not (math.isfinite(baraj) and baraj > 0):
+        raise ValueError('baraj pozitif bir sayı olmalı')
+    oran = satir.get('oran')
+    return {
+        'oyuncu_isim': satir['oyuncu_isim'],
+        'baraj': baraj,
+        'analiz_tipi': satir.get('analiz_tipi') or 'SAR',
+        'ev_deplasman': satir.get('ev_deplasman') or 'Bilinmiyor',
+        'mac_orani': float(oran) if oran else None,
+    }
+
+@app.route('/api/oyuncu-analiz/batch', methods=['POST'])
+@login_required
+def oyuncu_analiz_batch():
+    """
+    Toplu oyuncu analizi API endpoint
+    Satırlar oyuncu bazında tekilleştirilip sınırlı paralellikle çekilir.
+    'akis' verilirse sonuçlar tamamlandıkça NDJSON satırları olarak akar
+    """
+    try:
+        data = request.get_json() or {}
+        satirlar = data.get('istekler') or []
+        
+        if not isinstance(satirlar, list) or not satirlar:
+            return jsonify({'success': False, 'message': 'istekler listesi boş!'})
+        if len(satirlar) > TOPLU_LIMIT:
+            return jsonify({'success': False, 'message': f'Tek istekte en fazla {TOPLU_LIMIT} satır!'})
+        
+        istekler = []
+        for i, satir in enumerate(satirlar):
+            try:
+                istekler.append(toplu_satir(satir))
+            except (TypeError, ValueError) as e:
+                return jsonify({'success': False, 'message': f'{i}. satır geçersiz: {e}'})
+        
+        def satir_cevabi(indeks, sonuc, mesaj):
+            if sonuc:
+                return {'indeks': indeks, 'success': True, 'data': sonuc}
+            return {'indeks': indeks, 'success': False, 'message': mesaj}
+        
+        if data.get('akis') or request.args.get('akis') == '1':
+            def akis():
+                for indeks, sonuc, mesaj in toplu_analiz(istekler):
+                    yield json.dumps(satir_cevabi(indeks, sonuc, mesaj), ensure_ascii=False) + '\n'
+            return Response(stream_with_context(akis()), mimetype='application/x-ndjson')
+        
+        with zamanlama.iz('api.oyuncu_analiz_batch') as iz:
+            sonuclar = [None] * len(istekler)
+            for indeks, sonuc, mesaj in toplu_analiz(istekler):
+                sonuclar[indeks] = satir_cevabi(indeks, sonuc, mesaj)
+        
+        cevap = {
+            'success': True,
+            'data': sonuclar,
+            'basarili': sum(1 for satir in sonuclar if satir['success'])
+        }
+        if zamanlama_istendi(data):
+            cevap['zamanlama'] = iz.rapor()
+        return jsonify(cevap)
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Hata: {str(e)}'
+        })
+
 @app.route('/api/mac-analiz', methods=['POST'])
 @login_required
 def mac_analiz():
@@ -152,14 +353,18 @@ def mac_analiz():
         
         # Analiz yap (Regresyonlu V2 algoritması)
         print(f"🔄 Analiz başlatılıyor...")
-        sonuc = mac_tahmini_v2(ev_takim, dep_takim, baraj=baraj, sezon='2024-25', verbose=False)
+        with zamanlama.iz('api.mac_analiz') as iz:
+            sonuc = mac_tahmini_v2(ev_takim, dep_takim, baraj=baraj, sezon=VARSAYILAN_SEZON, verbose=False)
         
         if sonuc:
             print(f"✅ Analiz başarılı!")
-            return jsonify({
+            cevap = {
                 'success': True,
                 'data': sonuc
-            })
+            }
+            if zamanlama_istendi(data):
+                cevap['zamanlama'] = iz.rapor()
+            return jsonify(cevap)
         else:
             print(f"❌ Analiz başarısız - sonuc None")
             return jsonify({
@@ -173,6 +378,138 @@ def mac_analiz():
             'message': f'Hata: {str(e)}'
         })
 
+@app.route('/api/mac-analiz/bulten', methods=['POST'])
+@login_required
+def mac_analiz_bulten():
+    """
+    Toplu maç analizi API endpoint (bir gecenin tüm maçları)
+    Gövde: {"maclar": [{"ev_takim", "dep_takim", "baraj"}]} veya {"tarih": "YYYY-MM-DD"}
+    """
+    try:
+        data = request.get_json() or {}
+        maclar = data.get('maclar')
+        tarih = data.get('tarih')
+        
+        if tarih:
+            try:
+                datetime.strptime(tarih, '%Y-%m-%d')
+            except (TypeError, ValueError):
+                return jsonify({'success': False, 'message': 'tarih YYYY-MM-DD formatında olmalı!'})
+            maclar = gunun_eslesmeleri(tarih)
+            if maclar is None:
+                return jsonify({'success': False, 'message': 'Maç programı çekilemedi!'})
+        
+        if not isinstance(maclar, list) or not maclar:
+            return jsonify({'success': False, 'message': 'maclar listesi veya tarih gerekli!'})
+        if len(maclar) > BULTEN_LIMIT:
+            return jsonify({'success': False, 'message': f'Tek istekte en fazla {BULTEN_LIMIT} maç!'})
+        
+        for i, mac in enumerate(maclar):
+            if not isinstance(mac, dict) or not mac.get('ev_takim') or not mac.get('dep_takim'):
+                return jsonify({'success': False, 'message': f'{i}. maçta takım isimleri boş olamaz!'})
+            if mac.get('baraj'):
+                try:
+                    mac['baraj'] = float(mac['baraj'])
+                except (TypeError, ValueError):
+                    return jsonify({'success': False, 'message': f'{i}. maçın barajı sayı olmalı!'})
+        
+        sezon = data.get('sezon') or (tarihin_sezonu(tarih) if tarih else guncel_sezon_bul())
+        with zamanlama.iz('api.mac_analiz_bulten') as iz:
+            sonuclar = mac_bulteni(maclar, sezon=sezon, verbose=False)
+        
+        if sonuclar is None:
+            return jsonify({
+                'success': False,
+                'message': 'Lig verileri çekilemedi!'
+            })
+        
+        cevap = {
+            'success': True,
+            'sezon': sezon,
+            'tarih': tarih,
+            'data': sonuclar,
+            'basarili': sum(1 for satir in sonuclar if satir['success'])
+        }
+        if zamanlama_istendi(data):
+            cevap['zamanlama'] = iz.rapor()
+        return jsonify(cevap)
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Hata: {str(e)}'
+        })
+
+@app.route('/api/liderlik')
+@login_required
+def liderlik():
+    """
+    Sezon advanced stats liderlik tablosu
+    ?sezon=2024-25&siralama=avg_ts_pct&yon=azalan|artan&min_mac=10&min_dakika=15&takim=LAL&limit=50
+    """
+    try:
+        siralama = request.args.get('siralama', VARSAYILAN_SIRALAMA)
+        if siralama not in LIDERLIK_KOLONLARI:
+            return jsonify({
+                'success': False,
+                'message': f'siralama şunlardan biri olmalı: {", ".join(LIDERLIK_KOLONLARI)}'
+            })
+        
+        try:
+            min_mac = max(0, int(request.args.get('min_mac', 0)))
+            min_dakika = max(0.0, float(request.args.get('min_dakika', 0)))
+            limit = max(1, min(int(request.args.get('limit', 50)), LIDERLIK_LIMITI))
+        except ValueError:
+            return jsonify({'success': False, 'message': 'min_mac, min_dakika ve limit sayı olmalı!'})
+        
+        # Ön ısıtıcı ile aynı cache girdisi için sezon açıkça çözülür
+        sezon = request.args.get('sezon') or guncel_sezon_bul()
+        with zamanlama.iz('api.liderlik') as iz:
+            sonuc = liderlik_tablosu.siralama(
+                sezon=sezon,
+                siralama=siralama,
+                azalan=request.args.get('yon', 'azalan') != 'artan',
+                min_mac=min_mac,
+                min_dakika=min_dakika,
+                takim=request.args.get('takim') or None,
+                limit=limit
+            )
+        
+        if sonuc is None:
+            return jsonify({
+                'success': False,
+                'message': 'Lig maç logları çekilemedi!'
+            })
+        
+        toplam, satirlar = sonuc
+        cevap = {
+            'success': True,
+            'sezon': sezon,
+            'siralama': siralama,
+            'toplam': toplam,
+            'data': satirlar
+        }
+        if zamanlama_istendi():
+            cevap['zamanlama'] = iz.rapor()
+        return jsonify(cevap)
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Hata: {str(e)}'
+        })
+
+@app.route('/api/zamanlama', methods=['GET', 'DELETE'])
+@login_required
+def zamanlama_raporu():
+    """Aşama bazlı zamanlama istatistikleri (admin). DELETE ile sıfırlanır"""
+    if not admin_mi():
+        return jsonify({'success': False, 'message': 'Yetkisiz'}), 403
+    if request.method == 'DELETE':
+        zamanlama.toplayici.sifirla()
+        return jsonify({'success': True})
+    return jsonify({'success': True, 'data': zamanlama.toplayici.rapor()})
+
 if __name__ == '__main__':
     # Templates klasörünü oluştur
     os.makedirs('templates', exist_ok=True)
@@ -5,18 +5,37 @@ Oyuncu prop bet (bahis) analizi için gelişmiş algoritma
 
 try:
     # Önce optimize edilmiş versiyonu dene
-    from nba_data_optimized import oyuncu_bul, sezon_istatistikleri_cek, son_maclar, oyuncu_detay_bilgi
+    from nba_data_optimized import oyuncu_bul, sezon_istatistikleri_cek, oyuncu_detay_bilgi, guncel_sezon_bul
+    from mac_log_deposu import oyuncu_mac_logu
     print("✅ Optimize edilmiş NBA API kullanılıyor (Cache + Retry + Rate Limit)")
 except ImportError:
     # Yoksa eski versiyonu kullan
-    from test_nba_data import oyuncu_bul, sezon_istatistikleri_cek, son_maclar, oyuncu_detay_bilgi
+    from test_nba_data import oyuncu_bul, sezon_istatistikleri_cek, son_maclar, oyuncu_detay_bilgi, guncel_sezon_bul
+    from mac_log_deposu import MacLogu
     print("⚠️ Standart NBA API kullanılıyor")
+    
+    def oyuncu_mac_logu(oyuncu_id, sezon=None):
+        """son_maclar DataFrame'ini kolon bazlı maç loguna çevirir"""
+        df = son_maclar(oyuncu_id, sezon)
+        if df is None or df.empty:
+            return None
+        return MacLogu.dataframe_den(oyuncu_id, sezon, df)
 
-from takim_analiz import takim_bul, takim_istatistikleri_cek, takim_advanced_stats_cek, son_5_mac_analiz
+from takim_analiz import takim_istatistikleri_cek, takim_advanced_stats_cek, son_5_mac_analiz
+from takim_indeksi import takim_bul, takim_indeksi
 from garbage_time_analyzer import uygula_garbage_time_penalty
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from zamanlama import span, spanli, izli, baglamli
+from mac_log_deposu import ANALIZ_KOLONLARI
 import numpy as np
 
+# Oyuncu bulunduktan sonra bağımsız API çağrılarının paralel çalışacağı thread sayısı
+# (Toplam hız yine api_wrapper'daki ortak rate limiter ile sınırlı)
+VERI_CEKME_PARALELLIK = 4
+
+# Toplu analizde aynı anda verisi çekilen oyuncu sayısı
+TOPLU_PARALELLIK = 4
+
 class BarajAnaliz:
     """Oyuncu bahis barajı analiz sınıfı"""
     
@@ -36,9 +55,11 @@ class BarajAnaliz:
         self.ev_deplasman = ev_deplasman
         self.mac_orani = mac_orani
         self.oyuncu_data = None
+        self.oyuncu_detay = None
         self.sezon_stats = None
-        self.mac_loglar = None
-        
+        self.mac_loglar = None  # MacLogu (kolon bazlı, en yeni maç başta)
+        self.takim_tempo = (None, None)
+    
     def veri_cek(self):
         """Oyuncu verilerini çeker"""
         print(f"\n{'='*70}")
@@ -50,30 +71,70 @@ class BarajAnaliz:
         print(f"{'='*70}\n")
         
         # Oyuncuyu bul
-        oyuncular = oyuncu_bul(self.oyuncu_isim)
+        with span('baraj.oyuncu_bul'):
+            oyuncular = oyuncu_bul(self.oyuncu_isim)
         if not oyuncular:
             return False
         
         self.oyuncu_data = oyuncular[0]
         oyuncu_id = self.oyuncu_data['id']
         
-        # Oyuncu detay bilgilerini çek (takım için)
-        self.oyuncu_detay = oyuncu_detay_bilgi(oyuncu_id)
+        # Bağımsız çağrıları paralel yap: detay, sezon istatistikleri ve maç logları
+        # aynı anda; takım tempo bilgisi detay gelir gelmez başlatılır.
+        # Maç logları mevcut sezon varsayımıyla çekilir, sezon farklı çıkarsa tekrar çekilir
+        tahmini_sezon = guncel_sezon_bul()
+        with ThreadPoolExecutor(max_workers=VERI_CEKME_PARALELLIK) as executor:
+            detay_future = executor.submit(spanli('baraj.oyuncu_detay', oyuncu_detay_bilgi), oyuncu_id)
+            sezon_future = executor.submit(spanli('baraj.sezon_stats', sezon_istatistikleri_cek), oyuncu_id)
+            maclar_future = executor.submit(spanli('baraj.mac_loglari', oyuncu_mac_logu), oyuncu_id, tahmini_sezon)
+            
+            # Oyuncu detay bilgileri (takım için)
+            self.oyuncu_detay = detay_future.result()
+            takim_adi = self._takim_adi()
+            tempo_future = None
+            if takim_adi:
+                tempo_future = executor.submit(spanli('baraj.takim_tempo', self.hesapla_takim_tempo_etkisi), takim_adi)
+            
+            # Sezon istatistikleri ve maç logları
+            self.sezon_stats, self.gercek_sezon = sezon_future.result()
+            self.mac_loglar = maclar_future.result()
+            if self.gercek_sezon and self.gercek_sezon != tahmini_sezon:
+                with span('baraj.mac_loglari_tekrar'):
+                    self.mac_loglar = oyuncu_mac_logu(oyuncu_id, sezon=self.gercek_sezon)
+            
+            if tempo_future is not None:
+                self.takim_tempo = tempo_future.result()
         
-        # Sezon istatistikleri
-        self.sezon_stats, self.gercek_sezon = sezon_istatistikleri_cek(oyuncu_id)
         if self.sezon_stats is None or self.sezon_stats.empty:
             print("❌ Sezon istatistikleri bulunamadı!")
             return False
         
-        # Maç logları
-        self.mac_loglar = son_maclar(oyuncu_id, sezon=self.gercek_sezon)
         if self.mac_loglar is None or self.mac_loglar.empty:
             print("❌ Maç logları bulunamadı!")
             return False
         
         return True
     
+    def _takim_adi(self):
+        """Oyuncu detay bilgisinden takım adını döndürür (yoksa None)"""
+        if self.oyuncu_detay is None or self.oyuncu_detay.empty:
+            return None
+        
+        takim_adi = None
+        if 'TEAM_NAME' in self.oyuncu_detay.columns:
+            takim_adi = str(self.oyuncu_detay['TEAM_NAME'].values[0])
+        elif 'TEAM_ABBREVIATION' in self.oyuncu_detay.columns:
+            takim_adi = str(self.oyuncu_detay['TEAM_ABBREVIATION'].values[0])
+        
+        if takim_adi and takim_adi != 'nan':
+            return takim_adi
+        return None
+    
+    @property
+    def metrikler(self):
+        """Maç logunun tüm analiz tipleri için metrikleri (MacMetrikleri)"""
+        return self.mac_loglar.metrikler()
+    
     def hesapla_ortalama(self):
         """Sezon ortalamasını hesaplar"""
         stats = self.sezon_stats.iloc[0]
@@ -82,106 +143,26 @@ class BarajAnaliz:
         if mac_sayisi == 0:
             return 0
         
-        if self.analiz_tipi == 'SAR':
-            # Sayı + Asist + Ribaund
-            pts = stats['PTS'] / mac_sayisi
-            ast = stats['AST'] / mac_sayisi
-            reb = stats['REB'] / mac_sayisi
-            return pts + ast + reb
-        elif self.analiz_tipi == 'PTS':
-            return stats['PTS'] / mac_sayisi
-        elif self.analiz_tipi == 'AST':
-            return stats['AST'] / mac_sayisi
-        elif self.analiz_tipi == 'REB':
-            return stats['REB'] / mac_sayisi
-        else:
-            return 0
+        # SAR: Sayı + Asist + Ribaund
+        kolonlar = ANALIZ_KOLONLARI.get(self.analiz_tipi, ())
+        return sum(stats[kolon] / mac_sayisi for kolon in kolonlar)
     
     def hesapla_mac_basari_orani(self):
         """Her maçta barajı geçme oranını hesaplar (TÜM SEZON)"""
-        basarili_maclar = 0
-        toplam_maclar = len(self.mac_loglar)
-        
-        for idx, mac in self.mac_loglar.iterrows():
-            if self.analiz_tipi == 'SAR':
-                deger = mac['PTS'] + mac['AST'] + mac['REB']
-            elif self.analiz_tipi == 'PTS':
-                deger = mac['PTS']
-            elif self.analiz_tipi == 'AST':
-                deger = mac['AST']
-            elif self.analiz_tipi == 'REB':
-                deger = mac['REB']
-            else:
-                deger = 0
-            
-            if deger >= self.baraj_limit:
-                basarili_maclar += 1
-        
-        basari_orani = (basarili_maclar / toplam_maclar * 100) if toplam_maclar > 0 else 0
-        return basari_orani, basarili_maclar, toplam_maclar
+        return self.metrikler.basari(self.analiz_tipi, self.baraj_limit)
     
     def hesapla_son_5_mac_basari_orani(self):
         """Son 5 maçta barajı geçme oranını hesaplar"""
-        son_5 = self.mac_loglar.head(5)
-        basarili_maclar = 0
-        toplam_maclar = len(son_5)
-        
-        for idx, mac in son_5.iterrows():
-            if self.analiz_tipi == 'SAR':
-                deger = mac['PTS'] + mac['AST'] + mac['REB']
-            elif self.analiz_tipi == 'PTS':
-                deger = mac['PTS']
-            elif self.analiz_tipi == 'AST':
-                deger = mac['AST']
-            elif self.analiz_tipi == 'REB':
-                deger = mac['REB']
-            else:
-                deger = 0
-            
-            if deger >= self.baraj_limit:
-                basarili_maclar += 1
-        
-        basari_orani = (basarili_maclar / toplam_maclar * 100) if toplam_maclar > 0 else 0
-        return basari_orani, basarili_maclar, toplam_maclar
+        return self.metrikler.son_5_basari(self.analiz_tipi, self.baraj_limit)
     
     def hesapla_son_5_mac_ortalama(self):
         """Son 5 maçın ortalamasını hesaplar"""
-        son_5 = self.mac_loglar.head(5)
-        
-        if self.analiz_tipi == 'SAR':
-            degerler = son_5['PTS'] + son_5['AST'] + son_5['REB']
-        elif self.analiz_tipi == 'PTS':
-            degerler = son_5['PTS']
-        elif self.analiz_tipi == 'AST':
-            degerler = son_5['AST']
-        elif self.analiz_tipi == 'REB':
-            degerler = son_5['REB']
-        else:
-            degerler = pd.Series([0])
-        
-        return degerler.mean()
+        return self.metrikler.ozet(self.analiz_tipi)['son_5_ortalama']
     
     def hesapla_ev_deplasman_fark(self):
         """Ev ve deplasman performans farkını hesaplar"""
-        ev_maclar = self.mac_loglar[self.mac_loglar['MATCHUP'].str.contains('vs.', na=False)]
-        dep_maclar = self.mac_loglar[self.mac_loglar['MATCHUP'].str.contains('@', na=False)]
-        
-        if self.analiz_tipi == 'SAR':
-            ev_ort = (ev_maclar['PTS'] + ev_maclar['AST'] + ev_maclar['REB']).mean() if len(ev_maclar) > 0 else 0
-            dep_ort = (dep_maclar['PTS'] + dep_maclar['AST'] + dep_maclar['REB']).mean() if len(dep_maclar) > 0 else 0
-        elif self.analiz_tipi == 'PTS':
-            ev_ort = ev_maclar['PTS'].mean() if len(ev_maclar) > 0 else 0
-            dep_ort = dep_maclar['PTS'].mean() if len(dep_maclar) > 0 else 0
-        elif self.analiz_tipi == 'AST':
-            ev_ort = ev_maclar['AST'].mean() if len(ev_maclar) > 0 else 0
-            dep_ort = dep_maclar['AST'].mean() if len(dep_maclar) > 0 else 0
-        elif self.analiz_tipi == 'REB':
-            ev_ort = ev_maclar['REB'].mean() if len(ev_maclar) > 0 else 0
-            dep_ort = dep_maclar['REB'].mean() if len(dep_maclar) > 0 else 0
-        else:
-            ev_ort = dep_ort = 0
-        
-        return ev_ort, dep_ort, ev_ort - dep_ort
+        ozet = self.metrikler.ozet(self.analiz_tipi)
+        return ozet['ev_ortalama'], ozet['dep_ortalama'], ozet['ev_dep_fark']
     
     def hesapla_takim_tempo_etkisi(self, takim_adi):
         """Takımın tempo etkisini hesaplar"""
@@ -208,18 +189,7 @@ class BarajAnaliz:
     
     def hesapla_standart_sapma(self):
         """Performans tutarlılığını ölçer (standart sapma)"""
-        if self.analiz_tipi == 'SAR':
-            degerler = self.mac_loglar['PTS'] + self.mac_loglar['AST'] + self.mac_loglar['REB']
-        elif self.analiz_tipi == 'PTS':
-            degerler = self.mac_loglar['PTS']
-        elif self.analiz_tipi == 'AST':
-            degerler = self.mac_loglar['AST']
-        elif self.analiz_tipi == 'REB':
-            degerler = self.mac_loglar['REB']
-        else:
-            degerler = pd.Series([0])
-        
-        return degerler.std()
+        return self.metrikler.ozet(self.analiz_tipi)['std']
     
     def hesapla_dakika_faktoru(self):
         """Oyuncunun sahada kalma süresini değerlendirir"""
@@ -235,12 +205,15 @@ class BarajAnaliz:
         else:
             return "Düşük", ortalama_dakika
     
-    def risk_degerlendirmesi(self, final_tahmin, basari_orani, son_5_basari, std_sapma, ev_dep_fark=0):
+    def risk_degerlendirmesi(self, final_tahmin, basari_orani, son_5_basari, std_sapma, ev_dep_fark=0, baraj=None):
         """
         GELİŞMİŞ RİSK DEĞERLENDİRMESİ (Sıkılaştırılmış)
         - Final tahmin + tutarlılık + son form + ev/deplasman faktörü
+        - baraj: Değerlendirilecek baraj (None = self.baraj_limit)
         """
-        fark = final_tahmin - self.baraj_limit
+        if baraj is None:
+            baraj = self.baraj_limit
+        fark = final_tahmin - baraj
         
         # 1. TUTARLILIK FAKTÖRÜ (Std Sapma)
         tutarlilik_katsayi = 1.0
@@ -270,7 +243,7 @@ class BarajAnaliz:
             fark -= basari_cezasi
         
         # 5. FINAL GÜVEN SKORU
-        guven_skoru = int((fark / self.baraj_limit * 100) * tutarlilik_katsayi * form_katsayi)
+        guven_skoru = int((fark / baraj * 100) * tutarlilik_katsayi * form_katsayi)
         guven_skoru = max(0, min(100, guven_skoru))
         
         # 6. RİSK KATEGORİSİ (SIKIŞTIRILMIŞ)
@@ -307,34 +280,105 @@ class BarajAnaliz:
         guvenli_limit = ortalama - (std_sapma * 0.5)
         return max(0, guvenli_limit)
     
+    def merdiven_hesapla(self, barajlar, final_tahmin, std_sapma, ev_dep_fark=0):
+        """
+        Birden fazla baraj için başarı oranları ve risk (veri_cek sonrası)
+        Oranlar sıralı maç değerlerinde tek ikili arama ile bulunur
+        """
+        barajlar = np.asarray(barajlar, dtype=np.float64)
+        basari_oranlari, basarililar, toplam = self.metrikler.basari(self.analiz_tipi, barajlar)
+        son_5_oranlari, son_5_basarililar, son_5_toplam = self.metrikler.son_5_basari(self.analiz_tipi, barajlar)
+        
+        merdiven = []
+        for i, baraj in enumerate(barajlar.tolist()):
+            risk, renk, guven_skoru = self.risk_degerlendirmesi(
+                final_tahmin,
+                basari_oranlari[i],
+                son_5_oranlari[i],
+                std_sapma,
+                ev_dep_fark,
+                baraj=baraj
+            )
+            merdiven.append({
+                'baraj': baraj,
+                'basari_orani': float(basari_oranlari[i]),
+                'basarili_mac': int(basarililar[i]),
+                'toplam_mac': toplam,
+                'son_5_basari_orani': float(son_5_oranlari[i]),
+                'son_5_basarili': int(son_5_basarililar[i]),
+                'son_5_toplam': son_5_toplam,
+                'fark': final_tahmin - baraj,
+                'risk': risk,
+                'renk': renk,
+                'guven_skoru': guven_skoru
+            })
+        return merdiven
+    
+    def merdiven_analiz(self, barajlar):
+        """
+        Merdiven modu: aynı oyuncu için birden fazla baraj (örn. 35.5, 38.5, 40.5)
+        Veri bir kez çekilir ve ilk baraj için tam analiz yapılır; diğer barajlar
+        aynı tahmin üzerinden sadece oran + risk olarak değerlendirilir
+        
+        Returns:
+            analiz_yap sonucu + 'merdiven' listesi (baraj sırası korunur), veri yoksa None
+        """
+        if not barajlar:
+            return None
+        
+        self.baraj_limit = barajlar[0]
+        sonuc = self.analiz_yap()
+        if not sonuc:
+            return None
+        
+        # final_tahmin garbage time düzeltmesi uygulanmış hali (analiz_yap ile aynı risk girdisi)
+        sonuc['merdiven'] = self.merdiven_hesapla(
+            barajlar,
+            sonuc['final_tahmin'],
+            sonuc['std_sapma'],
+            sonuc['ev_dep_fark']
+        )
+        return sonuc
+    
+    @izli('baraj_analiz')
     def analiz_yap(self):
         """Tam analiz yapar ve sonuç üretir"""
         # Veri çek
-        if not self.veri_cek():
+        with span('baraj.veri_cek'):
+            veri_tamam = self.veri_cek()
+        if not veri_tamam:
             return None
         
+        return self.hesapla()
+    
+    def veri_kopyala(self, kaynak):
+        """
+        Başka bir analizin çektiği verileri paylaşır (aynı oyuncu için tekrar çekmeden)
+        Maç logu aynı nesne olduğundan metrikleri de bir kez hesaplanır
+        """
+        self.oyuncu_data = kaynak.oyuncu_data
+        self.oyuncu_detay = kaynak.oyuncu_detay
+        self.sezon_stats = kaynak.sezon_stats
+        self.gercek_sezon = kaynak.gercek_sezon
+        self.mac_loglar = kaynak.mac_loglar
+        self.takim_tempo = kaynak.takim_tempo
+    
+    def hesapla(self):
+        """Çekilmiş veriler üzerinden analiz sonucunu üretir (veri_cek / veri_kopyala sonrası)"""
         # Temel hesaplamalar
-        sezon_ortalama = self.hesapla_ortalama()
-        basari_orani, basarili, toplam = self.hesapla_mac_basari_orani()
-        son_5_basari_orani, son_5_basarili, son_5_toplam = self.hesapla_son_5_mac_basari_orani()
-        son_5_ortalama = self.hesapla_son_5_mac_ortalama()
-        std_sapma = self.hesapla_standart_sapma()
-        dakika_seviye, ortalama_dakika = self.hesapla_dakika_faktoru()
-        
-        # YENİ: Ev/Deplasman analizi
-        ev_ort, dep_ort, ev_dep_fark = self.hesapla_ev_deplasman_fark()
-        
-        # YENİ: Takım tempo etkisi
-        takim_adi = None
-        if self.oyuncu_detay is not None and not self.oyuncu_detay.empty:
-            if 'TEAM_NAME' in self.oyuncu_detay.columns:
-                takim_adi = str(self.oyuncu_detay['TEAM_NAME'].values[0])
-            elif 'TEAM_ABBREVIATION' in self.oyuncu_detay.columns:
-                takim_adi = str(self.oyuncu_detay['TEAM_ABBREVIATION'].values[0])
+        with span('baraj.hesaplama'):
+            sezon_ortalama = self.hesapla_ortalama()
+            basari_orani, basarili, toplam = self.hesapla_mac_basari_orani()
+            son_5_basari_orani, son_5_basarili, son_5_toplam = self.hesapla_son_5_mac_basari_orani()
+            son_5_ortalama = self.hesapla_son_5_mac_ortalama()
+            std_sapma = self.hesapla_standart_sapma()
+            dakika_seviye, ortalama_dakika = self.hesapla_dakika_faktoru()
+            
+            # YENİ: Ev/Deplasman analizi
+            ev_ort, dep_ort, ev_dep_fark = self.hesapla_ev_deplasman_fark()
         
-        takim_pace, takim_off_rating = None, None
-        if takim_adi and takim_adi != 'nan':
-            takim_pace, takim_off_rating = self.hesapla_takim_tempo_etkisi(takim_adi)
+        # YENİ: Takım tempo etkisi (veri_cek sırasında paralel çekildi)
+        takim_pace, takim_off_rating = self.takim_tempo
         
         # YENİ: Ev/Deplasman Bazlı Tahmin
         if self.ev_deplasman == 'Ev':
@@ -492,39 +536,6 @@ class BarajAnaliz:
         ortalama_dakika = stats['MIN'] / mac_sayisi if mac_sayisi > 0 else 0
         
         # Takım bilgisi - Takım kısa adlarını tam adlara çevir
-        takim_map = {
-            'PHI': 'Philadelphia 76ers', '76ers': 'Philadelphia 76ers',
-            'LAL': 'Los Angeles Lakers', 'Lakers': 'Los Angeles Lakers',
-            'BOS': 'Boston Celtics', 'Celtics': 'Boston Celtics',
-            'GSW': 'Golden State Warriors', 'Warriors': 'Golden State Warriors',
-            'MIL': 'Milwaukee Bucks', 'Bucks': 'Milwaukee Bucks',
-            'DEN': 'Denver Nuggets', 'Nuggets': 'Denver Nuggets',
-            'PHX': 'Phoenix Suns', 'Suns': 'Phoenix Suns',
-            'MIA': 'Miami Heat', 'Heat': 'Miami Heat',
-            'DAL': 'Dallas Mavericks', 'Mavericks': 'Dallas Mavericks',
-            'MEM': 'Memphis Grizzlies', 'Grizzlies': 'Memphis Grizzlies',
-            'CLE': 'Cleveland Cavaliers', 'Cavaliers': 'Cleveland Cavaliers',
-            'SAC': 'Sacramento Kings', 'Kings': 'Sacramento Kings',
-            'NYK': 'New York Knicks', 'Knicks': 'New York Knicks',
-            'BKN': 'Brooklyn Nets', 'Nets': 'Brooklyn Nets',
-            'ATL': 'Atlanta Hawks', 'Hawks': 'Atlanta Hawks',
-            'CHI': 'Chicago Bulls', 'Bulls': 'Chicago Bulls',
-            'TOR': 'Toronto Raptors', 'Raptors': 'Toronto Raptors',
-            'MIN': 'Minnesota Timberwolves', 'Timberwolves': 'Minnesota Timberwolves',
-            'NOP': 'New Orleans Pelicans', 'Pelicans': 'New Orleans Pelicans',
-            'LAC': 'LA Clippers', 'Clippers': 'LA Clippers',
-            'OKC': 'Oklahoma City Thunder', 'Thunder': 'Oklahoma City Thunder',
-            'POR': 'Portland Trail Blazers', 'Trail Blazers': 'Portland Trail Blazers',
-            'UTA': 'Utah Jazz', 'Jazz': 'Utah Jazz',
-            'SAS': 'San Antonio Spurs', 'Spurs': 'San Antonio Spurs',
-            'ORL': 'Orlando Magic', 'Magic': 'Orlando Magic',
-            'IND': 'Indiana Pacers', 'Pacers': 'Indiana Pacers',
-            'WAS': 'Washington Wizards', 'Wizards': 'Washington Wizards',
-            'DET': 'Detroit Pistons', 'Pistons': 'Detroit Pistons',
-            'CHA': 'Charlotte Hornets', 'Hornets': 'Charlotte Hornets',
-            'HOU': 'Houston Rockets', 'Rockets': 'Houston Rockets'
-        }
-        
         takim = "N/A"
         pozisyon = "N/A"
         if self.oyuncu_detay is not None and not self.oyuncu_detay.empty:
@@ -535,9 +546,9 @@ class BarajAnaliz:
             elif 'TEAM_ABBREVIATION' in self.oyuncu_detay.columns:
                 takim_raw = str(self.oyuncu_detay['TEAM_ABBREVIATION'].values[0])
             
-            # Takım adını map'ten al, yoksa olduğu gibi kullan
+            # Takım adını ortak takım indeksinden al, yoksa olduğu gibi kullan
             if takim_raw and takim_raw != 'nan':
-                takim = takim_map.get(takim_raw, takim_raw)
+                takim = takim_indeksi().tam_isim(takim_raw) or takim_raw
             
             pozisyon = self.oyuncu_detay['POSITION'].values[0] if 'POSITION' in self.oyuncu_detay.columns else "N/A"
         
@@ -573,6 +584,63 @@ class BarajAnaliz:
         }
 
 
+
+def toplu_analiz(istekler, paralellik=TOPLU_PARALELLIK):
+    """
+    Birden fazla prop'u tek seferde analiz eder (gecelik bülten)
+    
+    Satırlar oyuncuya göre gruplanır: her oyuncunun verisi bir kez çekilir,
+    o oyuncunun tüm satırları aynı veriden hesaplanır. Takım tempo / lig
+    tabloları gibi ortak çağrılar cache + single-flight ile tekilleşir.
+    
+    Args:
+        istekler: [{'oyuncu_isim', 'baraj', 'analiz_tipi', 'ev_deplasman', 'mac_orani'}]
+        paralellik: Aynı anda verisi çekilen en fazla oyuncu
+    
+    Yields:
+        (indeks, sonuc, mesaj) - oyuncu verisi hazır oldukça, tamamlanma sırasıyla;
+        sonuc None ise mesaj hatayı açıklar
+    """
+    gruplar = {}  # oyuncu_id -> [indeks]
+    for i, istek in enumerate(istekler):
+        oyuncular = oyuncu_bul(istek['oyuncu_isim'])
+        if not oyuncular:
+            yield i, None, 'Oyuncu bulunamadı!'
+            continue
+        gruplar.setdefault(oyuncular[0]['id'], []).append(i)
+    
+    def analiz(istek):
+        return BarajAnaliz(
+            istek['oyuncu_isim'],
+            istek['baraj'],
+            istek.get('analiz_tipi', 'SAR'),
+            istek.get('ev_deplasman', 'Bilinmiyor'),
+            istek.get('mac_orani')
+        )
+    
+    def oyuncu_isle(indeksler):
+        try:
+            kaynak = analiz(istekler[indeksler[0]])
+            with span('baraj.veri_cek'):
+                veri_tamam = kaynak.veri_cek()
+            if not veri_tamam:
+                return [(i, None, 'Veri çekilemedi!') for i in indeksler]
+            
+            sonuclar = []
+            for i in indeksler:
+                satir = analiz(istekler[i])
+                satir.veri_kopyala(kaynak)
+                sonuclar.append((i, satir.hesapla(), None))
+            return sonuclar
+        except Exception as e:
+            print(f"❌ Toplu analiz hatası: {e}")
+            return [(i, None, f'Hata: {str(e)}') for i in indeksler]
+    
+    with ThreadPoolExecutor(max_workers=max(1, paralellik)) as executor:
+        futures = [executor.submit(baglamli(oyuncu_isle), indeksler) for indeksler in gruplar.values()]
+        for future in as_completed(futures):
+            yield from future.result()
+
 # Test için
 if __name__ == "__main__":
     print("🚀 NBA BARAJ ANALİZ SİSTEMİ TEST\n")
@@ -0,0 +1,341 @@
+"""
+Uçtan Uca Gecikme Benchmark'ı
+/api/oyuncu-analiz ve /api/mac-analiz endpoint'lerini sahte veri katmanına karşı ölçer
+
+Veri katmanı:
+    sahte  -> Süreç içinde sahte_nba_sunucu başlatılır (ayarlanabilir upstream gecikmesi)
+    oynat  -> kayit_oynatma fixture arşivi (NBA_FIXTURE_DIZINI), ağ yok
+
+İş yükleri (her biri her endpoint için ayrı bir aşama):
+    soguk    -> Her istekten önce tüm cache'ler temizlenir
+    sicak    -> Havuz bir kez ısıtılır, sonra sadece cache'ten cevap verilir
+    karisik  -> Boş cache ile başlar, istekler popülerliğe göre (Zipf) seçilir, paralel çalışır
+
+Kullanım:
+    python benchmark.py                                  # Ölç, benchmark_sonuc.json'a yaz
+    python benchmark.py --cikti baseline.json            # Baseline kaydet
+    python benchmark.py --karsilastir baseline.json      # Regresyon varsa çıkış kodu 1
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import numpy as np
+
+IS_YUKLERI = ('soguk', 'sicak', 'karisik')
+ENDPOINTLER = ('oyuncu-analiz', 'mac-analiz')
+ANALIZ_TIPLERI = ('SAR', 'PTS', 'AST', 'REB')
+BARAJLAR = {'SAR': 30, 'PTS': 20, 'AST': 6, 'REB': 6}
+KARSILASTIRMA_METRIKLERI = ('p50_ms', 'p95_ms', 'p99_ms')
+
+
+def ozet_cikar(sureler, hatalar, duvar_suresi):
+    """Gecikme listesinden (saniye) yüzdelik ve throughput özeti"""
+    ms = np.asarray(sureler, dtype=float) * 1000
+    if len(ms) == 0:
+        return {'istek': 0, 'hata': hatalar}
+    return {
+        'istek': int(len(ms)),
+        'hata': hatalar,
+        'p50_ms': round(float(np.percentile(ms, 50)), 2),
+        'p95_ms': round(float(np.percentile(ms, 95)), 2),
+        'p99_ms': round(float(np.percentile(ms, 99)), 2),
+        'ortalama_ms': round(float(ms.mean()), 2),
+        'min_ms': round(float(ms.min()), 2),
+        'max_ms': round(float(ms.max()), 2),
+        'throughput_rps': round(len(ms) / duvar_suresi, 2) if duvar_suresi > 0 else None,
+        'duvar_suresi_s': round(duvar_suresi, 3),
+    }
+
+
+class Benchmark:
+    """Flask test client ile endpoint'leri süren benchmark"""
+    
+    def __init__(self, istek_sayisi=30, paralel=4, oyuncu_sayisi=20, mac_sayisi=15, tohum=0,
+                 sunucu=None):
+        """
+        Args:
+            istek_sayisi: Aşama başına ölçülen istek
+            paralel: karisik iş yükünde eşzamanlı istek sayısı
+            oyuncu_sayisi: Oyuncu havuzu büyüklüğü
+            mac_sayisi: Maç havuzu büyüklüğü
+            tohum: İstek sırası tohumu (aynı tohum = aynı iş yükü)
+            sunucu: SahteNBASunucu (upstream istek sayısını raporlamak için, opsiyonel)
+        """
+        # app import'u ortam değişkenleri ayarlandıktan sonra yapılmalı
+        import app as app_modulu
+        from cache_manager import cache
+        from lig_tablolari import lig_tablolari
+        
+        self.app = app_modulu.app
+        self.cache = cache
+        self.lig_tablolari = lig_tablolari
+        self.istek_sayisi = istek_sayisi
+        self.paralel = max(1, paralel)
+        self.tohum = tohum
+        self.sunucu = sunucu
+        self.oyuncu_havuzu = self._oyuncu_havuzu(oyuncu_sayisi)
+        self.mac_havuzu = self._mac_havuzu(mac_sayisi)
+        self._yerel = threading.local()
+    
+    def _oyuncu_havuzu(self, sayi):
+        """oyuncular.json'dan indekste bulunan aktif oyuncular"""
+        from oyuncu_indeksi import oyuncu_indeksi, BUL_ESIK
+        try:
+            with open('oyuncular.json', 'r', encoding='utf-8') as f:
+                isimler = json.load(f).get('oyuncular', [])
+        except Exception:
+            isimler = []
+        
+        havuz = []
+        for isim in isimler:
+            oyuncu = oyuncu_indeksi().ara(isim, limit=1, bulanik_esik=BUL_ESIK)
+            if oyuncu and oyuncu[0].get('is_active'):
+                havuz.append(oyuncu[0]['full_name'])
+            if len(havuz) >= sayi:
+                break
+        return havuz
+    
+    def _mac_havuzu(self, sayi):
+        """Deterministik (ev, deplasman) takım çiftleri"""
+        from nba_api.stats.static import teams
+        takimlar = sorted(t['nickname'] for t in teams.get_teams())
+        rng = random.Random(self.tohum)
+        rng.shuffle(takimlar)
+        n = len(takimlar)
+        # Her kaydırma n/2 ayrık maç üretir (bir gecelik fikstür gibi)
+        ciftler = [(takimlar[i], takimlar[(i + kaydirma) % n])
+                   for kaydirma in range(1, n, 2) for i in range(0, n, 2)]
+        return ciftler[:sayi]
+    
+    def _istekler(self, endpoint):
+        """Endpoint havuzundaki (url, gövde) istekleri"""
+        if endpoint == 'oyuncu-analiz':
+            istekler = []
+            for i, isim in enumerate(self.oyuncu_havuzu):
+                tip = ANALIZ_TIPLERI[i % len(ANALIZ_TIPLERI)]
+                istekler.append(('/api/oyuncu-analiz', {
+                    'oyuncu_isim': isim, 'baraj': BARAJLAR[tip], 'analiz_tipi': tip
+                }))
+            return istekler
+        return [('/api/mac-analiz', {'ev_takim': ev, 'dep_takim': dep}) for ev, dep in self.mac_havuzu]
+    
+    def _client(self):
+        """Thread başına admin oturumlu test client"""
+        client = getattr(self._yerel, 'client', None)
+        if client is None:
+            client = self.app.test_client()
+            with client.session_transaction() as oturum:
+                oturum['username'] = 'admin'
+            self._yerel.client = client
+        return client
+    
+    def _istek(self, url, govde):
+        """(süre, başarılı mı)"""
+        baslangic = time.perf_counter()
+        cevap = self._client().post(url, json=govde)
+        sure = time.perf_counter() - baslangic
+        basarili = cevap.status_code == 200 and (cevap.get_json() or {}).get('success') is True
+        return sure, basarili
+    
+    def cache_sifirla(self):
+        self.cache.clear()
+        self.lig_tablolari.temizle()
+    
+    def _upstream_sayisi(self):
+        return self.sunucu.sayaclar['toplam'] if self.sunucu else None
+    
+    def asama_calistir(self, is_yuku, endpoint):
+        """Bir (iş yükü, endpoint) aşamasını çalıştırıp özetini döndürür"""
+        havuz = self._istekler(endpoint)
+        rng = random.Random(f"{self.tohum}:{is_yuku}:{endpoint}")
+        sureler = []
+        hatalar = 0
+        
+        if is_yuku == 'sicak':
+            self.cache_sifirla()
+            for url, govde in havuz:
+                self._istek(url, govde)
+        
+        upstream_bas = self._upstream_sayisi()
+        duvar_bas = time.perf_counter()
+        
+        if is_yuku == 'karisik':
+            self.cache_sifirla()
+            # Zipf benzeri popülerlik: ilk oyuncular/maçlar çok daha sık istenir
+            agirliklar = [1 / (i + 1) ** 1.1 for i in range(len(havuz))]
+            secilen = rng.choices(havuz, weights=agirliklar, k=self.istek_sayisi)
+            with ThreadPoolExecutor(max_workers=self.paralel) as executor:
+                for sure, basarili in executor.map(lambda i: self._istek(*i), secilen):
+                    sureler.append(sure)
+                    hatalar += not basarili
+        else:
+            for i in range(self.istek_sayisi):
+                url, govde = havuz[i % len(havuz)]
+                if is_yuku == 'soguk':
+                    self.cache_sifirla()
+                sure, basarili = self._istek(url, govde)
+                sureler.append(sure)
+                hatalar += not basarili
+        
+        ozet = ozet_cikar(sureler, hatalar, time.perf_counter() - duvar_bas)
+        if upstream_bas is not None:
+            ozet['upstream_istek'] = self._upstream_sayisi() - upstream_bas
+        return ozet
+    
+    def calistir(self, is_yukleri=IS_YUKLERI, endpointler=ENDPOINTLER, sessiz=True):
+        """Tüm aşamaları çalıştırır: {'<iş yükü>/<endpoint>': özet}"""
+        sonuclar = {}
+        for is_yuku in is_yukleri:
+            for endpoint in endpointler:
+                asama = f"{is_yuku}/{endpoint}"
+                print(f"⏱️ {asama} çalışıyor...", flush=True)
+                # Analiz kodu çok print ediyor, ölçümü bozmaması için yutulur
+                with contextlib.redirect_stdout(io.StringIO()) if sessiz else contextlib.nullcontext():
+                    sonuclar[asama] = self.asama_calistir(is_yuku, endpoint)
+                print(f"   {ozet_satiri(sonuclar[asama])}")
+        return sonuclar
+
+
+def ozet_satiri(ozet):
+    if not ozet.get('istek'):
+        return "istek yok"
+    satir = (f"p50 {ozet['p50_ms']:.1f} ms | p95 {ozet['p95_ms']:.1f} ms | p99 {ozet['p99_ms']:.1f} ms | "
+             f"{ozet['throughput_rps']} istek/s | hata {ozet['hata']}")
+    if 'upstream_istek' in ozet:
+        satir += f" | upstream {ozet['upstream_istek']}"
+    return satir
+
+
+def karsilastir(yeni, eski, tolerans):
+    """
+    Baseline ile karşılaştırır
+    
+    Returns:
+        (satırlar, regresyon var mı)
+    """
+    satirlar = []
+    regresyon = False
+    for asama, ozet in yeni.items():
+        onceki = eski.get(asama)
+        if not onceki:
+            satirlar.append(f"  {asama}: baseline'da yok")
+            continue
+        parcalar = []
+        for metrik in KARSILASTIRMA_METRIKLERI:
+            if not onceki.get(metrik) or metrik not in ozet:
+                continue
+            oran = ozet[metrik] / onceki[metrik]
+            isaret = '🔴' if oran > 1 + tolerans else '🟢' if oran < 1 - tolerans else '⚪'
+            regresyon |= oran > 1 + tolerans
+            parcalar.append(f"{metrik} {onceki[metrik]:.1f}->{ozet[metrik]:.1f} ({oran - 1:+.0%}) {isaret}")
+        satirlar.append(f"  {asama}: " + ' | '.join(parcalar))
+    return satirlar, regresyon
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Analiz endpoint\'leri için uçtan uca gecikme benchmark\'ı')
+    parser.add_argument('--kaynak', choices=('sahte', 'oynat'), default='sahte',
+                        help='Veri katmanı: süreç içi sahte sunucu ya da fixture oynatma')
+    parser.add_argument('--fixture-dizini', default=None, help='oynat kaynağı için fixture arşivi')
+    parser.add_argument('--is-yukleri', default=','.join(IS_YUKLERI))
+    parser.add_argument('--endpointler', default=','.join(ENDPOINTLER))
+    parser.add_argument('--istek', type=int, default=30, help='Aşama başına istek sayısı')
+    parser.add_argument('--paralel', type=int, default=4, help='karisik iş yükü eşzamanlılığı')
+    parser.add_argument('--oyuncu-sayisi', type=int, default=20)
+    parser.add_argument('--mac-sayisi', type=int, default=15)
+    parser.add_argument('--gecikme-ms', type=float, default=50, help='Sahte upstream ortalama gecikmesi')
+    parser.add_argument('--sapma-ms', type=float, default=10, help='Sahte upstream gecikme sapması')
+    parser.add_argument('--rate-limit-aralik', type=float, default=0.0,
+                        help='NBA_RATE_LIMIT_ARALIK (0 = kendi kodumuzu ölç, rate limiter beklemesi yok)')
+    parser.add_argument('--tohum', type=int, default=0)
+    parser.add_argument('--cikti', default='benchmark_sonuc.json', help='Sonuç JSON dosyası')
+    parser.add_argument('--karsilastir', default=None, help='Baseline JSON (regresyonda çıkış kodu 1)')
+    parser.add_argument('--tolerans', type=float, default=0.2, help='İzin verilen yavaşlama oranı')
+    parser.add_argument('--verbose', action='store_true', help='Analiz çıktılarını yutma')
+    args = parser.parse_args(argv)
+    
+    # Ortam app/api_wrapper import edilmeden önce ayarlanmalı
+    cache_dizini = tempfile.mkdtemp(prefix='nba_benchmark_cache_')
+    os.environ['CACHE_DIZINI'] = cache_dizini
+    os.environ['NBA_RATE_LIMIT_DOSYASI'] = os.path.join(cache_dizini, '.rate_limiter')
+    os.environ['NBA_RATE_LIMIT_ARALIK'] = str(args.rate_limit_aralik)
+    os.environ['NBA_ON_ISITMA'] = '0'
+    
+    sunucu = None
+    if args.kaynak == 'oynat':
+        os.environ['NBA_VERI_MODU'] = 'oynat'
+        if args.fixture_dizini:
+            os.environ['NBA_FIXTURE_DIZINI'] = args.fixture_dizini
+    else:
+        from sahte_nba_sunucu import SahteNBASunucu
+        import nba_ayarlar
+        sunucu = SahteNBASunucu(port=0, gecikme_ms=args.gecikme_ms, sapma_ms=args.sapma_ms,
+                                tohum=args.tohum).baslat()
+        nba_ayarlar.uygula(sunucu.url)
+        # Sentetik sezonlar önceden üretilir: ilk isteğin ölçümüne sunucu hazırlığı karışmasın
+        sunucu.veri.cevap('playercareerstats', {'playerid': '0'})
+        sunucu.veri.lig('2024-25')
+    
+    try:
+        benchmark = Benchmark(
+            istek_sayisi=args.istek, paralel=args.paralel, oyuncu_sayisi=args.oyuncu_sayisi,
+            mac_sayisi=args.mac_sayisi, tohum=args.tohum, sunucu=sunucu
+        )
+        print(f"🏁 Benchmark: {len(benchmark.oyuncu_havuzu)} oyuncu, {len(benchmark.mac_havuzu)} maç, "
+              f"aşama başına {args.istek} istek ({args.kaynak})")
+        sonuclar = benchmark.calistir(
+            [s for s in args.is_yukleri.split(',') if s],
+            [s for s in args.endpointler.split(',') if s],
+            sessiz=not args.verbose
+        )
+    finally:
+        if sunucu:
+            sunucu.durdur()
+    
+    rapor = {
+        'zaman': datetime.now().isoformat(),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'ayarlar': {k: v for k, v in vars(args).items() if k not in ('cikti', 'karsilastir')},
+        'sonuclar': sonuclar,
+    }
+    with open(args.cikti, 'w', encoding='utf-8') as f:
+        json.dump(rapor, f, ensure_ascii=False, indent=2)
+    print(f"💾 Sonuçlar kaydedildi: {args.cikti}")
+    
+    if args.karsilastir:
+        with open(args.karsilastir, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        satirlar, regresyon = karsilastir(sonuclar, baseline.get('sonuclar', {}), args.tolerans)
+        print(f"\n📊 Baseline karşılaştırması ({args.karsilastir}, commit {baseline.get('commit')}):")
+        print('\n'.join(satirlar))
+        if regresyon:
+            print(f"❌ Regresyon: en az bir metrik %{args.tolerans * 100:.0f}'den fazla yavaşladı")
+            return 1
+        print("✅ Regresyon yok")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
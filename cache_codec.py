@@ -0,0 +1,284 @@
+"""
+Cache Codec'leri
+Cache girdileri için takılabilir disk formatları (JSON / kolonsal binary)
+"""
+
+import json
+import struct
+import zlib
+from datetime import datetime
+from itertools import repeat
+
+try:
+    import msgpack
+    MSGPACK_VAR = True
+except ImportError:
+    # msgpack yoksa kompakt JSON ile kodlanır
+    msgpack = None
+    MSGPACK_VAR = False
+
+# Binary dosya başlığı: magic, versiyon, kodlama, sıkıştırma, timestamp, ham boyut
+# (ham boyut = verinin kompakt records JSON'u olarak tahmini boyutu, bkz. KolonsalCodec.encode)
+BASLIK_FORMAT = '>4sBBBdQ'
+BASLIK_BOYUT = struct.calcsize(BASLIK_FORMAT)
+MAGIC = b'NBAC'
+VERSIYON = 1
+
+KODLAMA_JSON = 1
+KODLAMA_MSGPACK = 2
+
+SIKISTIRMA_YOK = 0
+SIKISTIRMA_ZLIB = 1
+
+# Kolonsal tablo işaretleri (records listesi -> kolonlar)
+TABLO_ISARETI = '__tablo__'
+
+
+def anahtar_alani(key):
+    """
+    Cache key'inin namespace'ini döndürür
+    Örn: 'game_log_2544_2024-25' -> 'game_log', 'league_game_log_current' -> 'league_game_log'
+    """
+    parcalar = []
+    for parca in key.split('_'):
+        if not parca.isalpha() or parca == 'current':
+            break
+        parcalar.append(parca)
+    return '_'.join(parcalar) or key
+
+
+def _ic_ice(degerler):
+    """Kolonda dict / list değer var mı (yoksa kolon olduğu gibi yazılır / okunur)"""
+    return any(isinstance(v, (dict, list)) for v in degerler)
+
+
+def _anahtar_tekrari(anahtarlar, satir_sayisi):
+    """
+    Tablonun records JSON'unda kolonsal forma göre fazladan yazılan baytlar:
+    (her satırdaki '"key":' ve '{}' baytları, hücre ayırıcı ',' sayısı)
+    """
+    anahtar_baytlari = sum(len(str(k).encode('utf-8')) + 3 for k in anahtarlar) + 2
+    return satir_sayisi * anahtar_baytlari, satir_sayisi * len(anahtarlar)
+
+
+def kolonlara_cevir(obj, tekrar=None):
+    """
+    Aynı key'lere sahip dict listelerini kolonsal forma çevirir (recursive)
+    
+    Args:
+        obj: Çevrilecek veri
+        tekrar: Verilirse her tablo için _anahtar_tekrari sonucu bu listeye eklenir
+    """
+    if isinstance(obj, list):
+        if obj and all(isinstance(x, dict) for x in obj):
+            anahtarlar = obj[0].keys()
+            if all(x.keys() == anahtarlar for x in obj):
+                degerler = []
+                ic_ice = []
+                for i, k in enumerate(anahtarlar):
+                    kolon = [x[k] for x in obj]
+                    # Skaler kolonlar hücre hücre dolaşılmaz
+                    if _ic_ice(kolon):
+                        ic_ice.append(i)
+                        kolon = [kolonlara_cevir(v, tekrar) for v in kolon]
+                    degerler.append(kolon)
+                if tekrar is not None:
+                    tekrar.append(_anahtar_tekrari(anahtarlar, len(obj)))
+                return {TABLO_ISARETI: list(anahtarlar), 'degerler': degerler, 'ic_ice': ic_ice}
+        return [kolonlara_cevir(x, tekrar) for x in obj]
+    if isinstance(obj, dict):
+        return {k: kolonlara_cevir(v, tekrar) for k, v in obj.items()}
+    return obj
+
+
+def kayitlara_cevir(obj):
+    """kolonlara_cevir'in tersi: kolonsal formu records listesine geri çevirir"""
+    if isinstance(obj, dict):
+        if TABLO_ISARETI in obj:
+            kolonlar = obj[TABLO_ISARETI]
+            degerler = obj['degerler']
+            # İç içe kolonlar yazarken işaretlenir (eski dosyalarda işaret yok: kolonlar taranır)
+            ic_ice = obj.get('ic_ice')
+            if ic_ice is None:
+                ic_ice = [i for i, kolon in enumerate(degerler) if _ic_ice(kolon)]
+            if ic_ice:
+                degerler = list(degerler)
+                for i in ic_ice:
+                    degerler[i] = [kayitlara_cevir(v) for v in degerler[i]]
+            return list(map(dict, map(zip, repeat(kolonlar), zip(*degerler))))
+        return {k: kayitlara_cevir(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [kayitlara_cevir(x) for x in obj]
+    return obj
+
+
+class JsonCodec:
+    """Eski format: okunabilir, girintili JSON (.json)"""
+    
+    uzanti = '.json'
+    
+    def encode(self, data, cached_time):
+        """(içerik bytes, ham boyut) döndürür"""
+        cache_data = {
+            'timestamp': cached_time.isoformat(),
+            'data': data
+        }
+        icerik = json.dumps(cache_data, ensure_ascii=False, indent=2).encode('utf-8')
+        return icerik, len(icerik)
+    
+    def decode(self, icerik):
+        """(data, cached_time, ham boyut) döndürür"""
+        cache_data = json.loads(icerik.decode('utf-8'))
+        return cache_data['data'], datetime.fromisoformat(cache_data['timestamp']), len(icerik)
+    
+    def baslik_oku(self, icerik):
+        """(cached_time, ham boyut) döndürür - JSON'da tüm dosya parse edilir"""
+        _, cached_time, ham_boyut = self.decode(icerik)
+        return cached_time, ham_boyut
+
+
+class KolonsalCodec:
+    """
+    Kompakt binary format (.nbac)
+    - Records listeleri kolonlara çevrilir (tekrarlanan key isimleri bir kez yazılır)
+    - msgpack ile kodlanır (requirements.txt); kurulu değilse kompakt JSON'a düşer
+    - Opsiyonel zlib sıkıştırma
+    - Sabit boyutlu başlık: timestamp ve ham boyut (tahmini JSON eşdeğeri) dosyayı açmadan okunur
+    """
+    
+    uzanti = '.nbac'
+    
+    def __init__(self, sikistirma='zlib', seviye=6, kolonsal=True):
+        """
+        Args:
+            sikistirma: 'zlib' veya None
+            seviye: zlib sıkıştırma seviyesi (1-9)
+            kolonsal: Records listelerini kolonlara çevir
+        """
+        self.sikistirma = SIKISTIRMA_ZLIB if sikistirma == 'zlib' else SIKISTIRMA_YOK
+        self.seviye = seviye
+        self.kolonsal = kolonsal
+    
+    def encode(self, data, cached_time):
+        """
+        (içerik bytes, ham boyut) döndürür
+        
+        Ham boyut, verinin kompakt records JSON'u olarak tahmini boyutudur: sıkıştırılmamış
+        gövde + tablolarda kolonsal formun kaldırdığı key tekrarı (msgpack gövdede ayrıca
+        JSON'daki ',' ayırıcılar). JSON ayrıca üretilmez; değerlerin msgpack / JSON kodlama
+        farkı kadar (birkaç %) sapar
+        """
+        tekrar = []
+        govde = kolonlara_cevir(data, tekrar) if self.kolonsal else data
+        if MSGPACK_VAR:
+            kodlama = KODLAMA_MSGPACK
+            payload = msgpack.packb(govde, use_bin_type=True)
+            ayiricilar = sum(hucre for _, hucre in tekrar)
+        else:
+            kodlama = KODLAMA_JSON
+            payload = json.dumps(govde, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            ayiricilar = 0  # kolon dizilerinde zaten yazılı
+        ham_boyut = len(payload) + sum(bayt for bayt, _ in tekrar) + ayiricilar
+        
+        if self.sikistirma == SIKISTIRMA_ZLIB:
+            payload = zlib.compress(payload, self.seviye)
+        
+        baslik = struct.pack(
+            BASLIK_FORMAT, MAGIC, VERSIYON, kodlama, self.sikistirma,
+            cached_time.timestamp(), ham_boyut
+        )
+        return baslik + payload, ham_boyut
+    
+    def decode(self, icerik):
+        """(data, cached_time, ham boyut) döndürür"""
+        _, _, kodlama, sikistirma, timestamp, ham_boyut = self._baslik(icerik)
+        payload = icerik[BASLIK_BOYUT:]
+        
+        if sikistirma == SIKISTIRMA_ZLIB:
+            payload = zlib.decompress(payload)
+        
+        if kodlama == KODLAMA_MSGPACK:
+            if not MSGPACK_VAR:
+                raise ValueError("Cache girdisi msgpack ile yazılmış ama msgpack kurulu değil")
+            govde = msgpack.unpackb(payload, raw=False)
+        else:
+            govde = json.loads(payload.decode('utf-8'))
+        
+        return kayitlara_cevir(govde), datetime.fromtimestamp(timestamp), ham_boyut
+    
+    def baslik_oku(self, icerik):
+        """(cached_time, ham boyut) döndürür - sadece başlık okunur"""
+        _, _, _, _, timestamp, ham_boyut = self._baslik(icerik)
+        return datetime.fromtimestamp(timestamp), ham_boyut
+    
+    def _baslik(self, icerik):
+        """Başlığı doğrular ve açar"""
+        if len(icerik) < BASLIK_BOYUT:
+            raise ValueError("Cache dosyası bozuk (başlık eksik)")
+        baslik = struct.unpack(BASLIK_FORMAT, icerik[:BASLIK_BOYUT])
+        if baslik[0] != MAGIC or baslik[1] != VERSIYON:
+            raise ValueError("Bilinmeyen cache dosya formatı")
+        return baslik
+
+
+# Varsayılan namespace -> codec haritası
+# Tablo ağırlıklı büyük girdiler sıkıştırılır, küçük girdiler sadece kolonsal yazılır
+VARSAYILAN_CODEC_HARITASI = {
+    'league_game_log': KolonsalCodec(sikistirma='zlib', seviye=6),
+    'game_log': KolonsalCodec(sikistirma='zlib', seviye=6),
+    'season_stats': KolonsalCodec(sikistirma='zlib', seviye=6),
+    'league_team_stats': KolonsalCodec(sikistirma='zlib', seviye=6),
+    'player_info': KolonsalCodec(sikistirma=None),
+}
+
+
+def codec_tespit(icerik):
+    """Kodlanmış içeriğin hangi codec ile yazıldığını başlıktan tespit eder"""
+    if icerik[:len(MAGIC)] == MAGIC:
+        return KolonsalCodec()
+    return JsonCodec()
+
+
+def codec_bul(codec_adi):
+    """Ortam değişkeni / config için isimden codec oluşturur"""
+    if codec_adi == 'json':
+        return JsonCodec()
+    if codec_adi == 'kolonsal':
+        return KolonsalCodec(sikistirma=None)
+    if codec_adi in ('kolonsal_zlib', 'zlib'):
+        return KolonsalCodec(sikistirma='zlib')
+    raise ValueError(f"Bilinmeyen cache codec: {codec_adi}")
+
+
+if __name__ == '__main__':
+    import random
+    import time
+    
+    # Lig maç logu büyüklüğünde sentetik girdi: ~500 oyuncu x 50 maç x 22 kolon
+    rastgele = random.Random(0)
+    kolon_adlari = ['SEASON_ID', 'Player_ID', 'Game_ID', 'GAME_DATE', 'MATCHUP', 'WL'] + [f"STAT_{i}" for i in range(16)]
+    veri = {
+        'data': {
+            str(oyuncu): [
+                {k: (rastgele.randint(0, 40) if k.startswith('STAT') else f"{k}_{oyuncu}_{mac}") for k in kolon_adlari}
+                for mac in range(50)
+            ]
+            for oyuncu in range(500)
+        },
+        'sezon': '2024-25'
+    }
+    
+    print(f"msgpack: {'var' if MSGPACK_VAR else 'YOK (kompakt JSON kullanılıyor)'}")
+    kompakt = len(json.dumps(veri, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+    print(f"gerçek kompakt JSON: {kompakt/1e6:5.2f} MB (ham boyut tahmininin karşılığı)")
+    for ad in ('json', 'kolonsal', 'kolonsal_zlib'):
+        codec = codec_bul(ad)
+        baslangic = time.perf_counter()
+        icerik, ham_boyut = codec.encode(veri, datetime.now())
+        yazma = time.perf_counter() - baslangic
+        
+        baslangic = time.perf_counter()
+        codec.decode(icerik)
+        okuma = time.perf_counter() - baslangic
+        print(f"{ad:<14} yazma: {yazma*1000:6.0f} ms  okuma: {okuma*1000:6.0f} ms  "
+              f"dosya: {len(icerik)/1e6:5.2f} MB  ham: {ham_boyut/1e6:5.2f} MB")
@@ -5,24 +5,124 @@ Veri önbellekleme ve optimizasyon sistemi
 
 import json
 import os
+import sqlite3
+import threading
 import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from pathlib import Path
+from cache_codec import (
+    JsonCodec, KolonsalCodec, VARSAYILAN_CODEC_HARITASI, BASLIK_BOYUT, anahtar_alani, codec_bul,
+    codec_tespit
+)
+import metrikler
+
+# Dosya uzantısına göre okuma codec'i (eski .json dosyaları okunmaya devam eder)
+OKUMA_CODECLERI = {
+    JsonCodec.uzanti: JsonCodec(),
+    KolonsalCodec.uzanti: KolonsalCodec(),
+}
+
+class BellekCache:
+    """
+    Process içi LRU bellek katmanı
+    Decode edilmiş objeleri tutar, byte bütçesi aşılınca en eski kullanılanı atar
+    """
+    
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        """
+        Args:
+            max_bytes: Bellek bütçesi (byte). 0 = bellek katmanı kapalı
+        """
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (data, cached_time, size)
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key):
+        """(data, cached_time) döndürür, yoksa None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0], entry[1]
+    
+    def set(self, key, data, cached_time, size):
+        """Veriyi belleğe koy, gerekirse LRU ile yer aç"""
+        if size > self.max_bytes:
+            # Bütçeden büyük tek obje belleğe alınmaz
+            self.delete(key)
+            return False
+        
+        with self._lock:
+            eski = self._entries.pop(key, None)
+            if eski is not None:
+                self._total_bytes -= eski[2]
+            
+            self._entries[key] = (data, cached_time, size)
+            self._total_bytes += size
+            
+            while self._total_bytes > self.max_bytes and self._entries:
+                _, (_, _, eski_size) = self._entries.popitem(last=False)
+                self._total_bytes -= eski_size
+                self.evictions += 1
+        return True
+    
+    def delete(self, key):
+        """Tek bir key'i bellekten sil"""
+        with self._lock:
+            eski = self._entries.pop(key, None)
+            if eski is not None:
+                self._total_bytes -= eski[2]
+    
+    def clear(self):
+        """Belleği boşalt"""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+    
+    def get_stats(self):
+        """Bellek katmanı istatistikleri"""
+        with self._lock:
+            toplam = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'size_mb': self._total_bytes / (1024 * 1024),
+                'max_mb': self.max_bytes / (1024 * 1024),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / toplam * 100) if toplam > 0 else 0,
+                'evictions': self.evictions
+            }
+
 
 class CacheManager:
     """API verilerini önbelleğe alan ve yöneten sınıf"""
     
-    def __init__(self, cache_dir='cache', cache_duration_hours=6):
+    def __init__(self, cache_dir='cache', cache_duration_hours=6, bellek_limit_mb=64,
+                 codec_haritasi=None, varsayilan_codec=None):
         """
         Args:
             cache_dir: Cache klasörü
             cache_duration_hours: Cache süresi (saat)
+            bellek_limit_mb: Bellek (LRU) katmanı bütçesi (MB). 0 = kapalı
+            codec_haritasi: Key namespace -> codec (örn: {'game_log': KolonsalCodec()})
+            varsayilan_codec: Haritada olmayan namespace'ler için codec
         """
         self.cache_dir = Path(cache_dir)
         self.cache_duration = timedelta(hours=cache_duration_hours)
+        self.bellek = BellekCache(max_bytes=int(bellek_limit_mb * 1024 * 1024))
+        self.codec_haritasi = VARSAYILAN_CODEC_HARITASI if codec_haritasi is None else codec_haritasi
+        self.varsayilan_codec = varsayilan_codec or KolonsalCodec(sikistirma='zlib')
         
         # Cache klasörünü oluştur
-        self.cache_dir.mkdir(exist_ok=True)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
     
     def _get_cache_path(self, key):
         """Cache dosya yolunu döndürür"""
@@ -30,53 +130,154 @@ class CacheManager:
         safe_key = "".join(c if c.isalnum() else "_" for c in key)
         return self.cache_dir / f"{safe_key}.json"
     
-    def get(self, key):
-        """Cache'den veri al"""
-        cache_path = self._get_cache_path(key)
+    def _codec(self, key):
+        """Key'in namespace'ine göre yazma codec'ini seçer"""
+        return self.codec_haritasi.get(anahtar_alani(key), self.varsayilan_codec)
+    
+    def _dosya_yollari(self, key):
+        """Key için olası tüm dosya yolları (önce yazma formatı, sonra eski formatlar)"""
+        json_yolu = self._get_cache_path(key)
+        yazma_yolu = json_yolu.with_suffix(self._codec(key).uzanti)
+        yollar = [yazma_yolu]
+        for uzanti in OKUMA_CODECLERI:
+            yol = json_yolu.with_suffix(uzanti)
+            if yol != yazma_yolu:
+                yollar.append(yol)
+        return yollar
+    
+    def _cache_dosyalari(self):
+        """Cache klasöründeki tüm (her formattaki) cache dosyaları"""
+        dosyalar = []
+        for uzanti in OKUMA_CODECLERI:
+            dosyalar.extend(self.cache_dir.glob(f"*{uzanti}"))
+        return dosyalar
+    
+    def get(self, key, sure=None):
+        """
+        Cache'den veri al (önce bellek, sonra disk)
         
-        if not cache_path.exists():
+        Args:
+            key: Cache key
+            sure: Geçerlilik süresi (timedelta). None = cache_duration
+        """
+        entry = self.get_entry(key)
+        if entry is None:
             return None
         
-        try:
-            with open(cache_path, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
+        data, cached_time = entry
+        if datetime.now() - cached_time > (sure or self.cache_duration):
+            # Cache süresi dolmuş
+            self.bellek.delete(key)
+            self._diskten_sil(key)
+            return None
+        
+        return data
+    
+    def get_entry(self, key):
+        """
+        Süre kontrolü yapmadan (data, cached_time) döndürür, yoksa None
+        Stale-while-revalidate için: süresi dolmuş veri de silinmeden döner
+        """
+        bellekte = self.bellek.get(key)
+        if bellekte is not None:
+            metrikler.cache_okuma.inc(alan=anahtar_alani(key), katman='bellek')
+            return bellekte
+        
+        diskte = self._diskten_oku(key)
+        if diskte is None:
+            metrikler.cache_okuma.inc(alan=anahtar_alani(key), katman='yok')
+            return None
+        
+        metrikler.cache_okuma.inc(alan=anahtar_alani(key), katman='disk')
+        data, cached_time, size = diskte
+        self.bellek.set(key, data, cached_time, size)
+        return data, cached_time
+    
+    def diskten_entry(self, key):
+        """
+        Bellek katmanını atlayıp diskteki (data, cached_time) döndürür, yoksa None
+        Başka process'in yeni yazdığı veriyi görmek için; bulunan kayıt belleğe de alınır
+        """
+        diskte = self._diskten_oku(key)
+        if diskte is None:
+            metrikler.cache_okuma.inc(alan=anahtar_alani(key), katman='yok')
+            return None
+        
+        metrikler.cache_okuma.inc(alan=anahtar_alani(key), katman='disk')
+        data, cached_time, size = diskte
+        self.bellek.set(key, data, cached_time, size)
+        return data, cached_time
+    
+    def set(self, key, data, sure=None):
+        """
+        Cache'e veri kaydet (bellek + disk)
+        
+        Args:
+            key: Cache key
+            data: JSON serializable veri
+            sure: Geçerlilik süresi (timedelta). None = cache_duration
+        """
+        cached_time = datetime.now()
+        size = self._diske_yaz(key, data, cached_time, sure)
+        if size is None:
+            return False
+        
+        self.bellek.set(key, data, cached_time, size)
+        return True
+    
+    def _diskten_oku(self, key):
+        """Diskten (data, cached_time, size) döndürür, yoksa None. size = ham boyut (tahmini JSON eşdeğeri)"""
+        for cache_path in self._dosya_yollari(key):
+            if not cache_path.exists():
+                continue
             
-            # Cache süresini kontrol et
-            cached_time = datetime.fromisoformat(cache_data['timestamp'])
-            if datetime.now() - cached_time > self.cache_duration:
-                # Cache süresi dolmuş
-                cache_path.unlink()  # Dosyayı sil
-                return None
+            try:
+                icerik = cache_path.read_bytes()
+                return OKUMA_CODECLERI[cache_path.suffix].decode(icerik)
             
-            return cache_data['data']
+            except Exception as e:
+                print(f"⚠️ Cache okuma hatası: {e}")
+                return None
         
-        except Exception as e:
-            print(f"⚠️ Cache okuma hatası: {e}")
-            return None
+        return None
     
-    def set(self, key, data):
-        """Cache'e veri kaydet"""
-        cache_path = self._get_cache_path(key)
+    def _diske_yaz(self, key, data, cached_time, sure=None):
+        """Diske yazar, ham boyutu (tahmini JSON eşdeğeri) döndürür (hata: None)"""
+        yazma_yolu, *eski_yollar = self._dosya_yollari(key)
         
         try:
-            cache_data = {
-                'timestamp': datetime.now().isoformat(),
-                'data': data
-            }
+            icerik, ham_boyut = self._codec(key).encode(data, cached_time)
             
-            with open(cache_path, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, ensure_ascii=False, indent=2)
+            # Atomik yazma: yarım dosya okunmasın
+            gecici_yol = yazma_yolu.with_name(f"{yazma_yolu.name}.{os.getpid()}_{threading.get_ident()}.tmp")
+            with open(gecici_yol, 'wb') as f:
+                f.write(icerik)
+            os.replace(gecici_yol, yazma_yolu)
             
-            return True
+            # Eski formattaki kopyayı kaldır (migration)
+            for eski_yol in eski_yollar:
+                if eski_yol.exists():
+                    eski_yol.unlink()
+            
+            return ham_boyut
         
         except Exception as e:
             print(f"⚠️ Cache yazma hatası: {e}")
-            return False
+            return None
+    
+    def _diskten_sil(self, key):
+        """Diskteki cache dosyasını sil"""
+        for cache_path in self._dosya_yollari(key):
+            try:
+                cache_path.unlink()
+            except FileNotFoundError:
+                pass
     
     def clear(self):
         """Tüm cache'i temizle"""
+        self.bellek.clear()
         try:
-            for cache_file in self.cache_dir.glob("*.json"):
+            for cache_file in self._cache_dosyalari():
                 cache_file.unlink()
             print("✅ Cache temizlendi!")
             return True
@@ -88,12 +289,17 @@ class CacheManager:
         """Eski cache dosyalarını temizle"""
         try:
             count = 0
-            for cache_file in self.cache_dir.glob("*.json"):
+            for cache_file in self._cache_dosyalari():
                 try:
-                    with open(cache_file, 'r', encoding='utf-8') as f:
-                        cache_data = json.load(f)
+                    codec = OKUMA_CODECLERI[cache_file.suffix]
+                    if isinstance(codec, KolonsalCodec):
+                        # Binary formatta sadece başlık okunur
+                        with open(cache_file, 'rb') as f:
+                            icerik = f.read(BASLIK_BOYUT)
+                    else:
+                        icerik = cache_file.read_bytes()
                     
-                    cached_time = datetime.fromisoformat(cache_data['timestamp'])
+                    cached_time, _ = codec.baslik_oku(icerik)
                     if datetime.now() - cached_time > self.cache_duration:
                         cache_file.unlink()
                         count += 1
@@ -111,13 +317,190 @@ class CacheManager:
     def get_stats(self):
         """Cache istatistiklerini döndür"""
         try:
-            cache_files = list(self.cache_dir.glob("*.json"))
-            total_size = sum(f.stat().st_size for f in cache_files)
+            cache_files = self._cache_dosyalari()
+            total_size = 0
+            ham_size = 0
+            formatlar = {}
+            for cache_file in cache_files:
+                boyut = cache_file.stat().st_size
+                total_size += boyut
+                formatlar[cache_file.suffix] = formatlar.get(cache_file.suffix, 0) + 1
+                
+                if cache_file.suffix == KolonsalCodec.uzanti:
+                    # Ham boyut (verinin tahmini kompakt JSON boyutu) başlıkta saklı
+                    try:
+                        with open(cache_file, 'rb') as f:
+                            _, ham = OKUMA_CODECLERI[cache_file.suffix].baslik_oku(f.read(BASLIK_BOYUT))
+                        ham_size += ham
+                    except Exception:
+                        ham_size += boyut
+                else:
+                    ham_size += boyut
             
             return {
                 'total_files': len(cache_files),
                 'total_size_mb': total_size / (1024 * 1024),
-                'cache_dir': str(self.cache_dir)
+                # Tasarruf, verinin JSON olarak kaplayacağı tahmini alana göre
+                'json_size_mb': ham_size / (1024 * 1024),
+                'saved_mb': (ham_size - total_size) / (1024 * 1024),
+                'saved_pct': ((ham_size - total_size) / ham_size * 100) if ham_size > 0 else 0,
+                'formats': formatlar,
+                'cache_dir': str(self.cache_dir),
+                'bellek': self.bellek.get_stats()
+            }
+        except Exception as e:
+            print(f"⚠️ Cache istatistik hatası: {e}")
+            return None
+
+
+class SQLiteCacheManager(CacheManager):
+    """
+    Tek dosyalık SQLite (WAL) cache store
+    - Key primary key: okuma tek index araması
+    - expires_at indexli: süresi dolanları temizleme tek DELETE
+    - İstatistikler tek aggregate sorgu
+    CacheManager ile aynı arayüz (bellek katmanı ve codec'ler dahil)
+    """
+    
+    def __init__(self, db_path='cache/cache.db', cache_duration_hours=6, bellek_limit_mb=64,
+                 codec_haritasi=None, varsayilan_codec=None):
+        """
+        Args:
+            db_path: SQLite veritabanı dosyası
+            cache_duration_hours: Cache süresi (saat)
+            bellek_limit_mb: Bellek (LRU) katmanı bütçesi (MB). 0 = kapalı
+            codec_haritasi: Key namespace -> codec
+            varsayilan_codec: Haritada olmayan namespace'ler için codec
+        """
+        self.db_path = Path(db_path)
+        super().__init__(
+            cache_dir=self.db_path.parent,
+            cache_duration_hours=cache_duration_hours,
+            bellek_limit_mb=bellek_limit_mb,
+            codec_haritasi=codec_haritasi,
+            varsayilan_codec=varsayilan_codec
+        )
+        self._yerel = threading.local()
+        self._tablo_olustur()
+    
+    def _baglanti(self):
+        """Thread başına bir bağlantı (sqlite3 bağlantıları thread'ler arası paylaşılmaz)"""
+        conn = getattr(self._yerel, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._yerel.conn = conn
+        return conn
+    
+    def _tablo_olustur(self):
+        """Cache tablosunu ve expiry index'ini oluştur"""
+        conn = self._baglanti()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                key TEXT PRIMARY KEY,
+                namespace TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                raw_size INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                value BLOB NOT NULL
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_cache_expires_at ON cache_entries (expires_at)')
+    
+    def _diskten_oku(self, key):
+        """Veritabanından (data, cached_time, size) döndürür, yoksa None"""
+        try:
+            row = self._baglanti().execute(
+                'SELECT value FROM cache_entries WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            
+            icerik = bytes(row[0])
+            return codec_tespit(icerik).decode(icerik)
+        
+        except Exception as e:
+            print(f"⚠️ Cache okuma hatası: {e}")
+            return None
+    
+    def _diske_yaz(self, key, data, cached_time, sure=None):
+        """Veritabanına yazar, ham boyutu (tahmini JSON eşdeğeri) döndürür (hata: None)"""
+        try:
+            icerik, ham_boyut = self._codec(key).encode(data, cached_time)
+            created_at = cached_time.timestamp()
+            expires_at = created_at + (sure or self.cache_duration).total_seconds()
+            
+            self._baglanti().execute(
+                '''
+                INSERT OR REPLACE INTO cache_entries
+                (key, namespace, created_at, expires_at, raw_size, size, value)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''',
+                (key, anahtar_alani(key), created_at, expires_at, ham_boyut, len(icerik), sqlite3.Binary(icerik))
+            )
+            return ham_boyut
+        
+        except Exception as e:
+            print(f"⚠️ Cache yazma hatası: {e}")
+            return None
+    
+    def _diskten_sil(self, key):
+        """Tek bir girdiyi veritabanından sil"""
+        try:
+            self._baglanti().execute('DELETE FROM cache_entries WHERE key = ?', (key,))
+        except Exception as e:
+            print(f"⚠️ Cache silme hatası: {e}")
+    
+    def clear(self):
+        """Tüm cache'i temizle"""
+        self.bellek.clear()
+        try:
+            self._baglanti().execute('DELETE FROM cache_entries')
+            print("✅ Cache temizlendi!")
+            return True
+        except Exception as e:
+            print(f"⚠️ Cache temizleme hatası: {e}")
+            return False
+    
+    def clear_old(self):
+        """Süresi dolan girdileri tek sorguda temizle (expires_at index'i kullanılır)"""
+        try:
+            count = self._baglanti().execute(
+                'DELETE FROM cache_entries WHERE expires_at < ?', (time.time(),)
+            ).rowcount
+            
+            if count > 0:
+                print(f"✅ {count} eski cache girdisi temizlendi!")
+            return True
+        
+        except Exception as e:
+            print(f"⚠️ Eski cache temizleme hatası: {e}")
+            return False
+    
+    def get_stats(self):
+        """Cache istatistiklerini tek aggregate sorgu ile döndür"""
+        try:
+            toplam, size, ham_size, suresi_dolan = self._baglanti().execute(
+                '''
+                SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(raw_size), 0),
+                       COALESCE(SUM(expires_at < ?), 0)
+                FROM cache_entries
+                ''',
+                (time.time(),)
+            ).fetchone()
+            
+            return {
+                'total_files': toplam,
+                'total_size_mb': size / (1024 * 1024),
+                # Tasarruf, verinin JSON olarak kaplayacağı tahmini alana göre
+                'json_size_mb': ham_size / (1024 * 1024),
+                'saved_mb': (ham_size - size) / (1024 * 1024),
+                'saved_pct': ((ham_size - size) / ham_size * 100) if ham_size > 0 else 0,
+                'expired_entries': suresi_dolan,
+                'db_path': str(self.db_path),
+                'bellek': self.bellek.get_stats()
             }
         except Exception as e:
             print(f"⚠️ Cache istatistik hatası: {e}")
@@ -125,7 +508,24 @@ class CacheManager:
 
 
 # Global cache instance
-cache = CacheManager()
+# CACHE_FORMAT=json ile eski (okunabilir JSON) formata dönülür
+# CACHE_BACKEND=sqlite ile tek dosyalık SQLite store kullanılır
+# CACHE_DIZINI ile cache klasörü değişir (örn. benchmark için izole, geçici klasör)
+# CACHE_DB ile SQLite dosyası ayrıca belirlenebilir (varsayılan: <CACHE_DIZINI>/cache.db)
+_cache_dizini = os.environ.get('CACHE_DIZINI', 'cache')
+_cache_format = os.environ.get('CACHE_FORMAT')
+_cache_ayarlari = dict(
+    bellek_limit_mb=float(os.environ.get('CACHE_BELLEK_MB', 64)),
+    codec_haritasi={} if _cache_format else None,
+    varsayilan_codec=codec_bul(_cache_format) if _cache_format else None
+)
+if os.environ.get('CACHE_BACKEND') == 'sqlite':
+    cache = SQLiteCacheManager(
+        db_path=os.environ.get('CACHE_DB') or os.path.join(_cache_dizini, 'cache.db'),
+        **_cache_ayarlari
+    )
+else:
+    cache = CacheManager(cache_dir=_cache_dizini, **_cache_ayarlari)
 
 
 if __name__ == "__main__":
@@ -150,4 +550,3 @@ if __name__ == "__main__":
     # Test 4: Temizle
     print("Test 4: Cache temizleme")
     cache.clear()
-
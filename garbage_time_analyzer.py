@@ -5,7 +5,7 @@ Favori takımlarda yıldız oyuncuların risk analizini yapar
 
 from nba_api.stats.endpoints import teamgamelog
 import pandas as pd
-import time
+from api_wrapper import rate_limiter
 
 def takim_son_5_mac_skorlari(takim_id, sezon='2025-26'):
     """
@@ -19,7 +19,7 @@ def takim_son_5_mac_skorlari(takim_id, sezon='2025-26'):
         }
     """
     try:
-        time.sleep(0.6)  # Rate limiting
+        rate_limiter.wait()  # Ortak rate limiter
         
         # Takım maç loglarını çek
         gamelog = teamgamelog.TeamGameLog(team_id=takim_id, season=sezon)
@@ -4,10 +4,15 @@ NBA.com'dan direkt web scraping ile güncel oyuncu istatistiklerini çeker
 """
 
 import requests
+from kayit_oynatma import ortamdan_kur
+from nba_ayarlar import stats_url
 from bs4 import BeautifulSoup
 import json
 import time
 
+# NBA_VERI_MODU=kayit/oynat: cevapları fixture arşivine kaydet / arşivden oynat
+ortamdan_kur()
+
 def nba_stats_api_cek(oyuncu_isim, sezon='2025-26'):
     """
     NBA Stats API'den direkt veri çeker (resmi API endpoint)
@@ -26,7 +31,7 @@ def nba_stats_api_cek(oyuncu_isim, sezon='2025-26'):
     try:
         # 1. Oyuncu arama
         print("📡 Oyuncu aranıyor...")
-        search_url = "https://stats.nba.com/stats/commonallplayers"
+        search_url = stats_url('commonallplayers')
         params = {
             'LeagueID': '00',
             'Season': sezon,
@@ -78,7 +83,7 @@ def oyuncu_sezon_stats_cek(oyuncu_id, sezon='2025-26'):
         print(f"\n📊 {sezon} sezonu istatistikleri çekiliyor...")
         
         # Player Dashboard API
-        url = "https://stats.nba.com/stats/playerdashboardbyyearoveryear"
+        url = stats_url('playerdashboardbyyearoveryear')
         params = {
             'PlayerID': oyuncu_id,
             'Season': sezon,
@@ -120,7 +125,7 @@ def oyuncu_game_log_cek(oyuncu_id, sezon='2025-26'):
     try:
         print(f"\n🏀 {sezon} sezonu maç logları çekiliyor...")
         
-        url = "https://stats.nba.com/stats/playergamelog"
+        url = stats_url('playergamelog')
         params = {
             'PlayerID': oyuncu_id,
             'Season': sezon,
@@ -0,0 +1,260 @@
+"""
+Kayıt / Oynatma (Record / Replay)
+Upstream HTTP cevaplarını versiyonlu bir fixture arşivine kaydeder ve ağ erişimi olmadan geri oynatır
+
+Tüm veri katmanı (nba_api endpoint'leri, guncel_veri_cek) requests üzerinden gittiği için
+requests.Session.request yamalanır. Anahtar host'tan bağımsızdır: URL yolu + sıralı parametreler
+
+Kullanım:
+    NBA_VERI_MODU=kayit  python app.py     # Gerçek cevapları fixtures/nba altına kaydet
+    NBA_VERI_MODU=oynat  python app.py     # Sadece kayıtlardan cevap ver (ağ yok)
+    python kayit_oynatma.py [dizin]        # Arşiv özetini göster
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qsl, urlencode
+import requests
+from requests.structures import CaseInsensitiveDict
+
+MOD_KAPALI = 'kapali'
+MOD_KAYIT = 'kayit'
+MOD_OYNAT = 'oynat'
+
+# Arşiv formatı değişirse artırılır; farklı versiyonlu arşiv oynatılmaz
+FIXTURE_VERSIYON = 1
+VARSAYILAN_DIZIN = 'fixtures/nba'
+
+
+class KayitBulunamadi(requests.exceptions.ConnectionError):
+    """Oynatma modunda isteğin kaydı yok (ağa çıkılmaz)"""
+    
+    # with_retry bu hatayı tekrar denemez: kayıt sonradan oluşmaz
+    tekrar_denenmez = True
+
+
+def _parametreler(url, params):
+    """URL query'si ve params argümanını requests'in gönderdiği şekilde birleştirir"""
+    sonuc = parse_qsl(urlsplit(url).query, keep_blank_values=True)
+    if params:
+        ogeler = params.items() if isinstance(params, dict) else params
+        for anahtar, deger in ogeler:
+            degerler = deger if isinstance(deger, (list, tuple)) else [deger]
+            for d in degerler:
+                # requests None değerli parametreleri göndermez
+                if d is not None:
+                    sonuc.append((str(anahtar), str(d)))
+    return sorted(sonuc)
+
+
+def istek_anahtari(method, url, params=None):
+    """(anahtar, yol, parametreler): host'tan bağımsız, parametre sırasından bağımsız"""
+    yol = urlsplit(url).path
+    parametreler = _parametreler(url, params)
+    imza = f"{method.upper()} {yol}?{urlencode(parametreler)}"
+    return hashlib.sha1(imza.encode('utf-8')).hexdigest()[:20], yol, parametreler
+
+
+class FixtureArsivi:
+    """
+    Versiyonlu fixture arşivi
+    
+    dizin/
+        manifest.json        -> versiyon, nba_api versiyonu, anahtar -> girdi bilgisi
+        <anahtar>.json.gz    -> status, content-type, cevap gövdesi
+    """
+    
+    def __init__(self, dizin=VARSAYILAN_DIZIN):
+        self.dizin = Path(dizin)
+        self.manifest_yolu = self.dizin / 'manifest.json'
+        self._lock = threading.Lock()
+        self.manifest = self._manifest_oku()
+    
+    def _manifest_oku(self):
+        if not self.manifest_yolu.exists():
+            return {
+                'versiyon': FIXTURE_VERSIYON,
+                'olusturulma': datetime.now().isoformat(),
+                'nba_api': _nba_api_versiyonu(),
+                'girdiler': {}
+            }
+        with open(self.manifest_yolu, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('versiyon') != FIXTURE_VERSIYON:
+            raise ValueError(
+                f"Fixture arşivi versiyonu uyumsuz: {manifest.get('versiyon')} "
+                f"(beklenen {FIXTURE_VERSIYON}) - {self.dizin}"
+            )
+        return manifest
+    
+    def _manifest_yaz(self):
+        self.dizin.mkdir(parents=True, exist_ok=True)
+        self.manifest['guncelleme'] = datetime.now().isoformat()
+        gecici = self.manifest_yolu.with_suffix(f'.tmp{os.getpid()}')
+        with open(gecici, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+        os.replace(gecici, self.manifest_yolu)
+    
+    def kaydet(self, anahtar, yol, parametreler, status, content_type, govde):
+        """Bir cevabı arşive yazar (aynı anahtar varsa üzerine yazar)"""
+        dosya = f"{anahtar}.json.gz"
+        icerik = json.dumps({
+            'status': status,
+            'content_type': content_type,
+            'govde': govde.decode('utf-8', errors='replace')
+        }, ensure_ascii=False).encode('utf-8')
+        
+        with self._lock:
+            self.dizin.mkdir(parents=True, exist_ok=True)
+            gecici = self.dizin / f"{dosya}.tmp{os.getpid()}"
+            with open(gecici, 'wb') as f:
+                f.write(gzip.compress(icerik))
+            os.replace(gecici, self.dizin / dosya)
+            
+            self.manifest['girdiler'][anahtar] = {
+                'yol': yol,
+                'parametreler': parametreler,
+                'status': status,
+                'dosya': dosya,
+                'boyut': len(govde),
+                'kayit_zamani': datetime.now().isoformat()
+            }
+            self._manifest_yaz()
+    
+    def oku(self, anahtar):
+        """(status, content_type, gövde bytes) döndürür, kayıt yoksa None"""
+        girdi = self.manifest['girdiler'].get(anahtar)
+        if not girdi:
+            return None
+        with open(self.dizin / girdi['dosya'], 'rb') as f:
+            kayit = json.loads(gzip.decompress(f.read()).decode('utf-8'))
+        return kayit['status'], kayit.get('content_type'), kayit['govde'].encode('utf-8')
+    
+    def ozet(self):
+        """Endpoint yolu başına kayıt sayısı ve toplam boyut"""
+        yollar = {}
+        for girdi in self.manifest['girdiler'].values():
+            yol = yollar.setdefault(girdi['yol'], {'kayit': 0, 'boyut': 0})
+            yol['kayit'] += 1
+            yol['boyut'] += girdi.get('boyut', 0)
+        return {
+            'dizin': str(self.dizin),
+            'versiyon': self.manifest.get('versiyon'),
+            'nba_api': self.manifest.get('nba_api'),
+            'toplam_kayit': len(self.manifest['girdiler']),
+            'yollar': yollar
+        }
+
+
+def _nba_api_versiyonu():
+    try:
+        from importlib.metadata import version
+        return version('nba_api')
+    except Exception:
+        return None
+
+
+def _cevap_olustur(method, url, params, status, content_type, govde):
+    """Kayıttan requests.Response nesnesi oluşturur"""
+    hazir = requests.Request(method.upper(), url, params=params).prepare()
+    cevap = requests.Response()
+    cevap.status_code = status
+    cevap._content = govde
+    cevap.headers = CaseInsensitiveDict({'Content-Type': content_type or 'application/json'})
+    cevap.url = hazir.url
+    cevap.request = hazir
+    cevap.encoding = 'utf-8'
+    cevap.reason = 'OK' if status < 400 else 'Replayed Error'
+    return cevap
+
+
+# Yamalama durumu
+_orijinal_request = None
+_arsiv = None
+_mod = MOD_KAPALI
+_kur_lock = threading.Lock()
+
+
+def _yamali_request(session, method, url, params=None, **kwargs):
+    anahtar, yol, parametreler = istek_anahtari(method, url, params)
+    
+    if _mod == MOD_OYNAT:
+        kayit = _arsiv.oku(anahtar)
+        if kayit is None:
+            raise KayitBulunamadi(f"Fixture kaydı yok: {method.upper()} {yol} {parametreler}")
+        return _cevap_olustur(method, url, params, *kayit)
+    
+    cevap = _orijinal_request(session, method, url, params=params, **kwargs)
+    if _mod == MOD_KAYIT:
+        try:
+            _arsiv.kaydet(
+                anahtar, yol, parametreler, cevap.status_code,
+                cevap.headers.get('Content-Type'), cevap.content
+            )
+        except Exception as e:
+            print(f"⚠️ Fixture kaydedilemedi ({yol}): {e}")
+    return cevap
+
+
+def kur(mod, dizin=VARSAYILAN_DIZIN):
+    """
+    Kayıt/oynatma modunu açar (requests.Session.request yamalanır)
+    
+    Args:
+        mod: 'kayit', 'oynat' veya 'kapali'
+        dizin: Fixture arşivi dizini
+    """
+    global _orijinal_request, _arsiv, _mod
+    if mod not in (MOD_KAPALI, MOD_KAYIT, MOD_OYNAT):
+        raise ValueError(f"Bilinmeyen veri modu: {mod}")
+    
+    with _kur_lock:
+        if mod == MOD_KAPALI:
+            kaldir()
+            return
+        
+        _arsiv = FixtureArsivi(dizin)
+        _mod = mod
+        if _orijinal_request is None:
+            _orijinal_request = requests.Session.request
+            requests.Session.request = _yamali_request
+    
+    if mod == MOD_OYNAT:
+        print(f"📼 Oynatma modu: {len(_arsiv.manifest['girdiler'])} kayıt ({dizin}) - ağ erişimi yok")
+    else:
+        print(f"⏺️ Kayıt modu: upstream cevapları {dizin} altına kaydediliyor")
+
+
+def kaldir():
+    """Yamayı kaldırır, normal ağ erişimine döner"""
+    global _orijinal_request, _arsiv, _mod
+    if _orijinal_request is not None:
+        requests.Session.request = _orijinal_request
+        _orijinal_request = None
+    _arsiv = None
+    _mod = MOD_KAPALI
+
+
+def aktif_mod():
+    return _mod
+
+
+def ortamdan_kur():
+    """NBA_VERI_MODU / NBA_FIXTURE_DIZINI ortam değişkenlerine göre kurar (tekrar çağrılabilir)"""
+    mod = os.environ.get('NBA_VERI_MODU', MOD_KAPALI) or MOD_KAPALI
+    if mod == MOD_KAPALI or mod == _mod:
+        return _mod
+    kur(mod, os.environ.get('NBA_FIXTURE_DIZINI', VARSAYILAN_DIZIN))
+    return _mod
+
+
+if __name__ == '__main__':
+    import sys
+    
+    dizin = sys.argv[1] if len(sys.argv) > 1 else os.environ.get('NBA_FIXTURE_DIZINI', VARSAYILAN_DIZIN)
+    print(json.dumps(FixtureArsivi(dizin).ozet(), ensure_ascii=False, indent=2))
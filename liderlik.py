@@ -0,0 +1,180 @@
+"""
+Liderlik Tablosu
+Sezondaki tüm oyuncuların advanced stats özetleri (TS%, eFG%, AST/TOV, double-double, FG2%)
+maç logu deposunun kolon bloğundan tek gruplu geçişte hesaplanır
+Özet sezon başına saklanır, blok yenilendiğinde (cache timestamp değişince) yeniden kurulur
+"""
+
+import threading
+import numpy as np
+import pandas as pd
+from advanced_stats import toplu_sezon_advanced_stats_hesapla, guvenli_bol
+from mac_log_deposu import mac_log_deposu, SAYISAL_KOLONLAR
+
+# Liderlik satırlarında dönen (ve sıralanabilen) özet kolonları
+LIDERLIK_KOLONLARI = [
+    'total_games', 'avg_min', 'avg_pts', 'avg_reb', 'avg_ast',
+    'avg_ts_pct', 'avg_efg_pct', 'avg_ast_tov_ratio',
+    'total_double_doubles', 'double_double_pct', 'avg_fg2_pct',
+]
+
+VARSAYILAN_SIRALAMA = 'avg_ts_pct'
+
+# Maç başı yüzdeler (PlayerGameLog ile aynı: deneme yoksa 0)
+YUZDE_KOLONLARI = {
+    'FG_PCT': ('FGM', 'FGA'),
+    'FG3_PCT': ('FG3M', 'FG3A'),
+    'FT_PCT': ('FTM', 'FTA'),
+}
+
+
+def blok_ozeti(blok):
+    """
+    Sezon kolon bloğundaki tüm oyuncuların sezon advanced stats'ini hesaplar
+    
+    Args:
+        blok: SezonMacLoglari
+    
+    Returns:
+        Oyuncu başına bir satır (index = oyuncu_id), sezon_advanced_stats_hesapla kolonları
+        + TAKIM_ID (oyuncunun en son maçındaki takım); blok boşsa boş DataFrame
+    """
+    if not blok.araliklar or not len(blok):
+        return pd.DataFrame()
+    
+    idler = np.fromiter(blok.araliklar, dtype=np.int64, count=len(blok.araliklar))
+    baslar = np.array([bas for bas, _ in blok.araliklar.values()])
+    sonlar = np.array([son for _, son in blok.araliklar.values()])
+    
+    kolonlar = {kolon: blok.kolonlar[kolon] for kolon in SAYISAL_KOLONLAR}
+    kolonlar['MIN'] = kolonlar['MIN'].astype(np.float64)  # depoda float32, ortalamalar float64
+    for kolon, (pay, payda) in YUZDE_KOLONLARI.items():
+        kolonlar[kolon] = guvenli_bol(kolonlar[pay], kolonlar[payda])
+    # Satırlar oyuncu oyuncu ardışık: kimlik kolonu aralık uzunluklarından
+    kolonlar['Player_ID'] = np.repeat(idler, sonlar - baslar)
+    
+    ozet = toplu_sezon_advanced_stats_hesapla(pd.DataFrame(kolonlar))
+    # Her oyuncuda en yeni maç başta: güncel takım aralığın ilk satırı
+    takimlar = pd.Series(blok.kolonlar['TAKIM_ID'][baslar], index=idler)
+    ozet['TAKIM_ID'] = takimlar.reindex(ozet.index).to_numpy()
+    return ozet
+
+
+class LiderlikTablosu:
+    """
+    Sezon bazlı oyuncu liderlik tablosu
+    Özet, deponun döndürdüğü blok nesnesi değişmedikçe yeniden hesaplanmaz
+    """
+    
+    def __init__(self, depo=None):
+        """
+        Args:
+            depo: MacLogDeposu (None = global depo)
+        """
+        self._depo = depo
+        self._ozetler = {}  # sezon -> (blok, özet DataFrame)
+        self._isimler = None  # oyuncu_id -> isim
+        self._kisaltmalar = None  # TEAM_ID -> kısaltma
+        self._lock = threading.Lock()
+    
+    def _isim_sozlukleri(self):
+        if self._isimler is None:
+            from oyuncu_indeksi import oyuncu_indeksi
+            from takim_indeksi import takim_indeksi
+            self._kisaltmalar = {t['id']: t['abbreviation'] for t in takim_indeksi().takimlar}
+            self._isimler = {p['id']: p['full_name'] for p in oyuncu_indeksi().oyuncular}
+        return self._isimler, self._kisaltmalar
+    
+    def tablo(self, sezon=None):
+        """Oyuncu_id indeksli sezon özetini döndürür, lig tablosu çekilemezse None"""
+        depo = self._depo or mac_log_deposu()
+        blok = depo.sezon(sezon)
+        if blok is None:
+            return None
+        
+        with self._lock:
+            kayit = self._ozetler.get(sezon)
+            if kayit and kayit[0] is blok:
+                return kayit[1]
+        
+        isimler, kisaltmalar = self._isim_sozlukleri()
+        ozet = blok_ozeti(blok)
+        if not ozet.empty:
+            ozet.insert(0, 'oyuncu', [isimler.get(int(i), str(i)) for i in ozet.index])
+            ozet.insert(1, 'takim', [kisaltmalar.get(int(t), '') for t in ozet['TAKIM_ID']])
+        
+        with self._lock:
+            self._ozetler[sezon] = (blok, ozet)
+        return ozet
+    
+    def siralama(self, sezon=None, siralama=VARSAYILAN_SIRALAMA, azalan=True,
+                 min_mac=0, min_dakika=0.0, takim=None, limit=50):
+        """
+        Filtrelenmiş ve sıralanmış liderlik satırları
+        
+        Args:
+            sezon: Sezon (None = güncel)
+            siralama: LIDERLIK_KOLONLARI'ndan biri
+            azalan: True = büyükten küçüğe
+            min_mac / min_dakika: En az maç sayısı / maç başı dakika
+            takim: Takım kısaltması (None = tüm lig)
+            limit: Dönecek satır sayısı
+        
+        Returns:
+            (toplam eşleşen oyuncu, satır listesi), lig tablosu çekilemezse None
+        """
+        if siralama not in LIDERLIK_KOLONLARI:
+            raise ValueError(f"Bilinmeyen sıralama kolonu: {siralama}")
+        
+        ozet = self.tablo(sezon)
+        if ozet is None:
+            return None
+        if ozet.empty:
+            return 0, []
+        
+        maske = (ozet['total_games'] >= min_mac) & (ozet['avg_min'] >= min_dakika)
+        if takim:
+            maske &= ozet['takim'] == takim.upper()
+        secili = ozet[maske]
+        
+        # Eşitlikte maç sayısı fazla olan önce
+        secili = secili.sort_values(
+            [siralama, 'total_games'], ascending=[not azalan, False],
+            kind='mergesort', na_position='last'
+        ).head(limit)
+        
+        # Satırlar tek seferde sözlüğe çevrilir (NaN -> None, JSON uyumlu)
+        degerler = secili[LIDERLIK_KOLONLARI].round(4).astype(object)
+        degerler = degerler.where(degerler.notna(), None).to_dict('records')
+        satirlar = []
+        for sira, (oyuncu_id, oyuncu, takim_kisaltma, kayit) in enumerate(
+                zip(secili.index, secili['oyuncu'], secili['takim'], degerler), 1):
+            kayit['total_games'] = int(kayit['total_games'])
+            kayit['total_double_doubles'] = int(kayit['total_double_doubles'])
+            satirlar.append({'sira': sira, 'oyuncu_id': int(oyuncu_id), 'oyuncu': oyuncu, 'takim': takim_kisaltma, **kayit})
+        return int(maske.sum()), satirlar
+    
+    def temizle(self):
+        with self._lock:
+            self._ozetler.clear()
+
+
+liderlik_tablosu = LiderlikTablosu()
+
+
+if __name__ == '__main__':
+    import time
+    
+    baslangic = time.perf_counter()
+    sonuc = liderlik_tablosu.siralama(min_mac=10, limit=10)
+    print(f"⏱️ İlk sıralama: {(time.perf_counter() - baslangic)*1000:.1f} ms")
+    
+    baslangic = time.perf_counter()
+    sonuc = liderlik_tablosu.siralama(min_mac=10, limit=10)
+    print(f"⏱️ Sıcak sıralama: {(time.perf_counter() - baslangic)*1000:.1f} ms")
+    
+    if sonuc:
+        toplam, satirlar = sonuc
+        print(f"\n🏆 TS% liderleri ({toplam} oyuncu)")
+        for s in satirlar:
+            print(f"{s['sira']:>2}. {s['oyuncu']:<25} {s['takim']:<4} TS%: {s['avg_ts_pct']*100:.1f}  Maç: {s['total_games']}")
@@ -0,0 +1,216 @@
+"""
+Lig Tabloları
+Sezon bazlı LeagueDashTeamStats tabloları (Base / Advanced)
+Her ölçü tipi TTL başına bir kez çekilir, takım sorguları TEAM_ID indeksinden cevaplanır
+"""
+
+from nba_api.stats.endpoints import leaguedashteamstats, leaguegamefinder, scoreboardv2
+from datetime import datetime
+from api_wrapper import api_call
+import threading
+import pandas as pd
+
+# Ölçü tipi -> LeagueDashTeamStats parametreleri
+# (takim_analiz modüllerindeki eski çağrılarla birebir aynı)
+OLCU_PARAMETRELERI = {
+    'Base': {'per_mode_detailed': 'PerGame'},
+    'Advanced': {'measure_type_detailed_defense': 'Advanced'},
+}
+
+# Sezonluk takım maç tablosundan saklanan kolonlar (son 5 maç özeti için yeterli)
+TAKIM_MAC_KOLONLARI = ['TEAM_ID', 'GAME_ID', 'GAME_DATE', 'PTS', 'PLUS_MINUS', 'FG_PCT', 'FG3_PCT']
+
+
+@api_call(
+    cache_key_func=lambda sezon, olcu='Base': f"league_team_stats_{sezon}_{olcu.lower()}",
+    max_retries=3,
+    cache_duration_hours=6  # Takım tabloları gün içinde yavaş değişir
+)
+def lig_takim_tablosu_optimized(sezon, olcu='Base'):
+    """
+    Sezonun 30 takımlık LeagueDashTeamStats tablosunu tek çağrıda çeker
+    ✅ Cache: 6 saat (ölçü tipi ve sezon başına tek girdi)
+    ✅ Retry: 3 deneme
+    """
+    if olcu not in OLCU_PARAMETRELERI:
+        raise ValueError(f"Bilinmeyen ölçü tipi: {olcu}")
+    
+    print(f"\n📋 {sezon} {olcu} lig takım tablosu çekiliyor...")
+    
+    stats = leaguedashteamstats.LeagueDashTeamStats(
+        season=sezon,
+        season_type_all_star='Regular Season',
+        **OLCU_PARAMETRELERI[olcu]
+    )
+    df = stats.get_data_frames()[0]
+    
+    if df.empty:
+        print("⚠️ Lig takım tablosu boş!")
+        return None
+    
+    print(f"✅ {len(df)} takım bulundu!")
+    return {
+        'data': df.to_dict('records'),
+        'sezon': sezon,
+        'olcu': olcu,
+        'timestamp': datetime.now().isoformat()
+    }
+
+
+@api_call(
+    cache_key_func=lambda sezon: f"league_team_games_{sezon}",
+    max_retries=3,
+    cache_duration_hours=3  # Maç logları ile aynı süre
+)
+def lig_takim_maclari_optimized(sezon):
+    """
+    Sezondaki TÜM takımların maçlarını tek LeagueGameFinder çağrısıyla çeker
+    ✅ Takım başına ayrı game finder çağrısı yerine 1 çağrı
+    ✅ Cache: 3 saat
+    """
+    print(f"\n📋 {sezon} takım maç tablosu çekiliyor...")
+    
+    gamefinder = leaguegamefinder.LeagueGameFinder(
+        player_or_team_abbreviation='T',
+        season_nullable=sezon,
+        season_type_nullable='Regular Season',
+        league_id_nullable='00'
+    )
+    df = gamefinder.get_data_frames()[0]
+    
+    if df.empty:
+        print("⚠️ Takım maç tablosu boş!")
+        return None
+    
+    print(f"✅ {len(df)} takım maçı bulundu!")
+    return {
+        'data': df[[k for k in TAKIM_MAC_KOLONLARI if k in df.columns]].to_dict('records'),
+        'sezon': sezon,
+        'timestamp': datetime.now().isoformat()
+    }
+
+
+@api_call(
+    cache_key_func=lambda tarih: f"scoreboard_{tarih}",
+    max_retries=3,
+    cache_duration_hours=1  # Maç programı gün içinde nadiren değişir
+)
+def gunun_maclari_optimized(tarih):
+    """
+    Verilen tarihteki (YYYY-MM-DD) maçları ScoreboardV2'den çeker
+    ✅ Cache: 1 saat
+    """
+    print(f"\n📅 {tarih} maç programı çekiliyor...")
+    
+    scoreboard = scoreboardv2.ScoreboardV2(game_date=tarih, league_id='00', day_offset=0)
+    df = scoreboard.get_data_frames()[0]
+    
+    kolonlar = ['GAME_ID', 'HOME_TEAM_ID', 'VISITOR_TEAM_ID', 'GAME_STATUS_TEXT']
+    maclar = [] if df.empty else df[[k for k in kolonlar if k in df.columns]].to_dict('records')
+    print(f"✅ {len(maclar)} maç bulundu!")
+    return {
+        'data': maclar,
+        'tarih': tarih,
+        'timestamp': datetime.now().isoformat()
+    }
+
+
+class LigTablolari:
+    """
+    Cache'lenmiş lig tablolarının TEAM_ID indeksli görünümü
+    Tablo cache'de yenilendiğinde (timestamp değişince) indeks yeniden kurulur
+    """
+    
+    def __init__(self):
+        self._indeksler = {}  # (sezon, olcu) -> (timestamp, TEAM_ID indeksli DataFrame / son 5 özetleri)
+        self._lock = threading.Lock()
+    
+    def tablo(self, sezon, olcu='Base'):
+        """TEAM_ID indeksli tabloyu döndürür, çekilemezse None"""
+        sonuc = lig_takim_tablosu_optimized(sezon, olcu)
+        if not sonuc or not sonuc.get('data'):
+            return None
+        
+        anahtar = (sezon, olcu)
+        with self._lock:
+            kayit = self._indeksler.get(anahtar)
+            if kayit and kayit[0] == sonuc['timestamp']:
+                return kayit[1]
+        
+        df = pd.DataFrame(sonuc['data'])
+        df.index = df['TEAM_ID'].astype(int)
+        
+        with self._lock:
+            self._indeksler[anahtar] = (sonuc['timestamp'], df)
+        return df
+    
+    def takim(self, takim_id, sezon, olcu='Base'):
+        """Tek takımın satırını (pd.Series) döndürür, bulunamazsa None"""
+        df = self.tablo(sezon, olcu)
+        if df is None:
+            return None
+        try:
+            return df.loc[int(takim_id)]
+        except KeyError:
+            return None
+    
+    def son_5_ozetleri(self, sezon):
+        """
+        Tüm takımların son 5 maç özetleri (son_5_mac_analiz çıktısıyla aynı alanlar)
+        Sezonluk takım maç tablosundan tek gruplu geçişle hesaplanır
+        
+        Returns:
+            {TEAM_ID: özet}, tablo çekilemezse None
+        """
+        sonuc = lig_takim_maclari_optimized(sezon)
+        if not sonuc or not sonuc.get('data'):
+            return None
+        
+        anahtar = (sezon, 'son_5')
+        with self._lock:
+            kayit = self._indeksler.get(anahtar)
+            if kayit and kayit[0] == sonuc['timestamp']:
+                return kayit[1]
+        
+        df = pd.DataFrame(sonuc['data'])
+        df['TEAM_ID'] = df['TEAM_ID'].astype(int)
+        df = df.sort_values(['TEAM_ID', 'GAME_DATE', 'GAME_ID'], ascending=[True, False, False])
+        son_5 = df.groupby('TEAM_ID', sort=False).head(5).copy()
+        son_5['OPP_PTS'] = son_5['PTS'] - son_5['PLUS_MINUS']
+        son_5['TOPLAM'] = son_5['PTS'] + son_5['OPP_PTS']
+        ort = son_5.groupby('TEAM_ID').agg(
+            atilan_sayi_ort=('PTS', 'mean'),
+            yenilen_sayi_ort=('OPP_PTS', 'mean'),
+            fg_pct_ort=('FG_PCT', 'mean'),
+            fg3_pct_ort=('FG3_PCT', 'mean'),
+            toplam_skor_ort=('TOPLAM', 'mean'),
+            mac_sayisi=('PTS', 'size'),
+        )
+        ort['fg_pct_ort'] *= 100
+        ort['fg3_pct_ort'] *= 100
+        ozetler = {
+            int(takim_id): {**satir, 'mac_sayisi': int(satir['mac_sayisi'])}
+            for takim_id, satir in ort.to_dict('index').items()
+        }
+        
+        with self._lock:
+            self._indeksler[anahtar] = (sonuc['timestamp'], ozetler)
+        return ozetler
+    
+    def temizle(self):
+        """Bellekteki indeksleri temizler (cache girdilerine dokunmaz)"""
+        with self._lock:
+            self._indeksler.clear()
+
+
+# Global lig tabloları
+lig_tablolari = LigTablolari()
+
+
+def takim_satiri(takim_id, sezon, olcu='Base'):
+    """Takımın lig tablosundaki satırını döndürür (hata durumunda None)"""
+    try:
+        return lig_tablolari.takim(takim_id, sezon, olcu)
+    except Exception as e:
+        print(f"❌ Lig tablosu hatası: {e}")
+        return None
@@ -0,0 +1,382 @@
+"""
+Maç Logu Deposu
+Sezonun oyuncu maç loglarını kolon bazlı NumPy dizileri olarak bir kez kurar
+Analizler her istekte DataFrame kurmak yerine oyuncunun dizi görünümlerini okur
+"""
+
+import threading
+import numpy as np
+import pandas as pd
+
+# Sayısal kolonlar ve tipleri (maç başı sayaçlar int16'ya rahat sığar)
+SAYISAL_KOLONLAR = {
+    'MIN': np.float32,
+    'FGM': np.int16, 'FGA': np.int16,
+    'FG3M': np.int16, 'FG3A': np.int16,
+    'FTM': np.int16, 'FTA': np.int16,
+    'OREB': np.int16, 'DREB': np.int16, 'REB': np.int16,
+    'AST': np.int16, 'STL': np.int16, 'BLK': np.int16,
+    'TOV': np.int16, 'PF': np.int16, 'PTS': np.int16,
+    'PLUS_MINUS': np.int16,
+}
+
+# MATCHUP / GAME_DATE / WL / Game_ID'den bir kez türetilen kolonlar
+# EV / DEP: 'LAL vs. BOS' ev, 'LAL @ BOS' deplasman (ikisine de uymayan satır ikisinde de sayılmaz)
+# TARIH: 1970'ten bu yana gün sayısı
+# TAKIM_ID / RAKIP_ID: MATCHUP kısaltmalarından (bilinmiyorsa 0)
+TURETILMIS_KOLONLAR = {
+    'EV': np.bool_,
+    'DEP': np.bool_,
+    'GALIBIYET': np.bool_,
+    'TARIH': np.int32,
+    'TAKIM_ID': np.int32,
+    'RAKIP_ID': np.int32,
+    'GAME_ID': np.int64,
+}
+
+# Analiz tipi -> toplanan kolonlar
+ANALIZ_KOLONLARI = {
+    'SAR': ('PTS', 'AST', 'REB'),
+    'PTS': ('PTS',),
+    'AST': ('AST',),
+    'REB': ('REB',),
+}
+
+
+def _sayisal(seri, dtype):
+    return pd.to_numeric(seri, errors='coerce').fillna(0).to_numpy().astype(dtype)
+
+
+def kolonlari_kur(df, kisaltma_idleri=None):
+    """
+    PlayerGameLog formatındaki DataFrame'den kolon -> dizi sözlüğü kurar
+    
+    Args:
+        df: PlayerGameLog kolonlarına sahip DataFrame (satır sırası korunur)
+        kisaltma_idleri: takım kısaltması -> TEAM_ID (None = takım indeksi)
+    """
+    if kisaltma_idleri is None:
+        from takim_indeksi import takim_indeksi
+        kisaltma_idleri = {k: t['id'] for k, t in takim_indeksi().kisaltmalar.items()}
+    
+    n = len(df)
+    kolonlar = {}
+    for kolon, dtype in SAYISAL_KOLONLAR.items():
+        kolonlar[kolon] = _sayisal(df[kolon], dtype) if kolon in df.columns else np.zeros(n, dtype=dtype)
+    
+    if 'MATCHUP' in df.columns:
+        matchup = df['MATCHUP'].fillna('').astype(str)
+        kolonlar['EV'] = matchup.str.contains(' vs. ', regex=False).to_numpy()
+        kolonlar['DEP'] = matchup.str.contains(' @ ', regex=False).to_numpy()
+        parcalar = matchup.str.split(' ')
+        kolonlar['TAKIM_ID'] = parcalar.str[0].map(kisaltma_idleri).fillna(0).to_numpy().astype(np.int32)
+        kolonlar['RAKIP_ID'] = parcalar.str[-1].map(kisaltma_idleri).fillna(0).to_numpy().astype(np.int32)
+    
+    if 'GAME_DATE' in df.columns:
+        tarih = pd.to_datetime(df['GAME_DATE'], format='mixed', errors='coerce')
+        gun = tarih.to_numpy().astype('datetime64[D]').astype(np.int64)
+        kolonlar['TARIH'] = np.where(tarih.isna().to_numpy(), 0, gun).astype(np.int32)
+    
+    if 'WL' in df.columns:
+        kolonlar['GALIBIYET'] = (df['WL'] == 'W').to_numpy()
+    
+    if 'Game_ID' in df.columns:
+        kolonlar['GAME_ID'] = _sayisal(df['Game_ID'], np.int64)
+    
+    for kolon, dtype in TURETILMIS_KOLONLAR.items():
+        if kolon not in kolonlar:
+            kolonlar[kolon] = np.zeros(n, dtype=dtype)
+    return kolonlar
+
+
+class MacLogu:
+    """
+    Tek oyuncunun sezon maç logu: kolon -> NumPy dizisi (en yeni maç başta)
+    Sezon deposundan gelen diziler ortak bloğun salt okunur görünümleridir
+    """
+    
+    __slots__ = ('oyuncu_id', 'sezon', 'kolonlar', '_metrikler')
+    
+    def __init__(self, oyuncu_id, sezon, kolonlar):
+        self.oyuncu_id = oyuncu_id
+        self.sezon = sezon
+        self.kolonlar = kolonlar
+        self._metrikler = None
+    
+    @classmethod
+    def dataframe_den(cls, oyuncu_id, sezon, df, kisaltma_idleri=None):
+        """PlayerGameLog DataFrame'inden kurar (oyuncu bazlı yedek yol için)"""
+        kolonlar = kolonlari_kur(df.reset_index(drop=True), kisaltma_idleri)
+        for dizi in kolonlar.values():
+            dizi.flags.writeable = False
+        return cls(oyuncu_id, sezon, kolonlar)
+    
+    def __len__(self):
+        return len(self.kolonlar['PTS'])
+    
+    def __getitem__(self, kolon):
+        return self.kolonlar[kolon]
+    
+    def __contains__(self, kolon):
+        return kolon in self.kolonlar
+    
+    @property
+    def empty(self):
+        return len(self) == 0
+    
+    def head(self, n=5):
+        """İlk n maçın (en yeni) görünümü, kopya yapılmaz"""
+        return MacLogu(self.oyuncu_id, self.sezon, {k: v[:n] for k, v in self.kolonlar.items()})
+    
+    def sec(self, maske):
+        """Boolean maskeye uyan maçlar"""
+        return MacLogu(self.oyuncu_id, self.sezon, {k: v[maske] for k, v in self.kolonlar.items()})
+    
+    def deger(self, analiz_tipi):
+        """Analiz tipinin maç başı değer dizisi (float64, bilinmeyen tip için sıfırlar)"""
+        kolonlar = ANALIZ_KOLONLARI.get(analiz_tipi)
+        if not kolonlar:
+            return np.zeros(len(self))
+        toplam = self.kolonlar[kolonlar[0]].astype(np.float64)
+        for kolon in kolonlar[1:]:
+            toplam += self.kolonlar[kolon]
+        return toplam
+    
+    def metrikler(self):
+        """Tüm analiz tiplerinin metrikleri (ilk çağrıda bir kez hesaplanır)"""
+        if self._metrikler is None:
+            self._metrikler = MacMetrikleri(self)
+        return self._metrikler
+
+
+class MacMetrikleri:
+    """
+    Maç logunun analiz_yap için gereken metrikleri, tüm analiz tipleri için tek geçişte
+    
+    Değerler (tip x maç) matrisinde tutulur; ortalama, son 5, standart sapma ve
+    ev/deplasman ayrımı satır bazlı tek NumPy işlemiyle hesaplanır. Baraj geçme
+    oranları sıralı satırlarda ikili arama ile bulunur (baraj dizisi de verilebilir)
+    """
+    
+    TIPLER = tuple(ANALIZ_KOLONLARI)
+    
+    def __init__(self, log):
+        n = len(log)
+        # Son satır bilinmeyen analiz tipleri için sıfırlar (eski davranış: değer = 0)
+        matris = np.vstack([log.deger(tip) for tip in self.TIPLER] + [np.zeros(n)])
+        son_5 = matris[:, :5]
+        ev = log['EV']
+        dep = log['DEP']
+        ev_sayisi = int(np.count_nonzero(ev))
+        dep_sayisi = int(np.count_nonzero(dep))
+        sifir = np.zeros(len(matris))
+        
+        self.mac_sayisi = n
+        self.son_5_sayisi = son_5.shape[1]
+        self.ortalama = matris.mean(axis=1) if n else sifir
+        self.son_5_ortalama = son_5.mean(axis=1) if n else sifir
+        # pandas .std() ile aynı: örneklem standart sapması (tek maçta NaN)
+        self.std = matris.std(axis=1, ddof=1) if n > 1 else np.full(len(matris), np.nan)
+        self.ev_ortalama = (matris @ ev) / ev_sayisi if ev_sayisi else sifir
+        self.dep_ortalama = (matris @ dep) / dep_sayisi if dep_sayisi else sifir
+        self.sirali = np.sort(matris, axis=1)
+        self.son_5_sirali = np.sort(son_5, axis=1)
+    
+    def _indeks(self, analiz_tipi):
+        try:
+            return self.TIPLER.index(analiz_tipi)
+        except ValueError:
+            return len(self.TIPLER)
+    
+    @staticmethod
+    def _basari(sirali, baraj):
+        toplam = len(sirali)
+        basarili = toplam - np.searchsorted(sirali, baraj, side='left')
+        if np.ndim(baraj) == 0:
+            basarili = int(basarili)
+            oran = (basarili / toplam * 100) if toplam > 0 else 0
+        else:
+            oran = basarili / toplam * 100 if toplam > 0 else np.zeros(len(basarili))
+        return oran, basarili, toplam
+    
+    def basari(self, analiz_tipi, baraj):
+        """Tüm sezonda değer >= baraj oranı: (oran %, başarılı maç, toplam maç)"""
+        return self._basari(self.sirali[self._indeks(analiz_tipi)], baraj)
+    
+    def son_5_basari(self, analiz_tipi, baraj):
+        """Son 5 maçta değer >= baraj oranı: (oran %, başarılı maç, toplam maç)"""
+        return self._basari(self.son_5_sirali[self._indeks(analiz_tipi)], baraj)
+    
+    def ozet(self, analiz_tipi):
+        """Barajdan bağımsız metrikler"""
+        i = self._indeks(analiz_tipi)
+        return {
+            'ortalama': self.ortalama[i],
+            'son_5_ortalama': self.son_5_ortalama[i],
+            'std': self.std[i],
+            'ev_ortalama': self.ev_ortalama[i],
+            'dep_ortalama': self.dep_ortalama[i],
+            'ev_dep_fark': self.ev_ortalama[i] - self.dep_ortalama[i],
+        }
+
+
+class SezonMacLoglari:
+    """
+    Sezondaki tüm oyuncuların maç logları tek kolon bloğunda
+    Satırlar oyuncu oyuncu ardışık (her oyuncuda en yeni maç başta),
+    oyuncu sorgusu aralık sözlüğünden dilim alır
+    """
+    
+    def __init__(self, sezon, kolonlar, araliklar):
+        self.sezon = sezon
+        self.kolonlar = kolonlar
+        self.araliklar = araliklar  # oyuncu_id -> (baş, son)
+        self._gorunumler = {}  # oyuncu_id -> MacLogu (metrikleri blok ömrünce saklanır)
+        for dizi in self.kolonlar.values():
+            dizi.flags.writeable = False
+    
+    @classmethod
+    def kayitlardan(cls, sezon, oyuncu_loglari, kisaltma_idleri=None):
+        """
+        lig_mac_loglari_optimized çıktısındaki {oyuncu_id: [kayıtlar]} sözlüğünden kurar
+        """
+        satirlar = []
+        araliklar = {}
+        for oyuncu_id, kayitlar in oyuncu_loglari.items():
+            bas = len(satirlar)
+            satirlar.extend(kayitlar)
+            araliklar[int(oyuncu_id)] = (bas, len(satirlar))
+        
+        df = pd.DataFrame(satirlar) if satirlar else pd.DataFrame(columns=['PTS'])
+        return cls(sezon, kolonlari_kur(df, kisaltma_idleri), araliklar)
+    
+    def __len__(self):
+        return len(self.kolonlar['PTS'])
+    
+    def __contains__(self, oyuncu_id):
+        return int(oyuncu_id) in self.araliklar
+    
+    def oyuncu(self, oyuncu_id):
+        """Oyuncunun maç logu görünümü (sezonda oynamadıysa boş MacLogu)"""
+        oyuncu_id = int(oyuncu_id)
+        log = self._gorunumler.get(oyuncu_id)
+        if log is None:
+            bas, son = self.araliklar.get(oyuncu_id, (0, 0))
+            log = MacLogu(oyuncu_id, self.sezon, {k: v[bas:son] for k, v in self.kolonlar.items()})
+            if oyuncu_id in self.araliklar:
+                self._gorunumler[oyuncu_id] = log
+        return log
+    
+    def oyuncular(self):
+        return list(self.araliklar.keys())
+    
+    @property
+    def nbytes(self):
+        return sum(dizi.nbytes for dizi in self.kolonlar.values())
+
+
+class MacLogDeposu:
+    """
+    Cache'lenmiş maç loglarının kolon bazlı görünümleri
+    Cache girdisi yenilendiğinde (timestamp değişince) diziler yeniden kurulur
+    """
+    
+    def __init__(self, lig_yukleyici, oyuncu_yukleyici, toplu=True):
+        """
+        Args:
+            lig_yukleyici: sezon -> lig_mac_loglari_optimized formatında sonuç
+            oyuncu_yukleyici: (oyuncu_id, sezon) -> son_maclar_optimized formatında sonuç
+            toplu: False ise lig tablosu hiç kullanılmaz (NBA_TOPLU_MAC_LOGU=0)
+        """
+        self.lig_yukleyici = lig_yukleyici
+        self.oyuncu_yukleyici = oyuncu_yukleyici
+        self.toplu = toplu
+        self._sezonlar = {}  # sezon -> (timestamp, SezonMacLoglari)
+        self._oyuncular = {}  # (oyuncu_id, sezon) -> (timestamp, MacLogu)
+        self._lock = threading.Lock()
+    
+    def sezon(self, sezon=None):
+        """Sezonun kolon bloğunu döndürür, lig tablosu çekilemezse None"""
+        sonuc = self.lig_yukleyici(sezon)
+        if not sonuc or not isinstance(sonuc, dict) or 'data' not in sonuc:
+            return None
+        
+        with self._lock:
+            kayit = self._sezonlar.get(sezon)
+            if kayit and kayit[0] == sonuc['timestamp']:
+                return kayit[1]
+        
+        blok = SezonMacLoglari.kayitlardan(sonuc.get('sezon', sezon), sonuc['data'])
+        
+        with self._lock:
+            self._sezonlar[sezon] = (sonuc['timestamp'], blok)
+        return blok
+    
+    def _oyuncu_bazli(self, oyuncu_id, sezon):
+        sonuc = self.oyuncu_yukleyici(oyuncu_id, sezon)
+        if not sonuc or not isinstance(sonuc, dict) or not sonuc.get('data'):
+            return None
+        
+        anahtar = (int(oyuncu_id), sezon)
+        with self._lock:
+            kayit = self._oyuncular.get(anahtar)
+            if kayit and kayit[0] == sonuc['timestamp']:
+                return kayit[1]
+        
+        log = MacLogu.dataframe_den(int(oyuncu_id), sonuc.get('sezon', sezon), pd.DataFrame(sonuc['data']))
+        
+        with self._lock:
+            self._oyuncular[anahtar] = (sonuc['timestamp'], log)
+        return log
+    
+    def oyuncu(self, oyuncu_id, sezon=None):
+        """
+        Oyuncunun maç logunu döndürür (son_maclar ile aynı kaynak sırası)
+        
+        Returns:
+            MacLogu, oyuncu sezonda hiç oynamadıysa / veri yoksa None
+        """
+        if self.toplu:
+            try:
+                blok = self.sezon(sezon)
+                if blok is not None:
+                    if oyuncu_id in blok:
+                        return blok.oyuncu(oyuncu_id)
+                    # Lig tablosu var ama oyuncu bu sezon hiç oynamamış
+                    print("⚠️ Maç bulunamadı!")
+                    return None
+                print("⚠️ Lig tablosu alınamadı, oyuncu bazlı çekiliyor...")
+            except Exception as e:
+                print(f"⚠️ Lig maç logu hatası: {e}")
+        
+        return self._oyuncu_bazli(oyuncu_id, sezon)
+    
+    def temizle(self):
+        """Bellekteki dizileri temizler (cache girdilerine dokunmaz)"""
+        with self._lock:
+            self._sezonlar.clear()
+            self._oyuncular.clear()
+
+
+_depo = None
+_depo_lock = threading.Lock()
+
+
+def mac_log_deposu():
+    """Global maç logu deposunu döndürür (ilk çağrıda bir kez kurulur)"""
+    global _depo
+    if _depo is None:
+        with _depo_lock:
+            if _depo is None:
+                from nba_data_optimized import lig_mac_loglari_optimized, son_maclar_optimized, TOPLU_MAC_LOGU
+                _depo = MacLogDeposu(lig_mac_loglari_optimized, son_maclar_optimized, toplu=TOPLU_MAC_LOGU)
+    return _depo
+
+
+def oyuncu_mac_logu(oyuncu_id, sezon=None):
+    """Oyuncunun kolon bazlı maç logunu döndürür (hata / veri yok durumunda None)"""
+    try:
+        return mac_log_deposu().oyuncu(oyuncu_id, sezon)
+    except Exception as e:
+        print(f"⚠️ Maç logları hatası: {e}")
+        return None
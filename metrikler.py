@@ -0,0 +1,478 @@
+"""
+Metrikler
+Prometheus formatında sayaç/histogram kaydı ve /metrics çıktısı (ek bağımlılık yok)
+
+- Güncellemeler process içi, tek lock altında sözlük işlemleri: sürekli açık kalabilir
+- Her process (gunicorn worker'ı) durumunu periyodik olarak `<dizin>/<pid>_<başlangıç>.json` dosyasına
+  yazar; /metrics tüm dosyaları toplayarak tek bir görünüm üretir (hangi worker cevaplarsa cevaplasın)
+- Dosya adındaki başlangıç damgası sayesinde tekrar kullanılan PID eski worker'ın dosyasını ezmez
+- Kapanan worker'ların (PID'i yaşamayan ya da süresi geçmiş) dosyaları toplama sırasında
+  `<dizin>/_kapananlar.json` arşivine eklenip silinir: toplamlar hiç düşmez (Prometheus'ta
+  sahte sayaç sıfırlanması / rate sıçraması olmaz). Arşive katılan dosyanın worker'ı aslında
+  yaşıyorsa arşivlenen kısmı bir daha yazmaz
+- Worker normal kapanırken (atexit) son aralığın yazılmamış sayılarını da dosyasına yazar
+
+Ortam değişkenleri:
+    NBA_METRIK_DIZINI   -> Worker durum dosyaları (varsayılan: <CACHE_DIZINI>/.metrikler)
+    NBA_METRIK_ARALIK   -> Dosyaya yazma aralığı (saniye, varsayılan 5)
+    NBA_METRIK_OMUR     -> Güncellenmeyen dosyanın arşive katılma süresi (saniye, varsayılan 60)
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: process'ler arası dosya kilidi yok, sadece thread'ler arası kilit
+    fcntl = None
+
+# Gecikme histogramları için varsayılan kovalar (saniye)
+SURE_KOVALARI = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+TIP_SAYAC = 'counter'
+TIP_HISTOGRAM = 'histogram'
+
+# Kapanan worker'ların toplamları (worker dosyalarıyla aynı formatta)
+ARSIV_DOSYASI = '_kapananlar.json'
+
+
+def _etiket_kacis(deger):
+    return str(deger).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _etiket_metni(adlar, degerler, ek=None):
+    ciftler = [f'{ad}="{_etiket_kacis(deger)}"' for ad, deger in zip(adlar, degerler)]
+    if ek:
+        ciftler.append(ek)
+    return '{' + ','.join(ciftler) + '}' if ciftler else ''
+
+
+def _sayi_metni(deger):
+    if deger == float('inf'):
+        return '+Inf'
+    if isinstance(deger, float) and deger.is_integer():
+        return str(int(deger))
+    return repr(deger)
+
+
+class _Metrik:
+    """Sayaç ve histogram için ortak kısım"""
+    
+    tip = None
+    
+    def __init__(self, kayit, ad, aciklama, etiketler=()):
+        self.kayit = kayit
+        self.ad = ad
+        self.aciklama = aciklama
+        self.etiketler = tuple(etiketler)
+        self.seriler = {}  # etiket değerleri tuple -> değer
+    
+    def _anahtar(self, etiketler):
+        return tuple(str(etiketler.get(ad, '')) for ad in self.etiketler)
+
+
+class Sayac(_Metrik):
+    """Sadece artan sayaç"""
+    
+    tip = TIP_SAYAC
+    
+    def inc(self, miktar=1, **etiketler):
+        anahtar = self._anahtar(etiketler)
+        with self.kayit.lock:
+            self.seriler[anahtar] = self.seriler.get(anahtar, 0) + miktar
+            self.kayit.degisti()
+
+
+class Histogram(_Metrik):
+    """Kovalı histogram: seri -> [kova sayıları..., toplam, adet]"""
+    
+    tip = TIP_HISTOGRAM
+    
+    def __init__(self, kayit, ad, aciklama, etiketler=(), kovalar=SURE_KOVALARI):
+        super().__init__(kayit, ad, aciklama, etiketler)
+        self.kovalar = tuple(sorted(kovalar))
+    
+    def observe(self, deger, **etiketler):
+        anahtar = self._anahtar(etiketler)
+        # Kova indeksi: değerin sığdığı ilk kova (hiçbiri değilse +Inf)
+        indeks = len(self.kovalar)
+        for i, sinir in enumerate(self.kovalar):
+            if deger <= sinir:
+                indeks = i
+                break
+        with self.kayit.lock:
+            seri = self.seriler.get(anahtar)
+            if seri is None:
+                seri = self.seriler[anahtar] = [0] * (len(self.kovalar) + 1) + [0.0, 0]
+            seri[indeks] += 1
+            seri[-2] += deger
+            seri[-1] += 1
+            self.kayit.degisti()
+    
+    def zamanla(self, **etiketler):
+        """with histogram.zamanla(...): bloğun süresini gözlemler"""
+        return _Zamanlayici(self, etiketler)
+
+
+class _Zamanlayici:
+    def __init__(self, histogram, etiketler):
+        self.histogram = histogram
+        self.etiketler = etiketler
+    
+    def __enter__(self):
+        self.baslangic = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.baslangic, **self.etiketler)
+        return False
+
+
+class MetrikKaydi:
+    """
+    Process içi metrik kaydı + worker'lar arası dosya tabanlı toplama
+    """
+    
+    def __init__(self, dizin=None, yazma_araligi=5.0, dosya_omru=60.0):
+        """
+        Args:
+            dizin: Worker durum dosyalarının klasörü (None = sadece process içi)
+            yazma_araligi: Durumun dosyaya yazılma aralığı (saniye)
+            dosya_omru: Bu süre boyunca güncellenmeyen dosya ölü worker'ın sayılır (saniye)
+        """
+        self.dizin = Path(dizin) if dizin else None
+        self.yazma_araligi = yazma_araligi
+        # Canlı worker dosyasına her turda dokunur: ömür yazma aralığından kısa olamaz
+        self.dosya_omru = max(dosya_omru, 3 * yazma_araligi)
+        self.lock = threading.Lock()
+        self.metrikler = {}
+        self.kirli = False
+        self._pid = None
+        self._thread = None
+        self._dosya_pid = None
+        self._dosya_yolu = None
+        self._dizin_lock = threading.Lock()
+        self._son_yazilan = None  # dosyaya en son yazılan durum (dusulen çıkarılmadan)
+        self._dusulen = None  # arşive katılmış, dosyaya bir daha yazılmayacak kısım
+        
+        if hasattr(os, 'register_at_fork'):
+            # Fork edilen worker ebeveynin sayılarını devralmamalı (çift sayım olur)
+            os.register_at_fork(after_in_child=self._fork_sonrasi)
+        if self.dizin is not None:
+            atexit.register(self._cikista_yaz)
+    
+    def _kaydet(self, metrik):
+        with self.lock:
+            mevcut = self.metrikler.get(metrik.ad)
+            if mevcut is not None:
+                return mevcut
+            self.metrikler[metrik.ad] = metrik
+        return metrik
+    
+    def sayac(self, ad, aciklama, etiketler=()):
+        return self._kaydet(Sayac(self, ad, aciklama, etiketler))
+    
+    def histogram(self, ad, aciklama, etiketler=(), kovalar=SURE_KOVALARI):
+        return self._kaydet(Histogram(self, ad, aciklama, etiketler, kovalar))
+    
+    def degisti(self):
+        """Güncelleme sonrası (lock altında): yazıcı bu process'te yoksa başlat"""
+        self.kirli = True
+        if self._pid != os.getpid():
+            self.yaziciyi_baslat()
+    
+    def _fork_sonrasi(self):
+        self.lock = threading.Lock()
+        self._dizin_lock = threading.Lock()
+        for metrik in self.metrikler.values():
+            metrik.seriler = {}
+        self.kirli = False
+        self._pid = None
+        self._thread = None
+        self._son_yazilan = None
+        self._dusulen = None
+    
+    # ─────────────────────────── Durum / dosya ───────────────────────────
+    
+    def durum(self):
+        """Bu process'in durumu (JSON serializable)"""
+        with self.lock:
+            return {
+                ad: {
+                    'tip': m.tip,
+                    'aciklama': m.aciklama,
+                    'etiketler': list(m.etiketler),
+                    'kovalar': list(getattr(m, 'kovalar', ())),
+                    'seriler': [[list(k), list(v) if isinstance(v, list) else v] for k, v in m.seriler.items()]
+                }
+                for ad, m in self.metrikler.items()
+            }
+    
+    def _dosya(self):
+        pid = os.getpid()
+        if self._dosya_pid != pid:
+            self._dosya_pid = pid
+            self._dosya_yolu = self.dizin / f"{pid}_{time.time_ns()}.json"
+        return self._dosya_yolu
+    
+    @contextmanager
+    def _dizin_kilidi(self):
+        """Worker dosyaları ve arşiv üzerinde process'ler (ve thread'ler) arası kilit"""
+        with self._dizin_lock:
+            if fcntl is None:
+                yield
+                return
+            self.dizin.mkdir(parents=True, exist_ok=True)
+            with open(self.dizin / '.kilit', 'a') as f:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    
+    def dosyaya_yaz(self):
+        """Durumu bu process'in dosyasına atomik olarak yazar"""
+        if self.dizin is None:
+            return
+        with self.lock:
+            self.kirli = False
+        durum = self.durum()
+        try:
+            with self._dizin_kilidi():
+                dosya = self._dosya()
+                if self._son_yazilan is not None and not dosya.exists():
+                    # Dosya kapanmış worker'ınki sayılıp arşive katılmış: o kısım tekrar yazılmaz
+                    self._dusulen = self._son_yazilan
+                gecici = self.dizin / f".{os.getpid()}_{threading.get_ident()}.tmp"
+                with open(gecici, 'w', encoding='utf-8') as f:
+                    json.dump(_cikar(durum, self._dusulen) if self._dusulen else durum, f)
+                os.replace(gecici, dosya)
+                self._son_yazilan = durum
+        except OSError as e:
+            print(f"⚠️ Metrik dosyası yazılamadı: {e}")
+    
+    def _cikista_yaz(self):
+        """Process kapanırken son aralığın yazılmamış sayılarını dosyaya yazar"""
+        if self.kirli and self._pid == os.getpid():
+            self.dosyaya_yaz()
+    
+    def _dongu(self):
+        while True:
+            time.sleep(self.yazma_araligi)
+            if self.kirli:
+                self.dosyaya_yaz()
+            else:
+                # Boşta da canlılık işareti: dosya süresi geçmiş sayılıp silinmesin
+                try:
+                    os.utime(self._dosya())
+                except OSError:
+                    pass
+    
+    def yaziciyi_baslat(self):
+        """Periyodik yazma thread'ini (process başına bir kez) başlatır"""
+        if self.dizin is None or self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._thread = threading.Thread(target=self._dongu, name='metrik-yazici', daemon=True)
+        self._thread.start()
+    
+    def toplu_durum(self):
+        """Tüm worker'ların durumlarını birleştirir (bu process'in güncel durumu dahil)"""
+        if self.dizin is None:
+            return self.durum()
+        
+        self.dosyaya_yaz()
+        arsiv_dosyasi = self.dizin / ARSIV_DOSYASI
+        with self._dizin_kilidi():
+            arsiv = {}
+            _birlestir(arsiv, _durum_oku(arsiv_dosyasi) or {})
+            canlilar = []
+            kapananlar = []
+            for dosya in sorted(self.dizin.glob('*.json')):
+                if dosya == arsiv_dosyasi:
+                    continue
+                kapandi = dosya != self._dosya() and self._olu_mu(dosya)
+                durum = _durum_oku(dosya)
+                if kapandi:
+                    kapananlar.append(dosya)
+                    if durum:
+                        _birlestir(arsiv, durum)
+                elif durum:
+                    canlilar.append(durum)
+            
+            arsiv = _listeye(arsiv)
+            if kapananlar:
+                # Önce arşiv yazılır, sonra dosyalar silinir: toplamlar hiçbir anda düşmez
+                try:
+                    gecici = self.dizin / f".{os.getpid()}_{threading.get_ident()}.tmp"
+                    with open(gecici, 'w', encoding='utf-8') as f:
+                        json.dump(arsiv, f)
+                    os.replace(gecici, arsiv_dosyasi)
+                    for dosya in kapananlar:
+                        dosya.unlink(missing_ok=True)
+                except OSError as e:
+                    print(f"⚠️ Metrik arşivi yazılamadı: {e}")
+        
+        toplam = {}
+        for durum in [arsiv] + canlilar:
+            _birlestir(toplam, durum)
+        return toplam
+    
+    def _olu_mu(self, dosya):
+        """Dosyanın worker'ı kapanmış mı (PID yaşamıyor ya da dosya süresi geçmiş)"""
+        try:
+            if time.time() - dosya.stat().st_mtime > self.dosya_omru:
+                return True
+            pid = int(dosya.stem.split('_')[0])
+        except (OSError, ValueError):
+            return False
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        except OSError:
+            pass  # Başka kullanıcının process'i: yaşıyor
+        return False
+    
+    def prometheus_metni(self):
+        """/metrics cevabı (Prometheus text format 0.0.4)"""
+        return prometheus_metni(self.toplu_durum())
+
+
+def _durum_oku(dosya):
+    """Durum dosyasını okur, okunamazsa (silinmiş / bozuk) None"""
+    try:
+        with open(dosya, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _listeye(toplam):
+    """_birlestir sonucunu (seriler sözlük) dosya formatına (seriler liste) çevirir"""
+    return {
+        ad: {**metrik, 'seriler': [[list(k), v] for k, v in metrik['seriler'].items()]}
+        for ad, metrik in toplam.items()
+    }
+
+
+def _cikar(durum, dusulen):
+    """durum'un serilerinden dusulen'deki değerleri çıkarır (arşive katılmış kısım)"""
+    sonuc = {}
+    for ad, metrik in durum.items():
+        eski = {tuple(k): v for k, v in dusulen.get(ad, {}).get('seriler', [])}
+        seriler = []
+        for etiketler, deger in metrik['seriler']:
+            onceki = eski.get(tuple(etiketler))
+            if onceki is None:
+                seriler.append([etiketler, deger])
+            elif isinstance(deger, list):
+                seriler.append([etiketler, [a - b for a, b in zip(deger, onceki)]])
+            else:
+                seriler.append([etiketler, deger - onceki])
+        sonuc[ad] = {**metrik, 'seriler': seriler}
+    return sonuc
+
+
+def _birlestir(toplam, durum):
+    """durum'daki serileri toplam'a ekler (sayaç: toplam, histogram: kova bazında toplam)"""
+    for ad, metrik in durum.items():
+        hedef = toplam.setdefault(ad, {**metrik, 'seriler': {}})
+        for etiketler, deger in metrik['seriler']:
+            anahtar = tuple(etiketler)
+            mevcut = hedef['seriler'].get(anahtar)
+            if mevcut is None:
+                hedef['seriler'][anahtar] = list(deger) if isinstance(deger, list) else deger
+            elif isinstance(deger, list):
+                hedef['seriler'][anahtar] = [a + b for a, b in zip(mevcut, deger)]
+            else:
+                hedef['seriler'][anahtar] = mevcut + deger
+
+
+def prometheus_metni(durum):
+    satirlar = []
+    for ad in sorted(durum):
+        metrik = durum[ad]
+        seriler = metrik['seriler']
+        if isinstance(seriler, list):
+            seriler = {tuple(k): v for k, v in seriler}
+        etiket_adlari = metrik['etiketler']
+        satirlar.append(f"# HELP {ad} {metrik['aciklama']}")
+        satirlar.append(f"# TYPE {ad} {metrik['tip']}")
+        for etiketler, deger in sorted(seriler.items()):
+            if metrik['tip'] == TIP_HISTOGRAM:
+                kumulatif = 0
+                for sinir, sayi in zip(list(metrik['kovalar']) + [float('inf')], deger[:-2]):
+                    kumulatif += sayi
+                    le = f'le="{_sayi_metni(float(sinir))}"'
+                    satirlar.append(f"{ad}_bucket{_etiket_metni(etiket_adlari, etiketler, le)} {kumulatif}")
+                satirlar.append(f"{ad}_sum{_etiket_metni(etiket_adlari, etiketler)} {_sayi_metni(float(deger[-2]))}")
+                satirlar.append(f"{ad}_count{_etiket_metni(etiket_adlari, etiketler)} {deger[-1]}")
+            else:
+                satirlar.append(f"{ad}{_etiket_metni(etiket_adlari, etiketler)} {_sayi_metni(deger)}")
+    return '\n'.join(satirlar) + '\n'
+
+
+def _kayit_olustur():
+    dizin = os.environ.get('NBA_METRIK_DIZINI') or os.path.join(os.environ.get('CACHE_DIZINI', 'cache'), '.metrikler')
+    return MetrikKaydi(
+        dizin=dizin,
+        yazma_araligi=float(os.environ.get('NBA_METRIK_ARALIK', 5)),
+        dosya_omru=float(os.environ.get('NBA_METRIK_OMUR', 60))
+    )
+
+
+# Global kayıt ve uygulamanın metrikleri
+kayit = _kayit_olustur()
+
+cache_istek = kayit.sayac(
+    'nba_cache_istek_toplam', 'with_cache kararları (hit / stale / miss)', ('alan', 'sonuc'))
+cache_okuma = kayit.sayac(
+    'nba_cache_okuma_toplam', 'Cache okumalarının cevaplandığı katman (bellek / disk / yok)', ('alan', 'katman'))
+upstream_sure = kayit.histogram(
+    'nba_upstream_istek_suresi_saniye', 'stats.nba.com istek süresi', ('endpoint',))
+upstream_hata = kayit.sayac(
+    'nba_upstream_hata_toplam', 'Başarısız upstream istekleri (HTTP kodu ya da hata tipi)', ('endpoint', 'tur'))
+rate_limit_bekleme = kayit.histogram(
+    'nba_rate_limiter_bekleme_saniye', 'Rate limiter beklemesi',
+    kovalar=(0, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0))
+retry_sayisi = kayit.sayac(
+    'nba_retry_toplam', 'with_retry tekrar denemeleri', ('fonksiyon', 'sonuc'))
+http_sure = kayit.histogram(
+    'nba_http_istek_suresi_saniye', 'Flask route başına istek süresi', ('route', 'method', 'status'))
+
+
+def upstream_olcumunu_kur():
+    """nba_api'nin tüm stats isteklerini (NBAStatsHTTP.send_api_request) ölçer"""
+    from nba_api.stats.library.http import NBAStatsHTTP
+    
+    orijinal = NBAStatsHTTP.send_api_request
+    if getattr(orijinal, '_metrikli', False):
+        return
+    
+    def send_api_request(self, endpoint, parameters, *args, **kwargs):
+        ad = str(endpoint).lower()
+        baslangic = time.perf_counter()
+        try:
+            cevap = orijinal(self, endpoint, parameters, *args, **kwargs)
+        except Exception as e:
+            upstream_sure.observe(time.perf_counter() - baslangic, endpoint=ad)
+            upstream_hata.inc(endpoint=ad, tur=type(e).__name__)
+            raise
+        upstream_sure.observe(time.perf_counter() - baslangic, endpoint=ad)
+        status = getattr(cevap, '_status_code', None)
+        if status is not None and status >= 400:
+            upstream_hata.inc(endpoint=ad, tur=str(status))
+        return cevap
+    
+    send_api_request._metrikli = True
+    NBAStatsHTTP.send_api_request = send_api_request
+
+
+upstream_olcumunu_kur()
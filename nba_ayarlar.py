@@ -0,0 +1,27 @@
+"""
+NBA Veri Kaynağı Ayarları
+Upstream stats.nba.com adresi ortam değişkeniyle değiştirilebilir
+(örn. yük testi için yerel sahte sunucu: NBA_STATS_BASE_URL=http://127.0.0.1:8765/stats)
+"""
+
+import os
+from nba_api.stats.library.http import NBAStatsHTTP
+
+VARSAYILAN_STATS_BASE_URL = 'https://stats.nba.com/stats'
+STATS_BASE_URL = os.environ.get('NBA_STATS_BASE_URL', VARSAYILAN_STATS_BASE_URL).rstrip('/')
+
+
+def stats_url(endpoint):
+    """Endpoint'in tam URL'ini döndürür (örn. 'playergamelog')"""
+    return f"{STATS_BASE_URL}/{endpoint}"
+
+
+def uygula(base_url=None):
+    """nba_api'nin tüm stats endpoint'lerini verilen (veya ayarlı) adrese yönlendirir"""
+    global STATS_BASE_URL
+    if base_url:
+        STATS_BASE_URL = base_url.rstrip('/')
+    NBAStatsHTTP.base_url = STATS_BASE_URL + '/{endpoint}'
+
+
+uygula()
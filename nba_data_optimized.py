@@ -3,13 +3,14 @@ Optimize Edilmiş NBA Veri Çekme Modülü
 Cache, Retry ve Rate Limiting ile güçlendirilmiş
 """
 
-from nba_api.stats.static import players
-from nba_api.stats.endpoints import playercareerstats, playergamelog, commonplayerinfo
+from nba_api.stats.endpoints import playercareerstats, playergamelog, commonplayerinfo, leaguegamelog
 import os
 os.environ['NBA_API_TIMEOUT'] = '60'  # 60 saniye timeout - GERÇEK VERİ İÇİN
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from api_wrapper import api_call
+from oyuncu_indeksi import oyuncu_indeksi, BUL_ESIK
 import time
 import requests
 from requests.adapters import HTTPAdapter
@@ -44,6 +45,19 @@ def create_fast_session():
 # Global fast session
 fast_session = create_fast_session()
 
+# Toplu maç logu modu: Tüm liganın maç loglarını tek çağrıda çek, oyuncu bazlı böl
+# NBA_TOPLU_MAC_LOGU=0 ile eski (oyuncu başına PlayerGameLog) davranışa dönülür
+TOPLU_MAC_LOGU = os.environ.get('NBA_TOPLU_MAC_LOGU', '1') != '0'
+
+# PlayerGameLog ile aynı kolon isimleri (BarajAnaliz bu isimleri bekliyor)
+LIG_LOG_KOLON_MAP = {'PLAYER_ID': 'Player_ID', 'GAME_ID': 'Game_ID'}
+PLAYER_GAME_LOG_KOLONLARI = [
+    'SEASON_ID', 'Player_ID', 'Game_ID', 'GAME_DATE', 'MATCHUP', 'WL', 'MIN',
+    'FGM', 'FGA', 'FG_PCT', 'FG3M', 'FG3A', 'FG3_PCT', 'FTM', 'FTA', 'FT_PCT',
+    'OREB', 'DREB', 'REB', 'AST', 'STL', 'BLK', 'TOV', 'PF', 'PTS', 'PLUS_MINUS',
+    'VIDEO_AVAILABLE'
+]
+
 def guncel_sezon_bul():
     """Mevcut NBA sezonunu otomatik tespit eder"""
     now = datetime.now()
@@ -57,11 +71,10 @@ def guncel_sezon_bul():
         return f"{yil-1}-{str(yil)[2:]}"
 
 def oyuncu_bul(isim):
-    """Oyuncu adına göre arama yapar (Cache'li)"""
+    """Oyuncu adına göre arama yapar (indeksli, en iyi eşleşme önce)"""
     print(f"\n🔍 '{isim}' aranıyor...")
     
-    tum_oyuncular = players.get_players()
-    bulunan = [p for p in tum_oyuncular if isim.lower() in p['full_name'].lower()]
+    bulunan = oyuncu_indeksi().ara(isim, limit=10, bulanik_esik=BUL_ESIK)
     
     if bulunan:
         print(f"✅ {len(bulunan)} oyuncu bulundu!")
@@ -198,6 +211,66 @@ def son_maclar_optimized(oyuncu_id, sezon=None):
         print("⚠️ Maç bulunamadı!")
         return None
 
+def oyuncu_bazli_kayitlar(lig_df, kolonlar):
+    """
+    Lig maç logunu {oyuncu_id: [kayıtlar]} sözlüğüne böler
+    groupby(sort=False) ile aynı sonuç (oyuncular ilk görünme sırasında, maç sırası korunur)
+    ama tablo tek seferde kayıtlara çevrilir, grup başına to_dict çağrısı yapılmaz
+    """
+    kayitlar = lig_df[kolonlar].to_dict('records')
+    kodlar, oyuncu_idleri = pd.factorize(lig_df['Player_ID'])
+    sira = np.argsort(kodlar, kind='stable')
+    sinirlar = np.concatenate(([0], np.cumsum(np.bincount(kodlar, minlength=len(oyuncu_idleri)))))
+    
+    # JSON key'leri string olmak zorunda
+    return {
+        str(int(oyuncu_id)): [kayitlar[i] for i in sira[sinirlar[j]:sinirlar[j + 1]]]
+        for j, oyuncu_id in enumerate(oyuncu_idleri)
+    }
+
+@api_call(
+    cache_key_func=lambda sezon=None: f"league_game_log_{sezon or 'current'}",
+    max_retries=3,
+    cache_duration_hours=3  # Oyuncu maç logları ile aynı süre
+)
+def lig_mac_loglari_optimized(sezon=None):
+    """
+    Sezondaki TÜM oyuncuların maç loglarını tek çağrıda çeker (LeagueGameLog)
+    ✅ Tek API çağrısı: ~50 oyuncu için ~50 çağrı yerine 1 çağrı
+    ✅ Oyuncu ID'sine göre bölünmüş halde cache'lenir
+    """
+    if sezon is None:
+        sezon = guncel_sezon_bul()
+    
+    print(f"\n🏀 {sezon} sezonu lig geneli maç logları çekiliyor...")
+    
+    lig_log = leaguegamelog.LeagueGameLog(
+        season=sezon,
+        player_or_team_abbreviation='P',
+        season_type_all_star='Regular Season',
+        sorter='DATE',
+        direction='DESC'
+    )
+    lig_df = lig_log.get_data_frames()[0]
+    
+    if lig_df.empty:
+        print("⚠️ Lig maç logu bulunamadı!")
+        return None
+    
+    # PlayerGameLog formatına çevir (en yeni maç en üstte)
+    lig_df = lig_df.rename(columns=LIG_LOG_KOLON_MAP)
+    kolonlar = [k for k in PLAYER_GAME_LOG_KOLONLARI if k in lig_df.columns]
+    
+    oyuncu_loglari = oyuncu_bazli_kayitlar(lig_df, kolonlar)
+    
+    print(f"✅ {len(lig_df)} maç satırı, {len(oyuncu_loglari)} oyuncu bulundu!")
+    return {
+        'data': oyuncu_loglari,
+        'sezon': sezon,
+        'total_rows': len(lig_df),
+        'timestamp': datetime.now().isoformat()
+    }
+
 @api_call(
     cache_key_func=lambda oyuncu_id: f"player_info_{oyuncu_id}",
     max_retries=3,
@@ -239,8 +312,34 @@ def sezon_istatistikleri_cek(oyuncu_id, sezon=None):
         print(f"⚠️ Sezon istatistikleri hatası: {e}")
         return None, None
 
+def lig_mac_logu_kayitlari(oyuncu_id, sezon=None):
+    """
+    Toplu lig tablosundan oyuncunun maç kayıtlarını döndürür
+    
+    Returns:
+        list of dict (PlayerGameLog formatında), oyuncu sezonda hiç oynamadıysa [],
+        lig tablosu çekilemediyse None
+    """
+    result = lig_mac_loglari_optimized(sezon)
+    if result and isinstance(result, dict) and 'data' in result:
+        return result['data'].get(str(int(oyuncu_id)), [])
+    return None
+
 def son_maclar(oyuncu_id, sezon=None):
     """Eski API ile uyumlu wrapper"""
+    if TOPLU_MAC_LOGU:
+        try:
+            kayitlar = lig_mac_logu_kayitlari(oyuncu_id, sezon)
+            if kayitlar:
+                return pd.DataFrame(kayitlar)
+            if kayitlar is not None:
+                # Lig tablosu var ama oyuncu bu sezon hiç oynamamış
+                print("⚠️ Maç bulunamadı!")
+                return None
+            print("⚠️ Lig tablosu alınamadı, oyuncu bazlı çekiliyor...")
+        except Exception as e:
+            print(f"⚠️ Lig maç logu hatası: {e}")
+    
     try:
         result = son_maclar_optimized(oyuncu_id, sezon)
         if result and isinstance(result, dict) and 'data' in result:
@@ -0,0 +1,301 @@
+"""
+Cache Ön Isıtıcı
+Deploy / restart sonrası soğuk cache'i kullanıcılardan önce doldurur
+Lig tablolarını ve oyuncular.json listesini öncelik sırasıyla gezer
+
+Kullanım:
+    python on_isitici.py          # Tek tur çalıştır ve çık
+    NBA_ON_ISITMA=1 (app.py)      # Uygulama içinde arka plan thread'i olarak
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from nba_data_optimized import (
+    oyuncu_bul, guncel_sezon_bul,
+    sezon_istatistikleri_cek_optimized, oyuncu_detay_bilgi_optimized
+)
+from lig_tablolari import lig_takim_tablosu_optimized, lig_tablolari
+from takim_analiz_v2 import VARSAYILAN_SEZON
+from liderlik import liderlik_tablosu
+
+# Öncelik sırası: az çağrıyla çok isteğe hizmet eden tablolar önce
+ONCELIK_LIG_TABLOLARI = 1   # 3 çağrı / sezon (Base, Advanced, takım maçları), tüm maç analizleri
+ONCELIK_LIG_MAC_LOGU = 2    # 1 çağrı, tüm oyuncuların maç logları
+ONCELIK_OYUNCU_DETAY = 3    # Oyuncu başına 1 çağrı
+ONCELIK_SEZON_STATS = 4     # Oyuncu başına 1 çağrı
+
+# Bu önceliğe kadar tüm görevler tamamlanınca uygulama hazır sayılır (/hazir)
+HAZIR_ONCELIK = ONCELIK_LIG_MAC_LOGU
+
+# Hata veren kritik görevlerin tekrar denenmesi: ilk bekleme katlanarak bu sınıra kadar artar (saniye)
+KRITIK_TEKRAR_UST_SINIR = 600
+
+GOREV_BEKLIYOR = 'bekliyor'
+GOREV_TAMAM = 'tamam'
+GOREV_HATA = 'hata'
+
+
+def _varsayilan_takim_sezonlari():
+    """
+    Maç analizlerinin sorguladığı sezonlar: /api/mac-analiz sezonu + güncel sezon (bülten)
+    NBA_ON_ISITMA_TAKIM_SEZONLARI ile değişir, güncel sezon her zaman eklenir
+    """
+    sezonlar = os.environ.get('NBA_ON_ISITMA_TAKIM_SEZONLARI', '')
+    sezonlar = [s.strip() for s in sezonlar.split(',') if s.strip()] or [VARSAYILAN_SEZON]
+    guncel = guncel_sezon_bul()
+    if guncel not in sezonlar:
+        sezonlar.append(guncel)
+    return sezonlar
+
+
+class OnIsitici:
+    """
+    Öncelik sıralı cache ön ısıtıcı
+    
+    - Görevler tek thread'de sırayla çalışır: aynı anda en fazla bir upstream çağrısı,
+      o da ortak rate limiter'dan geçer (kullanıcı istekleriyle aynı bütçe)
+    - Görevler normal api_call fonksiyonlarını çağırır: taze cache varsa çağrı yapılmaz
+    - Tur bitince `tur_araligi_saat` sonra tekrar başlar (TTL'i dolan girdiler yenilenir)
+    - Hata veren kritik görevler (/hazir'ı bekletenler) turu beklemeden, kısa aralıklarla
+      tamamlanana kadar tekrar denenir
+    """
+    
+    def __init__(self, oyuncu_dosyasi='oyuncular.json', takim_sezonlari=None,
+                 tur_araligi_saat=3, gorev_araligi=0.0, kritik_tekrar_saniye=30.0):
+        """
+        Args:
+            oyuncu_dosyasi: Isıtılacak oyuncu listesi ({'oyuncular': [...]})
+            takim_sezonlari: Lig tablolarının ısıtılacağı sezonlar
+            tur_araligi_saat: Turlar arası bekleme (saat)
+            gorev_araligi: Görevler arası ek bekleme (saniye) - kullanıcılara pay bırakır
+            kritik_tekrar_saniye: Hata veren kritik görevlerin ilk tekrar beklemesi (saniye)
+        """
+        self.oyuncu_dosyasi = oyuncu_dosyasi
+        self.takim_sezonlari = takim_sezonlari or _varsayilan_takim_sezonlari()
+        self.tur_araligi_saat = tur_araligi_saat
+        self.gorev_araligi = gorev_araligi
+        self.kritik_tekrar_saniye = kritik_tekrar_saniye
+        
+        self._lock = threading.Lock()
+        self._durum = {}  # görev adı -> (öncelik, durum)
+        self._gorevler = []  # son turun görevleri (kritik tekrarlar için)
+        self._thread = None
+        self._durdur = threading.Event()
+        self.tur_sayisi = 0
+        self.tur_baslangic = None
+        self.tur_bitis = None
+        self.calisiyor = False
+        self.kritik_hazir = False  # Bir kez True olunca kalır (sonraki upstream hataları cache'i boşaltmaz)
+    
+    def _json_oku(self, dosya):
+        try:
+            with open(dosya, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"⚠️ {dosya} okunamadı: {e}")
+            return None
+    
+    def oyuncu_isimleri(self):
+        veri = self._json_oku(self.oyuncu_dosyasi)
+        if isinstance(veri, dict):
+            veri = veri.get('oyuncular', [])
+        return list(veri or [])
+    
+    def gorevleri_olustur(self):
+        """(öncelik, ad, fonksiyon) listesini öncelik sırasıyla döndürür"""
+        gorevler = []
+        
+        for sezon in self.takim_sezonlari:
+            for olcu in ('Base', 'Advanced'):
+                gorevler.append((
+                    ONCELIK_LIG_TABLOLARI, f"lig_tablosu:{sezon}:{olcu}",
+                    lambda sezon=sezon, olcu=olcu: lig_takim_tablosu_optimized(sezon, olcu)
+                ))
+            # Tek maç ve bülten tahminlerinin son 5 maç özetleri (tüm takımlar tek çağrıda)
+            gorevler.append((
+                ONCELIK_LIG_TABLOLARI, f"takim_maclari:{sezon}",
+                lambda sezon=sezon: lig_tablolari.son_5_ozetleri(sezon)
+            ))
+        
+        # BarajAnaliz maç loglarını mevcut sezon için toplu tablodan okur;
+        # depo tabloyu çeker, kolon dizilerini ve liderlik özetini de önceden kurar
+        mac_sezonu = guncel_sezon_bul()
+        gorevler.append((
+            ONCELIK_LIG_MAC_LOGU, f"lig_mac_logu:{mac_sezonu}",
+            lambda: liderlik_tablosu.tablo(mac_sezonu) is not None
+        ))
+        
+        for isim in self.oyuncu_isimleri():
+            gorevler.append((
+                ONCELIK_OYUNCU_DETAY, f"oyuncu_detay:{isim}",
+                lambda isim=isim: self._oyuncu_gorevi(isim, oyuncu_detay_bilgi_optimized)
+            ))
+        for isim in self.oyuncu_isimleri():
+            # sezon=None: BarajAnaliz'in kullandığı cache key ile aynı
+            gorevler.append((
+                ONCELIK_SEZON_STATS, f"sezon_stats:{isim}",
+                lambda isim=isim: self._oyuncu_gorevi(isim, sezon_istatistikleri_cek_optimized)
+            ))
+        
+        gorevler.sort(key=lambda g: g[0])
+        return gorevler
+    
+    def _oyuncu_gorevi(self, isim, func):
+        """İsmi BarajAnaliz ile aynı şekilde ID'ye çevirip fonksiyonu çağırır"""
+        oyuncular = oyuncu_bul(isim)
+        if not oyuncular:
+            return None
+        return func(oyuncular[0]['id'])
+    
+    def tur_calistir(self):
+        """Tüm görevleri öncelik sırasıyla bir kez çalıştırır"""
+        gorevler = self.gorevleri_olustur()
+        with self._lock:
+            # Önceki turun sonuçları görev tekrar çalışana kadar korunur (kapsama sıfırlanmaz)
+            self._durum = {
+                ad: self._durum.get(ad, (oncelik, GOREV_BEKLIYOR)) for oncelik, ad, _ in gorevler
+            }
+            self._gorevler = gorevler
+            self.tur_baslangic = datetime.now()
+            self.tur_bitis = None
+            self.calisiyor = True
+        
+        print(f"\n🔥 Ön ısıtma turu başladı: {len(gorevler)} görev")
+        for oncelik, ad, func in gorevler:
+            if self._durdur.is_set():
+                break
+            self._gorev_calistir(oncelik, ad, func)
+            if self.gorev_araligi > 0:
+                self._durdur.wait(self.gorev_araligi)
+        
+        with self._lock:
+            self.tur_sayisi += 1
+            self.tur_bitis = datetime.now()
+            self.calisiyor = False
+        rapor = self.durum_raporu()
+        print(f"✅ Ön ısıtma turu bitti: {rapor['tamam']}/{rapor['toplam']} (%{rapor['kapsama']*100:.0f})")
+        return rapor
+    
+    def _gorev_calistir(self, oncelik, ad, func):
+        """Tek görevi çalıştırır ve durumunu kaydeder"""
+        try:
+            sonuc = func()
+            durum = GOREV_TAMAM if sonuc else GOREV_HATA
+        except Exception as e:
+            print(f"⚠️ Ön ısıtma hatası ({ad}): {e}")
+            durum = GOREV_HATA
+        with self._lock:
+            self._durum[ad] = (oncelik, durum)
+        return durum
+    
+    def _kritikleri_tekrarla(self, son_an):
+        """
+        Hata veren kritik görevleri tamamlanana kadar tekrar dener
+        Bekleme kritik_tekrar_saniye'den başlar, KRITIK_TEKRAR_UST_SINIR'a kadar katlanır;
+        son_an'a (time.monotonic) gelinince bırakır, sonraki tur tüm görevleri zaten çalıştırır
+        """
+        bekleme = self.kritik_tekrar_saniye
+        while not self._durdur.is_set():
+            with self._lock:
+                hatalilar = [
+                    (oncelik, ad, func) for oncelik, ad, func in self._gorevler
+                    if oncelik <= HAZIR_ONCELIK and self._durum.get(ad, (oncelik, None))[1] == GOREV_HATA
+                ]
+            if not hatalilar:
+                return
+            
+            bekleme = min(bekleme, max(0.0, son_an - time.monotonic()))
+            if bekleme <= 0:
+                return
+            print(f"🔁 {len(hatalilar)} kritik görev {bekleme:.0f} sn sonra tekrar denenecek")
+            if self._durdur.wait(bekleme):
+                return
+            
+            for oncelik, ad, func in hatalilar:
+                if self._durdur.is_set():
+                    return
+                self._gorev_calistir(oncelik, ad, func)
+            bekleme = min(bekleme * 2, KRITIK_TEKRAR_UST_SINIR)
+    
+    def _dongu(self):
+        while not self._durdur.is_set():
+            try:
+                self.tur_calistir()
+            except Exception as e:
+                print(f"⚠️ Ön ısıtma turu başarısız: {e}")
+                with self._lock:
+                    self.calisiyor = False
+            sonraki_tur = time.monotonic() + self.tur_araligi_saat * 3600
+            self._kritikleri_tekrarla(sonraki_tur)
+            self._durdur.wait(max(0.0, sonraki_tur - time.monotonic()))
+    
+    def baslat(self):
+        """Arka plan thread'ini başlatır (zaten çalışıyorsa bir şey yapmaz)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._durdur.clear()
+        self._thread = threading.Thread(target=self._dongu, name='on-isitici', daemon=True)
+        self._thread.start()
+    
+    def durdur(self):
+        self._durdur.set()
+    
+    def durum_raporu(self):
+        """Isınma kapsamı raporu (readiness endpoint için)"""
+        with self._lock:
+            durumlar = list(self._durum.values())
+            tur_baslangic = self.tur_baslangic
+            tur_bitis = self.tur_bitis
+            calisiyor = self.calisiyor
+            tur_sayisi = self.tur_sayisi
+        
+        kritik = [durum for oncelik, durum in durumlar if oncelik <= HAZIR_ONCELIK]
+        if kritik and all(durum == GOREV_TAMAM for durum in kritik):
+            self.kritik_hazir = True
+        
+        gruplar = {}
+        for oncelik, durum in durumlar:
+            grup = gruplar.setdefault(oncelik, {'toplam': 0, 'tamam': 0, 'hata': 0})
+            grup['toplam'] += 1
+            if durum == GOREV_TAMAM:
+                grup['tamam'] += 1
+            elif durum == GOREV_HATA:
+                grup['hata'] += 1
+        
+        toplam = len(durumlar)
+        tamam = sum(g['tamam'] for g in gruplar.values())
+        return {
+            'toplam': toplam,
+            'tamam': tamam,
+            'hata': sum(g['hata'] for g in gruplar.values()),
+            'kapsama': round(tamam / toplam, 4) if toplam else 0.0,
+            'kritik_hazir': self.kritik_hazir,
+            'oncelikler': {str(k): v for k, v in sorted(gruplar.items())},
+            'calisiyor': calisiyor,
+            'tur_sayisi': tur_sayisi,
+            'tur_baslangic': tur_baslangic.isoformat() if tur_baslangic else None,
+            'tur_bitis': tur_bitis.isoformat() if tur_bitis else None,
+        }
+
+
+def _on_isitici_olustur():
+    """Ortam değişkenlerinden ön ısıtıcı oluşturur"""
+    return OnIsitici(
+        tur_araligi_saat=float(os.environ.get('NBA_ON_ISITMA_TUR_SAAT', 3)),
+        gorev_araligi=float(os.environ.get('NBA_ON_ISITMA_GOREV_ARALIGI', 0)),
+        kritik_tekrar_saniye=float(os.environ.get('NBA_ON_ISITMA_KRITIK_TEKRAR', 30))
+    )
+
+
+# Global ön ısıtıcı (app.py NBA_ON_ISITMA=1 ise başlatır)
+on_isitici = _on_isitici_olustur()
+
+
+if __name__ == '__main__':
+    baslangic = time.time()
+    rapor = on_isitici.tur_calistir()
+    print(json.dumps(rapor, ensure_ascii=False, indent=2))
+    print(f"⏱️ Süre: {time.time() - baslangic:.1f} saniye")
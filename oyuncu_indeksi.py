@@ -0,0 +1,241 @@
+"""
+Oyuncu İndeksi
+Normalize edilmiş isimler üzerinde hızlı oyuncu araması (tam / önek / bulanık)
+players.get_players() listesi bir kez indekslenir, her aramada taranmaz
+"""
+
+import bisect
+import heapq
+import threading
+import unicodedata
+from collections import Counter
+from nba_api.stats.static import players
+
+# Eşleşme katmanları (küçük olan önce gelir)
+KATMAN_TAM = 0          # Tam isim birebir aynı
+KATMAN_ONEK = 1         # Tam isim sorguyla başlıyor
+KATMAN_KELIME = 2       # Sorgudaki her kelime isimdeki bir kelimenin öneki
+KATMAN_ICERIR = 3       # Sorgu ismin içinde geçiyor (eski substring davranışı)
+KATMAN_BULANIK = 4      # Trigram + edit distance (yazım hatası, eksik harf)
+
+# Bulanık eşleşme için minimum benzerlik (1 - mesafe / uzunluk)
+BULANIK_ESIK = 0.6
+# Tek oyuncu seçerken (analiz) bulanık eşleşme daha sıkı: yanlış oyuncu hiç yoktan kötü
+BUL_ESIK = 0.8
+# Edit distance hesaplanacak en fazla aday (trigram ortaklığına göre seçilir)
+BULANIK_ADAY_LIMIT = 12
+# Oyuncuların bu oranından fazlasında geçen trigramlar ('on ', '  j'...) aday seçiminde atlanır
+YAYGIN_TRIGRAM_ORANI = 0.05
+
+
+def normalize(isim):
+    """
+    İsmi aramaya uygun hale getirir
+    Örn: 'Nikola Jokić' -> 'nikola jokic', 'Karl-Anthony Towns' -> 'karl anthony towns'
+    """
+    isim = unicodedata.normalize('NFKD', str(isim))
+    isim = ''.join(c for c in isim if not unicodedata.combining(c))
+    isim = ''.join(c if c.isalnum() else ' ' for c in isim.lower())
+    return ' '.join(isim.split())
+
+
+def trigramlar(metin):
+    """Kelime sınırları boşlukla işaretlenmiş trigram kümesi"""
+    metin = f"  {metin} "
+    return {metin[i:i + 3] for i in range(len(metin) - 2)}
+
+
+def edit_mesafesi(a, b):
+    """Levenshtein mesafesi (isimler kısa olduğu için basit DP yeterli)"""
+    if len(a) < len(b):
+        a, b = b, a
+    onceki = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        satir = [i]
+        for j, cb in enumerate(b, 1):
+            satir.append(min(
+                onceki[j] + 1,
+                satir[j - 1] + 1,
+                onceki[j - 1] + (ca != cb)
+            ))
+        onceki = satir
+    return onceki[-1]
+
+
+class OyuncuIndeksi:
+    """
+    Oyuncu isimleri için önceden kurulmuş arama indeksi
+    
+    - tam: normalize tam isim -> oyuncu listesi
+    - isimler / kelimeler: sıralı listeler, önek araması bisect ile
+    - trigram: trigram -> oyuncu indeksleri (bulanık arama adayları)
+    - Sonuçlar katman, benzerlik ve aktifliğe göre sıralanır (aktif oyuncular önce)
+    """
+    
+    def __init__(self, oyuncular=None):
+        """
+        Args:
+            oyuncular: players.get_players() formatında liste (None = nba_api statik listesi)
+        """
+        self.oyuncular = list(oyuncular if oyuncular is not None else players.get_players())
+        self.normal_isimler = [normalize(p['full_name']) for p in self.oyuncular]
+        self.isim_kelimeleri = [isim.split() for isim in self.normal_isimler]
+        
+        self.tam = {}
+        self.trigram = {}
+        isimler = []
+        kelimeler = []
+        for i, isim in enumerate(self.normal_isimler):
+            self.tam.setdefault(isim, []).append(i)
+            isimler.append((isim, i))
+            for kelime in isim.split():
+                kelimeler.append((kelime, i))
+            for tg in trigramlar(isim):
+                self.trigram.setdefault(tg, []).append(i)
+        
+        isimler.sort()
+        kelimeler.sort()
+        self._isim_anahtarlari = [k for k, _ in isimler]
+        self._isim_idleri = [i for _, i in isimler]
+        self._kelime_anahtarlari = [k for k, _ in kelimeler]
+        self._kelime_idleri = [i for _, i in kelimeler]
+        self._yaygin_sinir = max(1, int(len(self.oyuncular) * YAYGIN_TRIGRAM_ORANI))
+    
+    def _onek_ara(self, anahtarlar, idler, onek):
+        """Sıralı listede `onek` ile başlayan girdilerin oyuncu indekslerini döndürür"""
+        bas = bisect.bisect_left(anahtarlar, onek)
+        bit = bisect.bisect_left(anahtarlar, onek + '￿')
+        return idler[bas:bit]
+    
+    def _kelime_eslesmesi(self, kelimeler):
+        """Sorgudaki her kelimenin isimdeki bir kelimenin öneki olduğu oyuncular"""
+        # En uzun (en seçici) kelimeyle aday çıkar, diğerleriyle filtrele
+        en_secici = max(kelimeler, key=len)
+        adaylar = set(self._onek_ara(self._kelime_anahtarlari, self._kelime_idleri, en_secici))
+        if len(kelimeler) == 1:
+            return adaylar
+        return [
+            i for i in adaylar
+            if all(any(k.startswith(q) for k in self.isim_kelimeleri[i]) for q in kelimeler)
+        ]
+    
+    def _icerir(self, sorgu):
+        """İsminde sorgu geçen oyuncular (en seyrek trigram'ın adayları doğrulanır)"""
+        if len(sorgu) < 3:
+            return []
+        ic_trigramlar = {sorgu[i:i + 3] for i in range(len(sorgu) - 2)}
+        if not all(tg in self.trigram for tg in ic_trigramlar):
+            return []
+        en_seyrek = min((self.trigram[tg] for tg in ic_trigramlar), key=len)
+        return [i for i in en_seyrek if sorgu in self.normal_isimler[i]]
+    
+    def _bulanik(self, sorgu, esik=BULANIK_ESIK):
+        """Trigram ortaklığı ile aday seçip edit distance ile doğrular: {indeks: benzerlik}"""
+        postinglar = [self.trigram[tg] for tg in trigramlar(sorgu) if tg in self.trigram]
+        seyrek = [p for p in postinglar if len(p) <= self._yaygin_sinir]
+        sayac = Counter()
+        for posting in (seyrek or postinglar):
+            sayac.update(posting)
+        
+        sorgu_kelimeleri = sorgu.split()
+        sonuc = {}
+        for i, _ in sayac.most_common(BULANIK_ADAY_LIMIT):
+            # Tam isimle ya da (tek kelimelik sorguda) isimdeki bir kelimeyle karşılaştır
+            karsilastir = [self.normal_isimler[i]]
+            if len(sorgu_kelimeleri) == 1:
+                karsilastir += self.isim_kelimeleri[i]
+            benzerlik = 0.0
+            for hedef in karsilastir:
+                uzunluk = max(len(sorgu), len(hedef))
+                # Uzunluk farkı tek başına eşiği aşıyorsa DP'ye gerek yok
+                if 1 - abs(len(sorgu) - len(hedef)) / uzunluk < esik:
+                    continue
+                benzerlik = max(benzerlik, 1 - edit_mesafesi(sorgu, hedef) / uzunluk)
+            if benzerlik >= esik:
+                sonuc[i] = benzerlik
+        return sonuc
+    
+    def ara(self, sorgu, limit=10, sadece_aktif=False, bulanik_esik=BULANIK_ESIK):
+        """
+        Oyuncu arar, en iyi eşleşmeler önce
+        
+        Args:
+            sorgu: Oyuncu ismi (tam, kısmi, aksanlı/aksansız, hatalı yazılmış olabilir)
+            limit: En fazla sonuç sayısı (None = hepsi)
+            sadece_aktif: Sadece aktif oyuncular
+            bulanik_esik: Bulanık eşleşme için minimum benzerlik (0-1)
+        
+        Returns:
+            list of dict (players.get_players() formatında)
+        """
+        sorgu = normalize(sorgu)
+        if not sorgu:
+            return []
+        
+        puanlar = {}  # indeks -> (katman, benzerlik)
+        
+        def ekle(idler, katman, benzerlik=1.0):
+            for i in idler:
+                if i not in puanlar or (katman, -benzerlik) < (puanlar[i][0], -puanlar[i][1]):
+                    puanlar[i] = (katman, benzerlik)
+        
+        ekle(self.tam.get(sorgu, ()), KATMAN_TAM)
+        ekle(self._onek_ara(self._isim_anahtarlari, self._isim_idleri, sorgu), KATMAN_ONEK)
+        ekle(self._kelime_eslesmesi(sorgu.split()), KATMAN_KELIME)
+        if limit is None or len(puanlar) < limit:
+            ekle(self._icerir(sorgu), KATMAN_ICERIR)
+        
+        # Bulanık arama sadece kesin eşleşme yoksa (pahalı katman)
+        if not puanlar:
+            for i, benzerlik in self._bulanik(sorgu, bulanik_esik).items():
+                ekle((i,), KATMAN_BULANIK, benzerlik)
+        
+        if sadece_aktif:
+            puanlar = {i: p for i, p in puanlar.items() if self.oyuncular[i].get('is_active', False)}
+        
+        def sira(x):
+            return (
+                x[1][0],
+                -x[1][1],
+                not self.oyuncular[x[0]].get('is_active', False),
+                self.normal_isimler[x[0]]
+            )
+        
+        if limit is None:
+            sirali = sorted(puanlar.items(), key=sira)
+        else:
+            sirali = heapq.nsmallest(limit, puanlar.items(), key=sira)
+        return [self.oyuncular[i] for i, _ in sirali]
+    
+    def bul(self, sorgu):
+        """En iyi eşleşen oyuncuyu döndürür (bulunamazsa None)"""
+        sonuc = self.ara(sorgu, limit=1, bulanik_esik=BUL_ESIK)
+        return sonuc[0] if sonuc else None
+
+
+_indeks = None
+_indeks_lock = threading.Lock()
+
+
+def oyuncu_indeksi():
+    """Global oyuncu indeksini döndürür (ilk çağrıda bir kez kurulur)"""
+    global _indeks
+    if _indeks is None:
+        with _indeks_lock:
+            if _indeks is None:
+                _indeks = OyuncuIndeksi()
+    return _indeks
+
+
+if __name__ == '__main__':
+    import time
+    
+    baslangic = time.perf_counter()
+    indeks = oyuncu_indeksi()
+    print(f"✅ {len(indeks.oyuncular)} oyuncu indekslendi ({(time.perf_counter() - baslangic)*1000:.1f} ms)")
+    
+    for sorgu in ['LeBron James', 'lebron', 'Jokić', 'jalen', 'curyy', 'giannis antetokounpo']:
+        baslangic = time.perf_counter()
+        sonuc = indeks.ara(sorgu, limit=3)
+        sure = (time.perf_counter() - baslangic) * 1000
+        print(f"🔍 {sorgu!r}: {[p['full_name'] for p in sonuc]} ({sure:.2f} ms)")
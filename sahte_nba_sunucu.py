@@ -0,0 +1,667 @@
+"""
+Sahte stats.nba.com Sunucusu
+Yük testi için yerel HTTP sunucusu: kullandığımız endpoint'leri sentetik ya da kayıtlı veriyle taklit eder
+
+- Sentetik veri: sezon başına deterministik bir lig (30 takım, aktif oyuncular, maç/box skorlar)
+- Kayıtlı veri: kayit_oynatma fixture arşivi varsa önce oradan cevap verilir
+- Ayarlanabilir gecikme, hata oranı (500) ve 429 davranışı (rastgele ve/veya istek/saniye limiti)
+
+Kullanım:
+    python sahte_nba_sunucu.py --port 8765 --gecikme-ms 300 --hata-orani 0.02 --istek-limiti 5
+    NBA_STATS_BASE_URL=http://127.0.0.1:8765/stats python app.py
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from datetime import date, timedelta
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qsl
+from nba_api.stats.static import teams, players
+from nba_api.stats.endpoints import (
+    playergamelog, playercareerstats, commonplayerinfo, leaguedashteamstats,
+    leaguegamefinder, teamgamelog, commonallplayers, leaguegamelog, scoreboardv2
+)
+from kayit_oynatma import FixtureArsivi, istek_anahtari
+
+# Endpoint -> nba_api sınıfı (eksik result set'ler expected_data'dan boş doldurulur)
+ENDPOINT_SINIFLARI = {
+    'playergamelog': playergamelog.PlayerGameLog,
+    'playercareerstats': playercareerstats.PlayerCareerStats,
+    'commonplayerinfo': commonplayerinfo.CommonPlayerInfo,
+    'leaguedashteamstats': leaguedashteamstats.LeagueDashTeamStats,
+    'leaguegamefinder': leaguegamefinder.LeagueGameFinder,
+    'teamgamelog': teamgamelog.TeamGameLog,
+    'commonallplayers': commonallplayers.CommonAllPlayers,
+    'leaguegamelog': leaguegamelog.LeagueGameLog,
+    'scoreboardv2': scoreboardv2.ScoreboardV2,
+}
+
+# Sezon başına her takımın oynadığı maç sayısı (tur başına 15 maç)
+MAC_TURU = 40
+# Bir takımda maç başına süre alan oyuncuların taban dakikaları (toplam 240)
+DAKIKALAR = [36, 34, 32, 30, 28, 24, 20, 20, 16]
+POZISYONLAR = ['G', 'G-F', 'F', 'F-C', 'C']
+
+BOX_KOLONLARI = [
+    'MIN', 'FGM', 'FGA', 'FG_PCT', 'FG3M', 'FG3A', 'FG3_PCT', 'FTM', 'FTA', 'FT_PCT',
+    'OREB', 'DREB', 'REB', 'AST', 'STL', 'BLK', 'TOV', 'PF', 'PTS'
+]
+LIG_LOGU_OYUNCU_KOLONLARI = [
+    'SEASON_ID', 'PLAYER_ID', 'PLAYER_NAME', 'TEAM_ID', 'TEAM_ABBREVIATION', 'TEAM_NAME',
+    'GAME_ID', 'GAME_DATE', 'MATCHUP', 'WL'
+] + BOX_KOLONLARI + ['PLUS_MINUS', 'FANTASY_PTS', 'VIDEO_AVAILABLE']
+ADVANCED_KOLONLARI = [
+    'TEAM_ID', 'TEAM_NAME', 'GP', 'W', 'L', 'W_PCT', 'MIN', 'E_OFF_RATING', 'OFF_RATING',
+    'E_DEF_RATING', 'DEF_RATING', 'E_NET_RATING', 'NET_RATING', 'AST_PCT', 'AST_TO',
+    'AST_RATIO', 'OREB_PCT', 'DREB_PCT', 'REB_PCT', 'TM_TOV_PCT', 'EFG_PCT', 'TS_PCT',
+    'E_PACE', 'PACE', 'PACE_PER40', 'POSS', 'PIE'
+]
+
+
+def _oran(m, a):
+    return round(m / a, 3) if a else 0.0
+
+
+def _sezon_yili(sezon):
+    return int(str(sezon)[:4])
+
+
+class SentetikLig:
+    """
+    Bir sezonun deterministik sentetik ligi
+    Aynı (sezon, tohum) her zaman aynı maçları ve box skorları üretir
+    """
+    
+    def __init__(self, sezon, tohum=0):
+        self.sezon = sezon
+        self.yil = _sezon_yili(sezon)
+        self.season_id = f"2{self.yil}"
+        rng = random.Random(f"{sezon}:{tohum}")
+        
+        self.takimlar = {t['id']: t for t in sorted(teams.get_teams(), key=lambda t: t['id'])}
+        takim_idleri = list(self.takimlar)
+        self.takim_gucu = {tid: (rng.gauss(112, 4), rng.gauss(99, 2)) for tid in takim_idleri}
+        
+        # Aktif oyuncular takımlara dağıtılır, her oyuncunun sabit bir "yetenek" ağırlığı var
+        aktifler = sorted(players.get_active_players(), key=lambda p: p['id'])
+        rng.shuffle(aktifler)
+        self.oyuncular = {}
+        self.kadrolar = {tid: [] for tid in takim_idleri}
+        for i, oyuncu in enumerate(aktifler):
+            tid = takim_idleri[i % len(takim_idleri)]
+            # Oyuncu profili sezondan bağımsız: aynı oyuncu her sezon benzer üretir
+            profil = random.Random(f"{oyuncu['id']}:{tohum}")
+            self.oyuncular[oyuncu['id']] = {
+                **oyuncu,
+                'takim_id': tid,
+                'agirlik': profil.lognormvariate(0, 0.45),
+                'ribaund': profil.uniform(0.5, 1.6),
+                'asist': profil.uniform(0.5, 1.6),
+                'pozisyon': profil.choice(POZISYONLAR),
+            }
+            self.kadrolar[tid].append(oyuncu['id'])
+        for tid in takim_idleri:
+            self.kadrolar[tid].sort(key=lambda pid: -self.oyuncular[pid]['agirlik'])
+        
+        self.takim_satirlari = []
+        self.oyuncu_satirlari = []
+        baslangic = date(self.yil, 10, 22)
+        mac_no = 0
+        for tur in range(MAC_TURU):
+            gun = baslangic + timedelta(days=2 * tur)
+            sirali = takim_idleri[:]
+            rng.shuffle(sirali)
+            for ev, dep in zip(sirali[0::2], sirali[1::2]):
+                mac_no += 1
+                self._mac_uret(rng, f"002{self.yil % 100:02d}{mac_no:05d}", gun, ev, dep)
+        
+        # En yeni maç en üstte (API varsayılanı)
+        self.takim_satirlari.sort(key=lambda s: (s['_tarih'], s['GAME_ID']), reverse=True)
+        self.oyuncu_satirlari.sort(key=lambda s: (s['_tarih'], s['GAME_ID']), reverse=True)
+    
+    def _oyuncu_box(self, rng, oyuncu, dakika, sayi):
+        ftm_hedef = round(sayi * rng.uniform(0.1, 0.22))
+        fg3m = min(round(sayi * rng.uniform(0.15, 0.4) / 3), sayi // 3)
+        fgm2 = max(0, (sayi - ftm_hedef - 3 * fg3m) // 2)
+        ftm = sayi - 3 * fg3m - 2 * fgm2
+        fgm = fgm2 + fg3m
+        fga = max(fgm, round(fgm / rng.uniform(0.42, 0.56))) if fgm else rng.randint(0, 3)
+        fg3a = max(fg3m, round(fg3m / rng.uniform(0.3, 0.42))) if fg3m else rng.randint(0, 2)
+        # 2 sayılık denemeler isabetlerden az olamaz
+        fga = max(fga, fgm2 + fg3a)
+        fta = max(ftm, round(ftm / rng.uniform(0.7, 0.9))) if ftm else 0
+        reb = max(0, round(rng.gauss(dakika / 6 * oyuncu['ribaund'], 2)))
+        oreb = round(reb * rng.uniform(0.1, 0.35))
+        return {
+            'MIN': dakika, 'FGM': fgm, 'FGA': fga, 'FG_PCT': _oran(fgm, fga),
+            'FG3M': fg3m, 'FG3A': fg3a, 'FG3_PCT': _oran(fg3m, fg3a),
+            'FTM': ftm, 'FTA': fta, 'FT_PCT': _oran(ftm, fta),
+            'OREB': oreb, 'DREB': reb - oreb, 'REB': reb,
+            'AST': max(0, round(rng.gauss(dakika / 8 * oyuncu['asist'], 1.8))),
+            'STL': rng.randint(0, 2), 'BLK': rng.randint(0, 2),
+            'TOV': rng.randint(0, 4), 'PF': rng.randint(0, 5), 'PTS': sayi,
+        }
+    
+    def _takim_maci(self, rng, tid, rakip_id, ev_mi):
+        hucum, tempo = self.takim_gucu[tid]
+        savunma = self.takim_gucu[rakip_id][0] - 112
+        hedef = max(80, round(rng.gauss(hucum - savunma * 0.5 + (1.5 if ev_mi else -1.5), 11)))
+        # Rotasyon her maç ağırlıklı örneklenir (Efraimidis-Spirakis): yıldızlar daha çok, herkes biraz oynar
+        kadro = sorted(
+            self.kadrolar[tid],
+            key=lambda pid: -rng.random() ** (1 / self.oyuncular[pid]['agirlik'])
+        )[:len(DAKIKALAR)]
+        kadro.sort(key=lambda pid: -self.oyuncular[pid]['agirlik'])
+        dakikalar = [max(8, round(rng.gauss(d, 3))) for d in DAKIKALAR[:len(kadro)]]
+        paylar = [self.oyuncular[pid]['agirlik'] * dk for pid, dk in zip(kadro, dakikalar)]
+        toplam_pay = sum(paylar) or 1
+        satirlar = []
+        for pid, dk, pay in zip(kadro, dakikalar, paylar):
+            sayi = max(0, round(hedef * pay / toplam_pay * rng.uniform(0.65, 1.35)))
+            satirlar.append((pid, self._oyuncu_box(rng, self.oyuncular[pid], dk, sayi)))
+        return satirlar, tempo
+    
+    def _mac_uret(self, rng, game_id, gun, ev, dep):
+        ev_satirlari, ev_tempo = self._takim_maci(rng, ev, dep, True)
+        dep_satirlari, dep_tempo = self._takim_maci(rng, dep, ev, False)
+        ev_sayi = sum(b['PTS'] for _, b in ev_satirlari)
+        dep_sayi = sum(b['PTS'] for _, b in dep_satirlari)
+        if ev_sayi == dep_sayi:
+            # Uzatma yerine: ev sahibinin ilk oyuncusuna bir serbest atış
+            box = ev_satirlari[0][1]
+            box['PTS'] += 1
+            box['FTM'] += 1
+            box['FTA'] = max(box['FTA'], box['FTM'])
+            box['FT_PCT'] = _oran(box['FTM'], box['FTA'])
+            ev_sayi += 1
+        
+        ev_kisa = self.takimlar[ev]['abbreviation']
+        dep_kisa = self.takimlar[dep]['abbreviation']
+        for tid, satirlar, sayi, rakip_sayi, matchup, tempo in (
+            (ev, ev_satirlari, ev_sayi, dep_sayi, f"{ev_kisa} vs. {dep_kisa}", ev_tempo),
+            (dep, dep_satirlari, dep_sayi, ev_sayi, f"{dep_kisa} @ {ev_kisa}", dep_tempo),
+        ):
+            takim = self.takimlar[tid]
+            wl = 'W' if sayi > rakip_sayi else 'L'
+            ortak = {
+                '_tarih': gun, 'SEASON_ID': self.season_id, 'TEAM_ID': tid,
+                'TEAM_ABBREVIATION': takim['abbreviation'], 'TEAM_NAME': takim['full_name'],
+                'GAME_ID': game_id, 'MATCHUP': matchup, 'WL': wl,
+            }
+            takim_box = {k: sum(b[k] for _, b in satirlar) for k in BOX_KOLONLARI if not k.endswith('_PCT')}
+            takim_box['MIN'] = 240
+            for m, a, k in (('FGM', 'FGA', 'FG_PCT'), ('FG3M', 'FG3A', 'FG3_PCT'), ('FTM', 'FTA', 'FT_PCT')):
+                takim_box[k] = _oran(takim_box[m], takim_box[a])
+            self.takim_satirlari.append({
+                **ortak, **takim_box, 'PLUS_MINUS': sayi - rakip_sayi,
+                'OPP_PTS': rakip_sayi, '_tempo': tempo
+            })
+            for pid, box in satirlar:
+                oyuncu = self.oyuncular[pid]
+                self.oyuncu_satirlari.append({
+                    **ortak, **box, 'PLAYER_ID': pid, 'PLAYER_NAME': oyuncu['full_name'],
+                    'PLUS_MINUS': round((sayi - rakip_sayi) * box['MIN'] / 48),
+                })
+    
+    # ─────────────────────────── Endpoint'ler ───────────────────────────
+    
+    @staticmethod
+    def _tarih_api(gun):
+        return gun.isoformat()
+    
+    @staticmethod
+    def _tarih_log(gun):
+        return gun.strftime('%b %d, %Y').upper()
+    
+    def oyuncu_mac_logu(self, oyuncu_id):
+        basliklar = ENDPOINT_SINIFLARI['playergamelog'].expected_data['PlayerGameLog']
+        satirlar = []
+        for s in self.oyuncu_satirlari:
+            if s['PLAYER_ID'] != oyuncu_id:
+                continue
+            kayit = {**s, 'Player_ID': s['PLAYER_ID'], 'Game_ID': s['GAME_ID'],
+                     'GAME_DATE': self._tarih_log(s['_tarih']), 'VIDEO_AVAILABLE': 1}
+            satirlar.append([kayit.get(b) for b in basliklar])
+        return {'PlayerGameLog': (basliklar, satirlar)}
+    
+    def lig_mac_logu(self, oyuncu_mu):
+        if oyuncu_mu:
+            basliklar = LIG_LOGU_OYUNCU_KOLONLARI
+            kaynak = self.oyuncu_satirlari
+        else:
+            basliklar = ENDPOINT_SINIFLARI['leaguegamelog'].expected_data['LeagueGameLog']
+            kaynak = self.takim_satirlari
+        satirlar = []
+        for s in kaynak:
+            kayit = {**s, 'GAME_DATE': self._tarih_api(s['_tarih']), 'VIDEO_AVAILABLE': 1,
+                     'FANTASY_PTS': s['PTS'] + 1.2 * s['REB'] + 1.5 * s['AST']}
+            satirlar.append([kayit.get(b) for b in basliklar])
+        return {'LeagueGameLog': (basliklar, satirlar)}
+    
+    def takim_mac_bulucu(self, takim_id=None, tarih_bas=None, tarih_bit=None):
+        basliklar = ENDPOINT_SINIFLARI['leaguegamefinder'].expected_data['LeagueGameFinderResults']
+        satirlar = []
+        for s in self.takim_satirlari:
+            if takim_id and s['TEAM_ID'] != takim_id:
+                continue
+            if tarih_bas and s['_tarih'] < tarih_bas:
+                continue
+            if tarih_bit and s['_tarih'] > tarih_bit:
+                continue
+            kayit = {**s, 'GAME_DATE': self._tarih_api(s['_tarih'])}
+            satirlar.append([kayit.get(b) for b in basliklar])
+        return {'LeagueGameFinderResults': (basliklar, satirlar)}
+    
+    def gunun_maclari(self, gun):
+        """Günün maç programı; sentetik takvimde o gün maç yoksa 12 maçlık sabit bir program"""
+        basliklar = ENDPOINT_SINIFLARI['scoreboardv2'].expected_data['GameHeader']
+        oyunlar = {}  # GAME_ID -> [ev, deplasman]
+        for s in self.takim_satirlari:
+            if s['_tarih'] == gun:
+                oyunlar.setdefault(s['GAME_ID'], [None, None])[0 if ' vs. ' in s['MATCHUP'] else 1] = s['TEAM_ID']
+        maclar = [(game_id, ev, dep) for game_id, (ev, dep) in oyunlar.items()]
+        durum = 'Final'
+        if not maclar:
+            sirali = sorted(self.takimlar)
+            random.Random(f"{gun.isoformat()}:{self.sezon}").shuffle(sirali)
+            maclar = [(f"003{self.yil % 100:02d}{i + 1:05d}", ev, dep)
+                      for i, (ev, dep) in enumerate(zip(sirali[0:24:2], sirali[1:24:2]))]
+            durum = '7:30 pm ET'
+        satirlar = []
+        for sira, (game_id, ev, dep) in enumerate(sorted(maclar), 1):
+            kayit = {
+                'GAME_DATE_EST': f"{gun.isoformat()}T00:00:00", 'GAME_SEQUENCE': sira, 'GAME_ID': game_id,
+                'GAME_STATUS_ID': 3 if durum == 'Final' else 1, 'GAME_STATUS_TEXT': durum,
+                'HOME_TEAM_ID': ev, 'VISITOR_TEAM_ID': dep, 'SEASON': str(self.yil),
+            }
+            satirlar.append([kayit.get(b) for b in basliklar])
+        return {'GameHeader': (basliklar, satirlar)}
+    
+    def takim_mac_logu(self, takim_id):
+        basliklar = ENDPOINT_SINIFLARI['teamgamelog'].expected_data['TeamGameLog']
+        maclar = [s for s in self.takim_satirlari if s['TEAM_ID'] == takim_id]
+        satirlar = []
+        galibiyet = maclik = 0
+        kumulatif = {}
+        for s in reversed(maclar):
+            maclik += 1
+            galibiyet += s['WL'] == 'W'
+            kumulatif[s['GAME_ID']] = (galibiyet, maclik - galibiyet, _oran(galibiyet, maclik))
+        for s in maclar:
+            w, l, w_pct = kumulatif[s['GAME_ID']]
+            kayit = {**s, 'Team_ID': s['TEAM_ID'], 'Game_ID': s['GAME_ID'],
+                     'GAME_DATE': self._tarih_log(s['_tarih']), 'W': w, 'L': l, 'W_PCT': w_pct}
+            satirlar.append([kayit.get(b) for b in basliklar])
+        return {'TeamGameLog': (basliklar, satirlar)}
+    
+    def lig_takim_tablosu(self, olcu='Base', per_mode='Totals'):
+        gruplar = {tid: [] for tid in self.takimlar}
+        for s in self.takim_satirlari:
+            gruplar[s['TEAM_ID']].append(s)
+        
+        satirlar = []
+        for tid, maclar in gruplar.items():
+            gp = len(maclar)
+            w = sum(s['WL'] == 'W' for s in maclar)
+            toplam = {k: sum(s[k] for s in maclar) for k in BOX_KOLONLARI if not k.endswith('_PCT')}
+            toplam.update({
+                'PLUS_MINUS': sum(s['PLUS_MINUS'] for s in maclar),
+                'OPP_PTS': sum(s['OPP_PTS'] for s in maclar),
+            })
+            ortak = {
+                'TEAM_ID': tid, 'TEAM_NAME': self.takimlar[tid]['full_name'],
+                'GP': gp, 'W': w, 'L': gp - w, 'W_PCT': _oran(w, gp),
+            }
+            if olcu == 'Advanced':
+                poss = toplam['FGA'] - toplam['OREB'] + toplam['TOV'] + 0.44 * toplam['FTA']
+                pace = round(poss / gp, 2) if gp else 0
+                off = round(100 * toplam['PTS'] / poss, 1) if poss else 0
+                deff = round(100 * toplam['OPP_PTS'] / poss, 1) if poss else 0
+                kayit = {
+                    **ortak, 'MIN': 48.0,
+                    'E_OFF_RATING': off, 'OFF_RATING': off, 'E_DEF_RATING': deff, 'DEF_RATING': deff,
+                    'E_NET_RATING': round(off - deff, 1), 'NET_RATING': round(off - deff, 1),
+                    'AST_PCT': _oran(toplam['AST'], toplam['FGM']),
+                    'AST_TO': round(toplam['AST'] / toplam['TOV'], 2) if toplam['TOV'] else 0,
+                    'AST_RATIO': round(100 * toplam['AST'] / poss, 1) if poss else 0,
+                    'OREB_PCT': _oran(toplam['OREB'], toplam['REB']),
+                    'DREB_PCT': _oran(toplam['DREB'], toplam['REB']), 'REB_PCT': 0.5,
+                    'TM_TOV_PCT': round(100 * toplam['TOV'] / poss, 1) if poss else 0,
+                    'EFG_PCT': _oran(toplam['FGM'] + 0.5 * toplam['FG3M'], toplam['FGA']),
+                    'TS_PCT': _oran(toplam['PTS'], 2 * (toplam['FGA'] + 0.44 * toplam['FTA'])),
+                    'E_PACE': pace, 'PACE': pace, 'PACE_PER40': round(pace * 40 / 48, 2),
+                    'POSS': round(poss), 'PIE': 0.5,
+                }
+                basliklar = ADVANCED_KOLONLARI
+            else:
+                bolen = gp if per_mode == 'PerGame' and gp else 1
+                kayit = {**ortak, **{
+                    k: (round(v / bolen, 1) if bolen > 1 else v) for k, v in toplam.items()
+                }}
+                for m, a, k in (('FGM', 'FGA', 'FG_PCT'), ('FG3M', 'FG3A', 'FG3_PCT'), ('FTM', 'FTA', 'FT_PCT')):
+                    kayit[k] = _oran(toplam[m], toplam[a])
+                basliklar = ENDPOINT_SINIFLARI['leaguedashteamstats'].expected_data['LeagueDashTeamStats']
+            satirlar.append([kayit.get(b) for b in basliklar])
+        return {'LeagueDashTeamStats': (basliklar, satirlar)}
+    
+    def oyuncu_sezon_toplami(self, oyuncu_id):
+        """playercareerstats SeasonTotalsRegularSeason satırı (oyuncu sezonda oynamadıysa None)"""
+        maclar = [s for s in self.oyuncu_satirlari if s['PLAYER_ID'] == oyuncu_id]
+        if not maclar:
+            return None
+        oyuncu = self.oyuncular[oyuncu_id]
+        toplam = {k: sum(s[k] for s in maclar) for k in BOX_KOLONLARI if not k.endswith('_PCT')}
+        for m, a, k in (('FGM', 'FGA', 'FG_PCT'), ('FG3M', 'FG3A', 'FG3_PCT'), ('FTM', 'FTA', 'FT_PCT')):
+            toplam[k] = _oran(toplam[m], toplam[a])
+        return {
+            **toplam, 'PLAYER_ID': oyuncu_id, 'SEASON_ID': self.sezon, 'LEAGUE_ID': '00',
+            'TEAM_ID': oyuncu['takim_id'],
+            'TEAM_ABBREVIATION': self.takimlar[oyuncu['takim_id']]['abbreviation'],
+            'PLAYER_AGE': 27.0, 'GP': len(maclar), 'GS': len(maclar),
+        }
+    
+    def oyuncu_bilgisi(self, oyuncu_id):
+        basliklar = ENDPOINT_SINIFLARI['commonplayerinfo'].expected_data['CommonPlayerInfo']
+        oyuncu = self.oyuncular.get(oyuncu_id)
+        if not oyuncu:
+            return {'CommonPlayerInfo': (basliklar, [])}
+        takim = self.takimlar[oyuncu['takim_id']]
+        kayit = {
+            'PERSON_ID': oyuncu_id, 'FIRST_NAME': oyuncu['first_name'], 'LAST_NAME': oyuncu['last_name'],
+            'DISPLAY_FIRST_LAST': oyuncu['full_name'],
+            'DISPLAY_LAST_COMMA_FIRST': f"{oyuncu['last_name']}, {oyuncu['first_name']}",
+            'POSITION': oyuncu['pozisyon'], 'ROSTERSTATUS': 'Active',
+            'TEAM_ID': takim['id'], 'TEAM_NAME': takim['nickname'],
+            'TEAM_ABBREVIATION': takim['abbreviation'], 'TEAM_CODE': takim['nickname'].lower(),
+            'TEAM_CITY': takim['city'], 'FROM_YEAR': self.yil - 3, 'TO_YEAR': self.yil + 1,
+            'NBA_FLAG': 'Y', 'GAMES_PLAYED_FLAG': 'Y',
+        }
+        return {'CommonPlayerInfo': (basliklar, [[kayit.get(b) for b in basliklar]])}
+    
+    def tum_oyuncular(self):
+        basliklar = ENDPOINT_SINIFLARI['commonallplayers'].expected_data['CommonAllPlayers']
+        satirlar = []
+        for pid, oyuncu in sorted(self.oyuncular.items(), key=lambda x: x[1]['last_name']):
+            takim = self.takimlar[oyuncu['takim_id']]
+            kayit = {
+                'PERSON_ID': pid,
+                'DISPLAY_LAST_COMMA_FIRST': f"{oyuncu['last_name']}, {oyuncu['first_name']}",
+                'DISPLAY_FIRST_LAST': oyuncu['full_name'], 'ROSTERSTATUS': 1,
+                'FROM_YEAR': str(self.yil - 3), 'TO_YEAR': str(self.yil + 1),
+                'TEAM_ID': takim['id'], 'TEAM_CITY': takim['city'], 'TEAM_NAME': takim['nickname'],
+                'TEAM_ABBREVIATION': takim['abbreviation'], 'TEAM_CODE': takim['nickname'].lower(),
+                'GAMES_PLAYED_FLAG': 'Y', 'OTHERLEAGUE_EXPERIENCE_CH': '00',
+            }
+            satirlar.append([kayit.get(b) for b in basliklar])
+        return {'CommonAllPlayers': (basliklar, satirlar)}
+
+
+class SentetikVeri:
+    """Sezon -> SentetikLig önbelleği ve endpoint yönlendirmesi"""
+    
+    def __init__(self, tohum=0, kariyer_sezon_sayisi=3):
+        self.tohum = tohum
+        self.kariyer_sezon_sayisi = kariyer_sezon_sayisi
+        self._ligler = {}
+        self._lock = threading.Lock()
+    
+    def lig(self, sezon):
+        with self._lock:
+            if sezon not in self._ligler:
+                self._ligler[sezon] = SentetikLig(sezon, self.tohum)
+            return self._ligler[sezon]
+    
+    @staticmethod
+    def guncel_sezon():
+        bugun = date.today()
+        yil = bugun.year if bugun.month >= 10 else bugun.year - 1
+        return f"{yil}-{str(yil + 1)[2:]}"
+    
+    def cevap(self, endpoint, p):
+        """(result set sözlüğü) döndürür, bilinmeyen endpoint için None"""
+        sezon = p.get('season') or self.guncel_sezon()
+        if endpoint == 'playergamelog':
+            return self.lig(sezon).oyuncu_mac_logu(int(p.get('playerid', 0)))
+        if endpoint == 'leaguegamelog':
+            return self.lig(sezon).lig_mac_logu(p.get('playerorteam', 'T').upper() == 'P')
+        if endpoint == 'leaguegamefinder':
+            tarih = lambda d: date(int(d[6:10]), int(d[0:2]), int(d[3:5])) if d else None
+            return self.lig(sezon).takim_mac_bulucu(
+                int(p['teamid']) if p.get('teamid') else None,
+                tarih(p.get('datefrom')), tarih(p.get('dateto'))
+            )
+        if endpoint == 'scoreboardv2':
+            gun = date.fromisoformat(p.get('gamedate') or date.today().isoformat())
+            yil = gun.year if gun.month >= 10 else gun.year - 1
+            return self.lig(f"{yil}-{str(yil + 1)[2:]}").gunun_maclari(gun)
+        if endpoint == 'teamgamelog':
+            return self.lig(sezon).takim_mac_logu(int(p.get('teamid', 0)))
+        if endpoint == 'leaguedashteamstats':
+            return self.lig(sezon).lig_takim_tablosu(p.get('measuretype', 'Base'), p.get('permode', 'Totals'))
+        if endpoint == 'commonplayerinfo':
+            return self.lig(self.guncel_sezon()).oyuncu_bilgisi(int(p.get('playerid', 0)))
+        if endpoint == 'commonallplayers':
+            return self.lig(sezon).tum_oyuncular()
+        if endpoint == 'playercareerstats':
+            basliklar = ENDPOINT_SINIFLARI['playercareerstats'].expected_data['SeasonTotalsRegularSeason']
+            oyuncu_id = int(p.get('playerid', 0))
+            yil = _sezon_yili(self.guncel_sezon())
+            satirlar = []
+            for y in range(yil - self.kariyer_sezon_sayisi + 1, yil + 1):
+                toplam = self.lig(f"{y}-{str(y + 1)[2:]}").oyuncu_sezon_toplami(oyuncu_id)
+                if toplam:
+                    satirlar.append([toplam.get(b) for b in basliklar])
+            return {'SeasonTotalsRegularSeason': (basliklar, satirlar)}
+        return None
+
+
+def _result_sets(endpoint, setler):
+    """Result set sözlüğünü nba_api formatına çevirir, beklenen diğer set'leri boş ekler"""
+    sinif = ENDPOINT_SINIFLARI.get(endpoint)
+    beklenen = dict(sinif.expected_data) if sinif else {}
+    # Üretilen set'ler önce (gerçek API'de ana set resultSets[0])
+    sonuc = [{'name': ad, 'headers': b, 'rowSet': satirlar} for ad, (b, satirlar) in setler.items()]
+    for ad, basliklar in beklenen.items():
+        if ad not in setler:
+            # expected_data'da kolonu olmayan set'ler (örn. ScoreboardV2 TicketLinks) boş
+            # başlıkla DataFrame'e çevrilemez; gerçek API bunlarda da kolon döndürür
+            sonuc.append({'name': ad, 'headers': basliklar or ['GAME_ID'], 'rowSet': []})
+    return sonuc
+
+
+class SahteNBASunucu:
+    """
+    Sahte stats.nba.com sunucusu
+    
+    Her istekte sırasıyla: 429 kontrolü -> gecikme -> hata enjeksiyonu -> fixture -> sentetik veri
+    """
+    
+    def __init__(self, host='127.0.0.1', port=8765, gecikme_ms=0, sapma_ms=0, hata_orani=0.0,
+                 limit_orani=0.0, istek_limiti=0.0, fixture_dizini=None, tohum=0):
+        """
+        Args:
+            gecikme_ms: Ortalama cevap gecikmesi (ms)
+            sapma_ms: Gecikme standart sapması (ms)
+            hata_orani: 500 dönen isteklerin oranı (0-1)
+            limit_orani: Rastgele 429 dönen isteklerin oranı (0-1)
+            istek_limiti: Saniyede izin verilen istek (token bucket), aşılırsa 429. 0 = limitsiz
+            fixture_dizini: kayit_oynatma arşivi (varsa kayıtlı cevaplar önce kullanılır)
+            tohum: Sentetik veri ve rastgelelik tohumu
+        """
+        self.host = host
+        self.port = port
+        self.gecikme_ms = gecikme_ms
+        self.sapma_ms = sapma_ms
+        self.hata_orani = hata_orani
+        self.limit_orani = limit_orani
+        self.istek_limiti = istek_limiti
+        self.arsiv = FixtureArsivi(fixture_dizini) if fixture_dizini else None
+        self.veri = SentetikVeri(tohum)
+        
+        self._rng = random.Random(tohum)
+        self._lock = threading.Lock()
+        self._tokens = max(1.0, istek_limiti)
+        self._son = time.monotonic()
+        self.sayaclar = {'toplam': 0, 'durum': {}, 'endpoint': {}, 'kaynak': {}}
+        
+        self._sunucu = None
+        self._thread = None
+    
+    @property
+    def url(self):
+        """NBA_STATS_BASE_URL olarak kullanılacak adres"""
+        return f"http://{self.host}:{self.port}/stats"
+    
+    def _say(self, endpoint, durum, kaynak=None):
+        with self._lock:
+            self.sayaclar['toplam'] += 1
+            self.sayaclar['durum'][str(durum)] = self.sayaclar['durum'].get(str(durum), 0) + 1
+            self.sayaclar['endpoint'][endpoint] = self.sayaclar['endpoint'].get(endpoint, 0) + 1
+            if kaynak:
+                self.sayaclar['kaynak'][kaynak] = self.sayaclar['kaynak'].get(kaynak, 0) + 1
+    
+    def _limit_asildi(self):
+        with self._lock:
+            if self.limit_orani and self._rng.random() < self.limit_orani:
+                return True
+            if self.istek_limiti <= 0:
+                return False
+            simdi = time.monotonic()
+            self._tokens = min(max(1.0, self.istek_limiti),
+                               self._tokens + (simdi - self._son) * self.istek_limiti)
+            self._son = simdi
+            if self._tokens < 1:
+                return True
+            self._tokens -= 1
+            return False
+    
+    def _gecikme(self):
+        if self.gecikme_ms <= 0 and self.sapma_ms <= 0:
+            return 0.0
+        with self._lock:
+            ms = self._rng.gauss(self.gecikme_ms, self.sapma_ms) if self.sapma_ms else self.gecikme_ms
+        return max(0.0, ms) / 1000
+    
+    def _hata_mi(self):
+        if not self.hata_orani:
+            return False
+        with self._lock:
+            return self._rng.random() < self.hata_orani
+    
+    def isle(self, yol, query):
+        """(status, content_type, gövde bytes, ek header'lar) döndürür"""
+        endpoint = yol.rstrip('/').rsplit('/', 1)[-1].lower()
+        
+        if endpoint == '_durum':
+            with self._lock:
+                govde = json.dumps(self.sayaclar).encode('utf-8')
+            return 200, 'application/json', govde, {}
+        
+        if self._limit_asildi():
+            self._say(endpoint, 429)
+            return 429, 'text/plain', b'Too Many Requests', {'Retry-After': '1'}
+        
+        gecikme = self._gecikme()
+        if gecikme:
+            time.sleep(gecikme)
+        
+        if self._hata_mi():
+            self._say(endpoint, 500)
+            return 500, 'application/json', b'{"Message":"An error has occurred."}', {}
+        
+        if self.arsiv is not None:
+            anahtar, _, _ = istek_anahtari('GET', f"{yol}?{query}")
+            kayit = self.arsiv.oku(anahtar)
+            if kayit is not None:
+                status, content_type, govde = kayit
+                self._say(endpoint, status, 'fixture')
+                return status, content_type or 'application/json', govde, {}
+        
+        parametreler = {k.lower(): v for k, v in parse_qsl(query, keep_blank_values=True) if v != ''}
+        try:
+            setler = self.veri.cevap(endpoint, parametreler)
+        except Exception as e:
+            self._say(endpoint, 500, 'sentetik')
+            govde = json.dumps({'Message': f'Sentetik veri hatası: {e}'}).encode('utf-8')
+            return 500, 'application/json', govde, {}
+        
+        if setler is None:
+            self._say(endpoint, 404)
+            return 404, 'application/json', b'{"Message":"Endpoint not found."}', {}
+        
+        govde = json.dumps({
+            'resource': endpoint,
+            'parameters': parametreler,
+            'resultSets': _result_sets(endpoint, setler)
+        }).encode('utf-8')
+        self._say(endpoint, 200, 'sentetik')
+        return 200, 'application/json', govde, {}
+    
+    def _handler_sinifi(self):
+        sunucu = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            
+            def do_GET(self):
+                parcalar = urlsplit(self.path)
+                status, content_type, govde, ek = sunucu.isle(parcalar.path, parcalar.query)
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(govde)))
+                for k, v in ek.items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(govde)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        return Handler
+    
+    def baslat(self):
+        """Sunucuyu arka plan thread'inde başlatır (port=0 ise boş port seçilir)"""
+        self._sunucu = ThreadingHTTPServer((self.host, self.port), self._handler_sinifi())
+        self._sunucu.daemon_threads = True
+        self.port = self._sunucu.server_address[1]
+        self._thread = threading.Thread(target=self._sunucu.serve_forever, name='sahte-nba', daemon=True)
+        self._thread.start()
+        return self
+    
+    def durdur(self):
+        if self._sunucu:
+            self._sunucu.shutdown()
+            self._sunucu.server_close()
+            self._sunucu = None
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Sahte stats.nba.com sunucusu (yük testi için)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--gecikme-ms', type=float, default=0, help='Ortalama gecikme (ms)')
+    parser.add_argument('--sapma-ms', type=float, default=0, help='Gecikme standart sapması (ms)')
+    parser.add_argument('--hata-orani', type=float, default=0.0, help='500 oranı (0-1)')
+    parser.add_argument('--limit-orani', type=float, default=0.0, help='Rastgele 429 oranı (0-1)')
+    parser.add_argument('--istek-limiti', type=float, default=0.0, help='İstek/saniye limiti, aşılırsa 429')
+    parser.add_argument('--fixture-dizini', default=None, help='Kayıtlı cevaplar (kayit_oynatma arşivi)')
+    parser.add_argument('--tohum', type=int, default=0)
+    args = parser.parse_args()
+    
+    sunucu = SahteNBASunucu(
+        host=args.host, port=args.port, gecikme_ms=args.gecikme_ms, sapma_ms=args.sapma_ms,
+        hata_orani=args.hata_orani, limit_orani=args.limit_orani, istek_limiti=args.istek_limiti,
+        fixture_dizini=args.fixture_dizini, tohum=args.tohum
+    ).baslat()
+    print(f"🏀 Sahte NBA sunucusu çalışıyor: {sunucu.url}")
+    print(f"   export NBA_STATS_BASE_URL={sunucu.url}")
+    print(f"   Durum: {sunucu.url}/_durum")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        sunucu.durdur()
+        print("\n👋 Sunucu durduruldu")
@@ -2,77 +2,28 @@
 NBA Takım İstatistikleri ve Maç Analizi
 """
 
-from nba_api.stats.endpoints import leaguedashteamstats, teamdashboardbygeneralsplits, teamgamelog, leaguegamefinder
-from nba_api.stats.static import teams
+from nba_api.stats.endpoints import teamdashboardbygeneralsplits, teamgamelog, leaguegamefinder
 import pandas as pd
 import numpy as np
 import time
-
-def takim_bul(takim_isim):
-    """Takım adına göre takım ID'sini bulur"""
-    tum_takimlar = teams.get_teams()
-    
-    # Tam isim veya kısa isimle ara
-    for takim in tum_takimlar:
-        if (takim_isim.lower() in takim['full_name'].lower() or 
-            takim_isim.lower() in takim['nickname'].lower() or
-            takim_isim.upper() == takim['abbreviation']):
-            return takim
-    
-    return None
+from api_wrapper import rate_limiter
+from lig_tablolari import takim_satiri
+from takim_indeksi import takim_bul
 
 def takim_istatistikleri_cek(takim_id, sezon='2025-26'):
-    """Takımın sezon istatistiklerini çeker"""
-    
-    try:
-        # Genel istatistikler
-        stats = leaguedashteamstats.LeagueDashTeamStats(
-            season=sezon,
-            per_mode_detailed='PerGame',
-            season_type_all_star='Regular Season'
-        )
-        
-        df = stats.get_data_frames()[0]
-        takim_data = df[df['TEAM_ID'] == takim_id]
-        
-        if not takim_data.empty:
-            return takim_data.iloc[0]
-        
-        return None
-        
-    except Exception as e:
-        print(f"❌ Hata: {e}")
-        return None
+    """Takımın sezon istatistiklerini çeker (lig tablosu cache'inden)"""
+    return takim_satiri(takim_id, sezon, 'Base')
 
 def takim_advanced_stats_cek(takim_id, sezon='2025-26'):
-    """Takımın gelişmiş istatistiklerini çeker"""
-    
-    try:
-        # Advanced stats
-        stats = leaguedashteamstats.LeagueDashTeamStats(
-            season=sezon,
-            measure_type_detailed_defense='Advanced',
-            season_type_all_star='Regular Season'
-        )
-        
-        df = stats.get_data_frames()[0]
-        takim_data = df[df['TEAM_ID'] == takim_id]
-        
-        if not takim_data.empty:
-            return takim_data.iloc[0]
-        
-        return None
-        
-    except Exception as e:
-        print(f"❌ Hata: {e}")
-        return None
+    """Takımın gelişmiş istatistiklerini çeker (lig tablosu cache'inden)"""
+    return takim_satiri(takim_id, sezon, 'Advanced')
 
 def son_5_mac_analiz(takim_id, sezon='2025-26'):
     """Takımın son 5 maçının detaylı analizini yapar"""
     
     try:
         # Alternatif yöntem: LeagueGameFinder kullan
-        time.sleep(0.6)  # Rate limiting
+        rate_limiter.wait()  # Ortak rate limiter
         
         gamefinder = leaguegamefinder.LeagueGameFinder(
             team_id_nullable=takim_id,
@@ -84,7 +35,7 @@ def son_5_mac_analiz(takim_id, sezon='2025-26'):
         
         if games.empty:
             # 2024-25 sezonu dene
-            time.sleep(0.6)
+            rate_limiter.wait()
             gamefinder = leaguegamefinder.LeagueGameFinder(
                 team_id_nullable=takim_id,
                 season_nullable='2024-25',
@@ -3,69 +3,47 @@
 Profesyonel NBA maç tahmini algoritması
 """
 
-from nba_api.stats.static import teams
-from nba_api.stats.endpoints import leaguedashteamstats, teamdashboardbygeneralsplits, leaguegamefinder
+from nba_api.stats.endpoints import teamdashboardbygeneralsplits, leaguegamefinder
+from concurrent.futures import ThreadPoolExecutor
+from api_wrapper import rate_limiter
+from lig_tablolari import takim_satiri, lig_tablolari, gunun_maclari_optimized
+from takim_indeksi import takim_bul, takim_indeksi
+from zamanlama import span, spanli, izli
 import pandas as pd
-import time
 
-def takim_bul(takim_isim):
-    """Takım adına göre takım ID'sini bulur"""
-    tum_takimlar = teams.get_teams()
-    
-    for takim in tum_takimlar:
-        if (takim_isim.lower() in takim['full_name'].lower() or 
-            takim_isim.lower() in takim['nickname'].lower() or
-            takim_isim.upper() == takim['abbreviation']):
-            return takim
-    
-    return None
+# Maç analizi için paralel çalışacak çağrı sayısı (ev + deplasman x 3 veri kaynağı)
+VERI_CEKME_PARALELLIK = 6
+
+# /api/mac-analiz'in sorguladığı sezon (ön ısıtıcı da bu sezonun tablolarını ısıtır)
+VARSAYILAN_SEZON = '2024-25'
 
 def takim_istatistikleri_cek(takim_id, sezon='2024-25'):
-    """Takımın sezon istatistiklerini çeker"""
-    try:
-        stats = leaguedashteamstats.LeagueDashTeamStats(
-            season=sezon,
-            per_mode_detailed='PerGame',
-            season_type_all_star='Regular Season'
-        )
-        
-        df = stats.get_data_frames()[0]
-        takim_data = df[df['TEAM_ID'] == takim_id]
-        
-        if not takim_data.empty:
-            return takim_data.iloc[0]
-        
-        return None
-        
-    except Exception as e:
-        print(f"❌ Hata: {e}")
-        return None
+    """Takımın sezon istatistiklerini çeker (lig tablosu cache'inden)"""
+    return takim_satiri(takim_id, sezon, 'Base')
 
 def takim_advanced_stats_cek(takim_id, sezon='2024-25'):
-    """Takımın gelişmiş istatistiklerini çeker"""
+    """Takımın gelişmiş istatistiklerini çeker (lig tablosu cache'inden)"""
+    return takim_satiri(takim_id, sezon, 'Advanced')
+
+def son_5_mac_analiz(takim_id, sezon='2024-25'):
+    """
+    Son 5 maç analizini yapar
+    Bülten ile aynı kaynak: cache'li sezonluk takım maç tablosu (tek maç ve bülten
+    tahminleri aynı anlık görüntüden hesaplanır). Tablo alınamazsa takım bazlı çağrı yapılır.
+    """
     try:
-        stats = leaguedashteamstats.LeagueDashTeamStats(
-            season=sezon,
-            measure_type_detailed_defense='Advanced',
-            season_type_all_star='Regular Season'
-        )
-        
-        df = stats.get_data_frames()[0]
-        takim_data = df[df['TEAM_ID'] == takim_id]
-        
-        if not takim_data.empty:
-            return takim_data.iloc[0]
-        
-        return None
-        
+        ozetler = lig_tablolari.son_5_ozetleri(sezon)
     except Exception as e:
-        print(f"❌ Hata: {e}")
-        return None
+        print(f"⚠️ Takım maç tablosu hatası: {e}")
+        ozetler = None
+    if ozetler and int(takim_id) in ozetler:
+        return ozetler[int(takim_id)]
+    return son_5_mac_analiz_takim_bazli(takim_id, sezon)
 
-def son_5_mac_analiz(takim_id, sezon='2024-25'):
-    """Son 5 maç analizini yapar"""
+def son_5_mac_analiz_takim_bazli(takim_id, sezon='2024-25'):
+    """Son 5 maç analizini takımın kendi LeagueGameFinder çağrısından yapar (cache'siz)"""
     try:
-        time.sleep(0.6)  # Rate limiting
+        rate_limiter.wait()  # Ortak rate limiter (tüm thread/worker'lar için)
         
         gamefinder = leaguegamefinder.LeagueGameFinder(
             team_id_nullable=takim_id,
@@ -99,12 +77,13 @@ def son_5_mac_analiz(takim_id, sezon='2024-25'):
             'toplam_skor_ort': toplam_skor_ort,
             'mac_sayisi': len(son_5)
         }
-        
+    
     except Exception as e:
         print(f"❌ Son 5 maç hatası: {e}")
         return None
 
 
+@izli('mac_analiz')
 def mac_tahmini_v2(ev_takim, dep_takim, baraj=None, sezon='2024-25', verbose=False):
     """
     🎯 REGRESYONLU PROFESYONEL NBA TAHMİN ALGORİTMASI
@@ -131,8 +110,9 @@ def mac_tahmini_v2(ev_takim, dep_takim, baraj=None, sezon='2024-25', verbose=Fal
     # 1. TAKIMLARI BUL VE VERİLERİ ÇEK
     # ═══════════════════════════════════════════════════════════════════
     
-    ev_takim_data = takim_bul(ev_takim)
-    dep_takim_data = takim_bul(dep_takim)
+    with span('mac.takim_bul'):
+        ev_takim_data = takim_bul(ev_takim)
+        dep_takim_data = takim_bul(dep_takim)
     
     if not ev_takim_data or not dep_takim_data:
         if verbose:
@@ -143,26 +123,54 @@ def mac_tahmini_v2(ev_takim, dep_takim, baraj=None, sezon='2024-25', verbose=Fal
         print(f"✅ Ev: {ev_takim_data['full_name']}")
         print(f"✅ Dep: {dep_takim_data['full_name']}\n")
     
-    # İstatistikleri çek
-    ev_stats = takim_istatistikleri_cek(ev_takim_data['id'], sezon)
-    dep_stats = takim_istatistikleri_cek(dep_takim_data['id'], sezon)
-    ev_advanced = takim_advanced_stats_cek(ev_takim_data['id'], sezon)
-    dep_advanced = takim_advanced_stats_cek(dep_takim_data['id'], sezon)
+    # İstatistikleri ve son 5 maç analizini paralel çek
+    # (sabit bekleme yok, toplam hız ortak rate limiter ile sınırlı)
+    with span('mac.veri_cek'), ThreadPoolExecutor(max_workers=VERI_CEKME_PARALELLIK) as executor:
+        ev_stats_future = executor.submit(spanli('mac.takim_stats', takim_istatistikleri_cek), ev_takim_data['id'], sezon)
+        dep_stats_future = executor.submit(spanli('mac.takim_stats', takim_istatistikleri_cek), dep_takim_data['id'], sezon)
+        ev_advanced_future = executor.submit(spanli('mac.advanced_stats', takim_advanced_stats_cek), ev_takim_data['id'], sezon)
+        dep_advanced_future = executor.submit(spanli('mac.advanced_stats', takim_advanced_stats_cek), dep_takim_data['id'], sezon)
+        ev_son5_future = executor.submit(spanli('mac.son_5', son_5_mac_analiz), ev_takim_data['id'], sezon)
+        dep_son5_future = executor.submit(spanli('mac.son_5', son_5_mac_analiz), dep_takim_data['id'], sezon)
+    
+    ev_stats = ev_stats_future.result()
+    dep_stats = dep_stats_future.result()
+    ev_advanced = ev_advanced_future.result()
+    dep_advanced = dep_advanced_future.result()
+    ev_son5 = ev_son5_future.result()
+    dep_son5 = dep_son5_future.result()
     
     if ev_stats is None or dep_stats is None:
         if verbose:
             print("❌ İstatistikler çekilemedi!")
         return None
     
-    # Son 5 maç analizi
-    ev_son5 = son_5_mac_analiz(ev_takim_data['id'], sezon)
-    dep_son5 = son_5_mac_analiz(dep_takim_data['id'], sezon)
-    
     if not ev_son5 or not dep_son5:
         if verbose:
             print("❌ Son 5 maç verisi çekilemedi!")
         return None
     
+    with span('mac.hesaplama'):
+        return mac_tahmini_hesapla(
+            ev_takim_data, dep_takim_data, ev_stats, dep_stats,
+            ev_advanced, dep_advanced, ev_son5, dep_son5, baraj=baraj, verbose=verbose
+        )
+
+
+def mac_tahmini_hesapla(ev_takim_data, dep_takim_data, ev_stats, dep_stats,
+                        ev_advanced, dep_advanced, ev_son5, dep_son5, baraj=None, verbose=False):
+    """
+    Çekilmiş takım verilerinden toplam skor tahmini ve baraj kararı (API çağrısı yok)
+    
+    Args:
+        ev_takim_data / dep_takim_data: Takım kayıtları (takim_bul)
+        ev_stats / dep_stats: Base lig tablosu satırları
+        ev_advanced / dep_advanced: Advanced lig tablosu satırları (None olabilir)
+        ev_son5 / dep_son5: son_5_mac_analiz sonuçları
+        baraj: İddaa barajı
+        verbose: Detaylı çıktı
+    """
+    
     # ═══════════════════════════════════════════════════════════════════
     # 2. TEMEL VERİLER
     # ═══════════════════════════════════════════════════════════════════
@@ -449,6 +457,116 @@ def mac_tahmini_v2(ev_takim, dep_takim, baraj=None, sezon='2024-25', verbose=Fal
         }
 
 
+
+def tarihin_sezonu(tarih):
+    """'2025-01-15' -> '2024-25' (sezon Ekim'de başlar)"""
+    yil, ay = int(tarih[:4]), int(tarih[5:7])
+    if ay < 10:
+        yil -= 1
+    return f"{yil}-{str(yil + 1)[2:]}"
+
+
+def gunun_eslesmeleri(tarih):
+    """
+    Tarihteki maçları bülten satırlarına çevirir
+    
+    Returns:
+        [{'ev_takim': TEAM_ID, 'dep_takim': TEAM_ID, 'game_id': ...}], program çekilemezse None
+    """
+    try:
+        sonuc = gunun_maclari_optimized(tarih)
+    except Exception as e:
+        print(f"❌ Maç programı hatası: {e}")
+        return None
+    if not sonuc:
+        return None
+    return [
+        {'ev_takim': int(mac['HOME_TEAM_ID']), 'dep_takim': int(mac['VISITOR_TEAM_ID']), 'game_id': mac.get('GAME_ID')}
+        for mac in sonuc['data']
+    ]
+
+
+def _takim_coz(takim):
+    """Takım adı/kısaltması veya TEAM_ID -> takım kaydı"""
+    if isinstance(takim, int):
+        return next((t for t in takim_indeksi().takimlar if t['id'] == takim), None)
+    return takim_bul(takim)
+
+
+def _tablo_satiri(tablo, takim_id):
+    if tablo is None:
+        return None
+    try:
+        return tablo.loc[int(takim_id)]
+    except KeyError:
+        return None
+
+
+@izli('mac_bulteni')
+def mac_bulteni(maclar, sezon='2024-25', verbose=False):
+    """
+    Bir gecenin tüm maçlarını ortak veri anlık görüntüsünden tahmin eder
+    
+    Base + Advanced lig tabloları ve sezonluk takım maç tablosu bir kez
+    (paralel) alınır; her maç mac_tahmini_hesapla ile API çağrısı olmadan hesaplanır.
+    
+    Args:
+        maclar: [{'ev_takim', 'dep_takim', 'baraj'(ops.)}] - takım adı veya TEAM_ID
+        sezon: NBA sezonu
+        verbose: Detaylı çıktı
+    
+    Returns:
+        Giriş sırasıyla [{'ev_takim', 'dep_takim', 'success', 'data' | 'message'}],
+        ortak veriler çekilemezse None
+    """
+    with span('bulten.veri_cek'), ThreadPoolExecutor(max_workers=3) as executor:
+        base_future = executor.submit(spanli('bulten.lig_tablosu', lig_tablolari.tablo), sezon, 'Base')
+        advanced_future = executor.submit(spanli('bulten.lig_tablosu', lig_tablolari.tablo), sezon, 'Advanced')
+        son5_future = executor.submit(spanli('bulten.takim_maclari', lig_tablolari.son_5_ozetleri), sezon)
+    
+    try:
+        base = base_future.result()
+        son5_ozetleri = son5_future.result()
+    except Exception as e:
+        print(f"❌ Bülten verileri çekilemedi: {e}")
+        return None
+    try:
+        advanced = advanced_future.result()
+    except Exception as e:
+        print(f"⚠️ Advanced tablo çekilemedi: {e}")
+        advanced = None
+    
+    if base is None or not son5_ozetleri:
+        print("❌ Bülten verileri çekilemedi!")
+        return None
+    
+    sonuclar = []
+    with span('bulten.hesaplama'):
+        for mac in maclar:
+            satir = {'ev_takim': mac.get('ev_takim'), 'dep_takim': mac.get('dep_takim')}
+            ev_takim_data = _takim_coz(mac.get('ev_takim'))
+            dep_takim_data = _takim_coz(mac.get('dep_takim'))
+            if not ev_takim_data or not dep_takim_data:
+                sonuclar.append({**satir, 'success': False, 'message': 'Takımlardan biri bulunamadı!'})
+                continue
+            
+            satir = {'ev_takim': ev_takim_data['full_name'], 'dep_takim': dep_takim_data['full_name']}
+            ev_stats = _tablo_satiri(base, ev_takim_data['id'])
+            dep_stats = _tablo_satiri(base, dep_takim_data['id'])
+            ev_son5 = son5_ozetleri.get(ev_takim_data['id'])
+            dep_son5 = son5_ozetleri.get(dep_takim_data['id'])
+            if ev_stats is None or dep_stats is None or not ev_son5 or not dep_son5:
+                sonuclar.append({**satir, 'success': False, 'message': 'Takım verileri bulunamadı!'})
+                continue
+            
+            tahmin = mac_tahmini_hesapla(
+                ev_takim_data, dep_takim_data, ev_stats, dep_stats,
+                _tablo_satiri(advanced, ev_takim_data['id']), _tablo_satiri(advanced, dep_takim_data['id']),
+                ev_son5, dep_son5, baraj=mac.get('baraj'), verbose=verbose
+            )
+            sonuclar.append({**satir, 'success': True, 'data': tahmin})
+    return sonuclar
+
 if __name__ == "__main__":
     # Test
     print("🧪 TEST: Lakers vs Celtics")
@@ -0,0 +1,116 @@
+"""
+Takım İndeksi
+Tüm modüllerin ortak kullandığı takım alias -> takım kaydı çözümleyicisi
+Tam isim, takma ad, kısaltma ve takimlar.json alias'ları bir kez indekslenir
+"""
+
+import json
+import threading
+from nba_api.stats.static import teams
+from oyuncu_indeksi import normalize
+
+# Statik listede olmayan yaygın alias'lar (alias -> kısaltma)
+EK_ALIASLAR = {
+    'LA Clippers': 'LAC',
+    'Sixers': 'PHI',
+    'Blazers': 'POR',
+    'Cavs': 'CLE',
+    'Mavs': 'DAL',
+    'Wolves': 'MIN',
+}
+
+
+class TakimIndeksi:
+    """
+    Önceden kurulmuş takım alias indeksi
+    
+    - Her alias normalize edilip tek dict'e yazılır: çözümleme tek dict erişimi
+    - Birden fazla takıma işaret eden alias'lar (örn. şehir 'Los Angeles') indekse alınmaz
+    - Dict'te olmayan isimler için eski davranış: tam isim / takma ad içinde geçiyorsa
+    """
+    
+    def __init__(self, takimlar=None, alias_dosyasi='takimlar.json'):
+        """
+        Args:
+            takimlar: teams.get_teams() formatında liste (None = nba_api statik listesi)
+            alias_dosyasi: Ek alias listesi (her biri bir takımın tam isim/takma ad/kısaltması)
+        """
+        self.takimlar = list(takimlar if takimlar is not None else teams.get_teams())
+        self.kisaltmalar = {t['abbreviation']: t for t in self.takimlar}
+        
+        adaylar = {}  # normalize alias -> {takım id: takım}
+        
+        def ekle(alias, takim):
+            adaylar.setdefault(normalize(alias), {})[takim['id']] = takim
+        
+        for takim in self.takimlar:
+            for alan in ('full_name', 'nickname', 'abbreviation', 'city'):
+                if takim.get(alan):
+                    ekle(takim[alan], takim)
+        for alias, kisaltma in EK_ALIASLAR.items():
+            if kisaltma in self.kisaltmalar:
+                ekle(alias, self.kisaltmalar[kisaltma])
+        for alias in self._alias_dosyasi_oku(alias_dosyasi):
+            takim = self._tara(normalize(alias))
+            if takim:
+                ekle(alias, takim)
+        
+        self.alias = {
+            alias: next(iter(eslesen.values()))
+            for alias, eslesen in adaylar.items() if alias and len(eslesen) == 1
+        }
+    
+    def _alias_dosyasi_oku(self, dosya):
+        if not dosya:
+            return []
+        try:
+            with open(dosya, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"⚠️ {dosya} okunamadı: {e}")
+            return []
+    
+    def _tara(self, isim):
+        """İsmin geçtiği ilk takımı döndürür (indeks dışı isimler için yedek)"""
+        for takim in self.takimlar:
+            if (isim in normalize(takim['full_name']) or
+                    isim in normalize(takim['nickname']) or
+                    isim == normalize(takim['abbreviation'])):
+                return takim
+        return None
+    
+    def bul(self, isim):
+        """Takım kaydını döndürür (bulunamazsa None)"""
+        if not isim:
+            return None
+        anahtar = normalize(isim)
+        if not anahtar:
+            return None
+        takim = self.alias.get(anahtar)
+        if takim is None:
+            takim = self._tara(anahtar)
+        return takim
+    
+    def tam_isim(self, isim):
+        """Takımın tam ismini döndürür (bulunamazsa None)"""
+        takim = self.bul(isim)
+        return takim['full_name'] if takim else None
+
+
+_indeks = None
+_indeks_lock = threading.Lock()
+
+
+def takim_indeksi():
+    """Global takım indeksini döndürür (ilk çağrıda bir kez kurulur)"""
+    global _indeks
+    if _indeks is None:
+        with _indeks_lock:
+            if _indeks is None:
+                _indeks = TakimIndeksi()
+    return _indeks
+
+
+def takim_bul(takim_isim):
+    """Takım adına / kısaltmasına göre takım kaydını bulur"""
+    return takim_indeksi().bul(takim_isim)
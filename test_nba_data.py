@@ -4,12 +4,12 @@ Bu script nba_api kütüphanesini test eder ve oyuncu verilerini çeker
 Cache, retry ve rate limiting ile optimize edilmiş
 """
 
-from nba_api.stats.static import players
 from nba_api.stats.endpoints import playercareerstats, playergamelog, commonplayerinfo
 import pandas as pd
 import json
 from datetime import datetime
 from api_wrapper import api_call, with_retry, with_rate_limit
+from oyuncu_indeksi import oyuncu_indeksi, BUL_ESIK
 import time
 
 def guncel_sezon_bul():
@@ -33,13 +33,8 @@ def oyuncu_bul(isim):
     """Oyuncu adına göre oyuncu bilgilerini bulur"""
     print(f"\n🔍 '{isim}' aranıyor...")
     
-    # Oyuncuyu bul
-    oyuncu_listesi = players.find_players_by_full_name(isim)
-    
-    if not oyuncu_listesi:
-        # Tam isim bulunamazsa, kısmi arama yap
-        tum_oyuncular = players.get_players()
-        oyuncu_listesi = [p for p in tum_oyuncular if isim.lower() in p['full_name'].lower()]
+    # İndeksli arama: tam, önek, kısmi ve bulanık eşleşme (en iyi eşleşme önce)
+    oyuncu_listesi = oyuncu_indeksi().ara(isim, limit=10, bulanik_esik=BUL_ESIK)
     
     if oyuncu_listesi:
         print(f"✅ {len(oyuncu_listesi)} oyuncu bulundu:")
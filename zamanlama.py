@@ -0,0 +1,200 @@
+"""
+Zamanlama (Span) Enstrümantasyonu
+Analiz aşamalarının süresini ve cache isabetlerini ölçen hafif span'ler
+
+- span('ad'): süreyi ölçer, global toplayıcıya ekler; aktif bir iz varsa ona da kaydeder
+- iz('ad'): bir isteğin tüm span'lerini toplar (API cevabında admin'e döndürülebilir)
+- Aktif iz ve span contextvars ile taşınır: thread havuzuna `spanli` / `baglamli` ile geçer
+- with_cache her cache kararını aktif span'e yazar (hit / stale / miss)
+"""
+
+import contextvars
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+# Yüzdelik hesabı için span adı başına tutulan son süre sayısı
+ORNEK_SAYISI = 512
+
+_aktif_iz = contextvars.ContextVar('aktif_iz', default=None)
+_aktif_span = contextvars.ContextVar('aktif_span', default=None)
+
+
+class Span:
+    """Tek bir aşamanın süresi ve cache olayları"""
+    
+    __slots__ = ('ad', 'ust', 'baslangic', 'sure_ms', 'cache', 'thread')
+    
+    def __init__(self, ad, ust=None):
+        self.ad = ad
+        self.ust = ust
+        self.baslangic = time.perf_counter()
+        self.sure_ms = None
+        self.cache = {}
+        self.thread = threading.current_thread().name
+    
+    def rapor(self, iz_baslangic):
+        return {
+            'ad': self.ad,
+            'ust': self.ust,
+            'baslangic_ms': round((self.baslangic - iz_baslangic) * 1000, 2),
+            'sure_ms': round(self.sure_ms, 2) if self.sure_ms is not None else None,
+            'cache': dict(self.cache),
+            'thread': self.thread
+        }
+
+
+class Iz:
+    """Bir isteğin (analizin) span listesi"""
+    
+    def __init__(self, ad):
+        self.ad = ad
+        self.baslangic = time.perf_counter()
+        self.sure_ms = None
+        self.spanlar = []
+        self._lock = threading.Lock()
+    
+    def ekle(self, span):
+        with self._lock:
+            self.spanlar.append(span)
+    
+    def rapor(self):
+        """Başlangıç sırasına göre span'ler ve toplam cache olayları"""
+        with self._lock:
+            spanlar = sorted(self.spanlar, key=lambda s: s.baslangic)
+        cache = {}
+        for span in spanlar:
+            for tur, sayi in span.cache.items():
+                cache[tur] = cache.get(tur, 0) + sayi
+        sure = self.sure_ms if self.sure_ms is not None else (time.perf_counter() - self.baslangic) * 1000
+        return {
+            'ad': self.ad,
+            'sure_ms': round(sure, 2),
+            'cache': cache,
+            'spanlar': [s.rapor(self.baslangic) for s in spanlar]
+        }
+
+
+class ZamanlamaToplayici:
+    """Span adı başına bellek içi istatistik (sayı, ortalama, p50/p95, max, cache olayları)"""
+    
+    def __init__(self, ornek_sayisi=ORNEK_SAYISI):
+        self.ornek_sayisi = ornek_sayisi
+        self._lock = threading.Lock()
+        self._istatistik = {}
+    
+    def ekle(self, ad, sure_ms, cache=None):
+        with self._lock:
+            ist = self._istatistik.get(ad)
+            if ist is None:
+                ist = self._istatistik[ad] = {
+                    'sayi': 0, 'toplam_ms': 0.0, 'max_ms': 0.0,
+                    'ornekler': deque(maxlen=self.ornek_sayisi), 'cache': {}
+                }
+            ist['sayi'] += 1
+            ist['toplam_ms'] += sure_ms
+            ist['max_ms'] = max(ist['max_ms'], sure_ms)
+            ist['ornekler'].append(sure_ms)
+            for tur, sayi in (cache or {}).items():
+                ist['cache'][tur] = ist['cache'].get(tur, 0) + sayi
+    
+    def rapor(self):
+        with self._lock:
+            kopya = {ad: (dict(ist), sorted(ist['ornekler'])) for ad, ist in self._istatistik.items()}
+        
+        def yuzdelik(sirali, oran):
+            return round(sirali[min(len(sirali) - 1, int(oran * len(sirali)))], 2) if sirali else None
+        
+        return {
+            ad: {
+                'sayi': ist['sayi'],
+                'ortalama_ms': round(ist['toplam_ms'] / ist['sayi'], 2),
+                'p50_ms': yuzdelik(sirali, 0.5),
+                'p95_ms': yuzdelik(sirali, 0.95),
+                'max_ms': round(ist['max_ms'], 2),
+                'cache': dict(ist['cache'])
+            }
+            for ad, (ist, sirali) in sorted(kopya.items())
+        }
+    
+    def sifirla(self):
+        with self._lock:
+            self._istatistik.clear()
+
+
+# Global toplayıcı (admin endpoint'i raporlar)
+toplayici = ZamanlamaToplayici()
+
+
+@contextmanager
+def span(ad):
+    """Bir aşamanın süresini ölçer"""
+    ust = _aktif_span.get()
+    yeni = Span(ad, ust.ad if ust is not None else None)
+    token = _aktif_span.set(yeni)
+    try:
+        yield yeni
+    finally:
+        yeni.sure_ms = (time.perf_counter() - yeni.baslangic) * 1000
+        _aktif_span.reset(token)
+        toplayici.ekle(ad, yeni.sure_ms, yeni.cache)
+        aktif_iz = _aktif_iz.get()
+        if aktif_iz is not None:
+            aktif_iz.ekle(yeni)
+
+
+@contextmanager
+def iz(ad):
+    """Yeni bir iz başlatır; zaten aktif iz varsa ona bağlı bir span açar"""
+    mevcut = _aktif_iz.get()
+    if mevcut is not None:
+        with span(ad):
+            yield mevcut
+        return
+    
+    yeni = Iz(ad)
+    token = _aktif_iz.set(yeni)
+    try:
+        with span(ad):
+            yield yeni
+    finally:
+        yeni.sure_ms = (time.perf_counter() - yeni.baslangic) * 1000
+        _aktif_iz.reset(token)
+
+
+def izli(ad):
+    """Fonksiyonu iz('ad') içinde çalıştıran decorator"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with iz(ad):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def baglamli(func):
+    """func'u çağıranın bağlamında (aktif iz/span) çalıştıran kopya (thread havuzu için)"""
+    baglam = contextvars.copy_context()
+    
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        return baglam.run(func, *args, **kwargs)
+    return wrapper
+
+
+def spanli(ad, func):
+    """executor.submit(spanli('ad', func), ...) - func başka thread'de kendi span'iyle çalışır"""
+    def calistir(*args, **kwargs):
+        with span(ad):
+            return func(*args, **kwargs)
+    return baglamli(calistir)
+
+
+def cache_olayi(tur):
+    """Aktif span'e cache olayı yazar ('hit', 'stale', 'miss')"""
+    aktif = _aktif_span.get()
+    if aktif is not None:
+        aktif.cache[tur] = aktif.cache.get(tur, 0) + 1